@@ -0,0 +1,167 @@
+# backend/app/auth_tokens.py
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from jose import JWTError, jwt
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from . import models
+from .cache import LRUCache
+
+
+class InvalidToken(Exception):
+    """The token failed verification, has expired or was revoked."""
+
+
+@dataclass(frozen=True, slots=True)
+class UserContext:
+    """What an authenticated request knows about its caller, taken from the
+    verified token claims. Immutable, so one instance is shared by every
+    request that presents the same token."""
+
+    id: int
+    email: str
+    user_type: str
+    exp: float | None = None
+
+
+def token_digest(token: str) -> bytes:
+    # the raw bearer token is never kept in memory as a key
+    return hashlib.sha256(token.encode()).digest()
+
+
+class RevocationList:
+    """Digests of tokens revoked before their expiry (logout). An entry only
+    has to outlive the token it blocks, so expired ones are purged as new
+    revocations come in. In-process only: with several workers use
+    ``SharedRevocationList``."""
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._revoked = {}  # digest -> exp (epoch seconds)
+        self._lock = threading.Lock()
+
+    def revoke(self, digest: bytes, exp: float | None):
+        with self._lock:
+            now = self._clock()
+            self._revoked = {d: e for d, e in self._revoked.items() if e > now}
+            # tokens without exp never expire, so neither does their revocation
+            self._revoked[digest] = exp if exp is not None else float("inf")
+
+    def __contains__(self, digest: bytes) -> bool:
+        return digest in self._revoked
+
+    def __len__(self):
+        return len(self._revoked)
+
+
+def _utc(epoch):
+    return None if epoch is None else datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None)
+
+
+class SharedRevocationList(RevocationList):
+    """Revocations kept in the ``revoked_tokens`` table, so a logout takes
+    effect in every worker process. Digests this process has already seen
+    revoked are answered from the in-process list; any other token costs
+    one primary-key lookup per check."""
+
+    def __init__(self, session_factory, clock=time.time):
+        super().__init__(clock)
+        self._session_factory = session_factory
+
+    def revoke(self, digest: bytes, exp: float | None):
+        session = self._session_factory()
+        try:
+            session.execute(delete(models.RevokedToken).where(
+                models.RevokedToken.expires_at < _utc(self._clock())
+            ))
+            session.execute(insert(models.RevokedToken).values(
+                digest=digest, expires_at=_utc(exp)
+            ).on_conflict_do_nothing())
+            session.commit()
+        finally:
+            session.close()
+        super().revoke(digest, exp)
+
+    def __contains__(self, digest: bytes) -> bool:
+        if super().__contains__(digest):
+            return True
+        session = self._session_factory()
+        try:
+            row = session.execute(
+                select(models.RevokedToken.expires_at).where(models.RevokedToken.digest == digest)
+            ).first()
+        finally:
+            session.close()
+        if row is None:
+            return False
+        expires_at = row.expires_at
+        super().revoke(digest, None if expires_at is None else expires_at.replace(tzinfo=timezone.utc).timestamp())
+        return True
+
+
+class TokenVerifier:
+    """Verifies bearer JWTs once and serves repeats from memory.
+
+    A browser sends the same 24-hour token with every request, so the
+    verified ``UserContext`` is cached in an LRU keyed on the token's SHA-256
+    digest and dropped at the token's ``exp``; after that the next request
+    misses and ``jwt.decode`` rejects it as expired. Revoked digests are
+    checked on every call, cached or not. Invalid tokens are not cached.
+    """
+
+    def __init__(self, secret, algorithms, maxsize=10000, revocations=None):
+        self.secret = secret
+        self.algorithms = list(algorithms)
+        self._cache = LRUCache(maxsize=maxsize)
+        self.revocations = revocations if revocations is not None else RevocationList()
+        self.decodes = 0
+        self.rejected = 0
+
+    def verify(self, token: str) -> UserContext:
+        digest = token_digest(token)
+        if digest in self.revocations:
+            self.rejected += 1
+            raise InvalidToken("Token revoked")
+        user = self._cache.get(digest)
+        if user is not None:
+            return user
+
+        self.decodes += 1
+        try:
+            payload = jwt.decode(token, self.secret, algorithms=self.algorithms)
+            user = UserContext(
+                id=payload["id"],
+                email=payload.get("email"),
+                user_type=payload.get("user_type"),
+                exp=payload.get("exp"),
+            )
+        except (JWTError, KeyError):
+            self.rejected += 1
+            raise InvalidToken("Invalid token")
+
+        if user.exp is not None:
+            # exp is wall-clock; the cache runs on the monotonic clock
+            self._cache.set(digest, user, expires_at=time.monotonic() + (user.exp - time.time()))
+        else:
+            self._cache.set(digest, user)
+        return user
+
+    def revoke(self, token: str):
+        """Reject ``token`` from now on (it must still verify)."""
+        user = self.verify(token)
+        digest = token_digest(token)
+        self.revocations.revoke(digest, user.exp)
+        self._cache.pop(digest)
+
+    def stats(self) -> dict:
+        return {
+            **self._cache.stats(),
+            "decodes": self.decodes,
+            "rejected": self.rejected,
+            "revoked": len(self.revocations),
+        }
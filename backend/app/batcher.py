@@ -0,0 +1,124 @@
+# backend/app/batcher.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+class MicroBatcher:
+    """Coalesce concurrent prediction requests into one model call.
+
+    Callers ``await submit(X)`` with their own feature matrix. The first
+    request in an empty queue opens a window of ``max_wait`` seconds; anything
+    arriving inside it (up to ``max_batch`` rows) is stacked into a single
+    matrix, ``predict_fn`` runs once on a dedicated worker thread, and each
+    caller gets back the slice of predictions for its own rows.
+
+    Requests submitted with a ``key`` are only stacked with requests holding
+    the same key object, and ``predict_fn(X, key)`` gets it; the server passes
+    the (model, transformer) pair the rows were encoded with, so a batch
+    straddling a reload never runs one model on another's feature layout.
+    """
+
+    def __init__(self, predict_fn, max_wait=0.002, max_batch=4096):
+        self.predict_fn = predict_fn
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="predict")
+        self._queue = None
+        self._task = None
+        self._loop = None
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self.largest_batch = 0
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def submit(self, X: np.ndarray, key=None) -> np.ndarray:
+        self._ensure_started()
+        fut = self._loop.create_future()
+        self._queue.put_nowait((X, fut, key))
+        return await fut
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            rows = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while rows < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                pending.append(item)
+                rows += len(item[0])
+
+            await self._flush(loop, pending)
+
+    async def _flush(self, loop, pending):
+        groups = {}
+        for X, fut, key in pending:
+            if not fut.cancelled():
+                groups.setdefault(id(key), (key, []))[1].append((X, fut))
+        for key, group in groups.values():
+            await self._predict(loop, key, group)
+
+    async def _predict(self, loop, key, pending):
+        rows = sum(len(x) for x, _ in pending)
+        X = pending[0][0] if len(pending) == 1 else np.concatenate([x for x, _ in pending])
+
+        self.batches += 1
+        self.requests += len(pending)
+        self.rows += rows
+        self.largest_batch = max(self.largest_batch, rows)
+
+        try:
+            args = (X,) if key is None else (X, key)
+            preds = await loop.run_in_executor(self._executor, self.predict_fn, *args)
+        except Exception as e:
+            for _, fut in pending:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        start = 0
+        for x, fut in pending:
+            end = start + len(x)
+            if not fut.done():
+                fut.set_result(preds[start:end])
+            start = end
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "max_wait_ms": self.max_wait * 1000,
+            "max_batch": self.max_batch,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "requests": self.requests,
+            "rows": self.rows,
+            "largest_batch": self.largest_batch,
+            "avg_requests_per_batch": self.requests / self.batches if self.batches else 0.0,
+        }
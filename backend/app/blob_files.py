@@ -0,0 +1,171 @@
+# backend/app/blob_files.py
+import asyncio
+import hashlib
+import os
+import re
+import stat
+from email.utils import formatdate
+
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse, Response
+
+MIME_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header, size):
+    """``(start, end)`` (inclusive) for a single ``bytes=`` range, ``None``
+    to send the whole file (no header, or a multi-range we do not split),
+    or ``"unsatisfiable"``."""
+    if not header or "," in header:
+        return None
+    match = RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return "unsatisfiable"
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return "unsatisfiable"
+    return start, end
+
+
+def _read_at(fd, offset, count):
+    return os.pread(fd, count, offset)
+
+
+class BlobFiles:
+    """ASGI app serving an upload directory (a StaticFiles replacement).
+
+    Files whose path ``immutable`` matches are named by their content hash,
+    so they are sent with a year-long ``Cache-Control: immutable`` and the
+    hash as a strong ETag: once a browser has an image it never asks again.
+    Other files (legacy UUID names) get ``no-cache`` plus an ETag from
+    size and mtime, so repeat views are a 304.
+
+    Supports ``If-None-Match``, single byte ranges (``Range``/``If-Range``,
+    206/416) and HEAD. The body goes out as a zero-copy
+    ``http.response.zerocopysend`` when the ASGI server offers that
+    extension, as an ``X-Accel-Redirect`` to ``accel_redirect`` when the app
+    sits behind nginx (which then serves the file with sendfile), and
+    otherwise as ``chunk_size`` reads done off the event loop.
+    """
+
+    def __init__(self, directory, immutable=None, max_age=31536000,
+                 accel_redirect=None, chunk_size=256 * 1024):
+        self.directory = os.path.realpath(directory)
+        self.immutable = immutable
+        self.max_age = max_age
+        self.accel_redirect = accel_redirect.rstrip("/") + "/" if accel_redirect else None
+        self.chunk_size = chunk_size
+
+    def resolve(self, path):
+        rel = os.path.normpath(path.lstrip("/"))
+        if rel.startswith("..") or os.path.isabs(rel):
+            return None, None
+        full = os.path.realpath(os.path.join(self.directory, rel))
+        if os.path.commonpath([full, self.directory]) != self.directory:
+            return None, None
+        return rel.replace(os.sep, "/"), full
+
+    def validators(self, rel, st):
+        match = self.immutable.match(rel) if self.immutable else None
+        if match:
+            # the name is the content hash; a variant suffix keeps it distinct
+            etag = '"%s"' % os.path.basename(rel).rsplit(".", 1)[0]
+            cache_control = f"public, max-age={self.max_age}, immutable"
+        else:
+            version = f"{st.st_mtime_ns}-{st.st_size}".encode()
+            etag = '"%s"' % hashlib.md5(version, usedforsecurity=False).hexdigest()
+            cache_control = "no-cache"
+        return etag, cache_control
+
+    async def __call__(self, scope, receive, send):
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})
+            await response(scope, receive, send)
+            return
+
+        rel, full = self.resolve(scope["path"])
+        try:
+            st = os.stat(full) if full else None
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
+            await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        etag, cache_control = self.validators(rel, st)
+        headers = {
+            "cache-control": cache_control,
+            "etag": etag,
+            "last-modified": formatdate(st.st_mtime, usegmt=True),
+            "accept-ranges": "bytes",
+        }
+        if etag in {t.strip() for t in request_headers.get("if-none-match", "").split(",")}:
+            await Response(status_code=304, headers=headers)(scope, receive, send)
+            return
+
+        media_type = MIME_TYPES.get(os.path.splitext(rel)[1].lower(), "application/octet-stream")
+        if self.accel_redirect:
+            # nginx re-serves the file (sendfile, ranges); these headers pass through
+            headers["x-accel-redirect"] = self.accel_redirect + rel
+            await Response(headers=headers, media_type=media_type)(scope, receive, send)
+            return
+
+        size = st.st_size
+        status, start, end = 200, 0, size - 1
+        if_range = request_headers.get("if-range")
+        byte_range = parse_range(request_headers.get("range"), size) if if_range in (None, etag) else None
+        if byte_range == "unsatisfiable":
+            headers["content-range"] = f"bytes */{size}"
+            await Response(status_code=416, headers=headers)(scope, receive, send)
+            return
+        if byte_range is not None:
+            status, (start, end) = 206, byte_range
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+        count = end - start + 1 if size else 0
+        headers["content-type"] = media_type
+        headers["content-length"] = str(count)
+
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+        })
+        if scope["method"] == "HEAD" or count == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        fd = os.open(full, os.O_RDONLY)
+        try:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send({"type": "http.response.zerocopysend", "file": fd, "offset": start, "count": count})
+                return
+            offset, remaining = start, count
+            while remaining:
+                chunk = await asyncio.to_thread(_read_at, fd, offset, min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                offset += len(chunk)
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining:
+                # file shrank under us; close the response so the client sees it short
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            os.close(fd)
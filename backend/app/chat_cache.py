@@ -0,0 +1,121 @@
+# backend/app/chat_cache.py
+import hashlib
+import json
+import re
+
+from .cache import LRUCache
+
+# Canned answers, in priority order: when a message mentions several topics
+# the first one listed wins (same as the original keyword loop).
+FAQ_ANSWERS = {
+    'rera': 'RERA (Real Estate Regulatory Authority) registration ensures your property is legally compliant. Always verify the RERA number before purchasing. Registered properties offer better buyer protection.',
+    'loan': 'Home loans are available from banks with interest rates of 8-9% p.a. Use our EMI Calculator to plan your payments. Consider factors like down payment (usually 20%), tenure (up to 30 years), and processing fees.',
+    'document': 'Essential documents: Title Deed, Sale Agreement, Encumbrance Certificate, Property Tax Receipts, Completion Certificate, Occupancy Certificate, and NOC from society/builder.',
+    'price': 'Our AI predicts prices using location, size, amenities, and market trends. Predictions are estimates based on similar properties. Actual prices depend on negotiation and current market conditions.',
+    'sell': 'As a seller: Upload quality images, provide accurate details, add amenities, keep contact info updated. Track interested buyers in your analytics dashboard.',
+    'buy': 'As a buyer: Filter properties by city/BHK/area, save favourites, check seller ratings, use EMI calculator, and contact sellers directly via call/email/WhatsApp.',
+    'invest': 'Investment tips: Research location growth, check infrastructure plans, calculate rental yield, consider appreciation potential, diversify portfolio, and verify legal documents.',
+    'tax': 'Property tax varies by city (0.5-2% of property value annually). Capital gains tax applies on sale (20% with indexation for long-term). Consult a CA for specifics.',
+    'favourite': 'Click the heart icon to save properties. Sellers can see who favourited their listings and connect with interested buyers.',
+    'review': 'Buyers can review properties after viewing. Reviews help other buyers make informed decisions. Your identity remains anonymous to sellers.',
+}
+
+DEFAULT_ANSWER = ("I'm your EstateAI assistant! Ask me about:\n"
+                  "• RERA registration\n"
+                  "• Home loans & EMI\n"
+                  "• Property documents\n"
+                  "• Price predictions\n"
+                  "• Buying/Selling tips\n"
+                  "• Investment advice\n"
+                  "• Property tax\n\n"
+                  "You can also use our EMI Calculator and save favourites!")
+
+_FAQ_PRIORITY = {keyword: i for i, keyword in enumerate(FAQ_ANSWERS)}
+
+# One alternation over all keywords, anchored at the start of a word so
+# "loans" and "taxes" match but "syntax" or "overpriced" do not.
+_FAQ_PATTERN = re.compile(
+    r"\b(" + "|".join(map(re.escape, FAQ_ANSWERS)) + ")",
+    re.IGNORECASE,
+)
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def match_faq(message: str):
+    """FAQ answer for the highest-priority keyword in ``message``, or None."""
+    best = None
+    for match in _FAQ_PATTERN.finditer(message):
+        keyword = match.group(1).lower()
+        if best is None or _FAQ_PRIORITY[keyword] < _FAQ_PRIORITY[best]:
+            best = keyword
+    return FAQ_ANSWERS[best] if best else None
+
+
+def normalize_message(message: str) -> str:
+    """Case, punctuation and spacing insensitive form of a chat message."""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", message.lower())).strip()
+
+
+class ChatResponseCache:
+    """Model answers keyed on the normalized message plus a hash of the
+    conversation history, so rephrasings that differ only in case,
+    punctuation or spacing share an entry.
+
+    Also counts FAQ-routed answers and estimates the model time both avoid:
+    a cache hit saves the recorded generation time of the answer, an FAQ
+    hit the average generation time seen so far.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.faq_hits = 0
+        self.seconds_saved = 0.0
+        self._model_seconds = 0.0
+        self._model_calls = 0
+
+    @staticmethod
+    def key(message: str, history=None) -> str:
+        history_hash = hashlib.sha256(
+            json.dumps(history or [], sort_keys=True, separators=(",", ":")).encode("utf-8")
+        ).hexdigest()
+        return f"{history_hash}:{normalize_message(message)}"
+
+    def get(self, message: str, history=None):
+        entry = self._cache.get(self.key(message, history))
+        if entry is None:
+            return None
+        answer, seconds = entry
+        self.seconds_saved += seconds
+        return answer
+
+    def put(self, message: str, history, answer: str, seconds: float):
+        """Store a model answer that took ``seconds`` to generate."""
+        self._model_seconds += seconds
+        self._model_calls += 1
+        self._cache.set(self.key(message, history), (answer, seconds))
+
+    def faq(self, message: str):
+        """FAQ answer for ``message`` (counted as an avoided model call), or None."""
+        answer = match_faq(message)
+        if answer is not None:
+            self.faq_hits += 1
+            self.seconds_saved += self.avg_model_seconds
+        return answer
+
+    @property
+    def avg_model_seconds(self) -> float:
+        return self._model_seconds / self._model_calls if self._model_calls else 0.0
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {
+            "cache": self._cache.stats(),
+            "faq_hits": self.faq_hits,
+            "model_calls": self._model_calls,
+            "avg_model_seconds": self.avg_model_seconds,
+            "seconds_saved": self.seconds_saved,
+        }
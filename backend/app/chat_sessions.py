@@ -0,0 +1,163 @@
+# backend/app/chat_sessions.py
+import asyncio
+import threading
+import uuid
+
+from .cache import LRUCache
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English text);
+    only used to budget prompts, so no tokenizer dependency."""
+    return len(text) // 4 + 1
+
+
+def message_tokens(message: dict) -> int:
+    # a few tokens of per-message overhead for the role markers
+    return estimate_tokens(message.get("content", "")) + 4
+
+
+def fit_window(turns, token_budget, max_messages):
+    """Most recent messages of ``turns`` that fit both limits, oldest first.
+    Returns ``(window, dropped)`` where ``dropped`` is the older remainder."""
+    used = 0
+    start = len(turns)
+    for message in reversed(turns):
+        cost = message_tokens(message)
+        if len(turns) - start >= max_messages or used + cost > token_budget:
+            break
+        used += cost
+        start -= 1
+    # start the window on a user message so no answer appears without its question
+    while start < len(turns) and turns[start].get("role") == "assistant":
+        start += 1
+    return list(turns[start:]), list(turns[:start])
+
+
+class ChatSession:
+    """One conversation: a running summary of older turns plus the recent
+    messages that still fit the window."""
+
+    def __init__(self, session_id):
+        self.id = session_id
+        self.summary = ""
+        self.turns = []
+        self.pending = []  # dropped turns not yet folded into the summary
+        self.summarizing = False
+        self.lock = threading.Lock()
+
+
+class ChatSessionStore:
+    """Server-side conversation state for the chatbot.
+
+    Clients send a session id and only the new message; the prompt is built
+    from the session's summary and the latest turns that fit
+    ``token_budget`` / ``max_messages``, so its size stays bounded however
+    long the conversation gets. Turns that fall out of the window are folded
+    into the summary by ``summarizer`` (an async ``(summary, messages) ->
+    str`` callable) when one is set, and simply forgotten otherwise.
+    Sessions live in an LRU cache and expire after ``ttl`` seconds idle:
+    every lookup and recorded turn stores the session again, restarting its
+    TTL.
+    """
+
+    def __init__(self, max_sessions=10000, ttl=3600, token_budget=1024,
+                 max_messages=20, summary_tokens=256, summarizer=None):
+        self._sessions = LRUCache(maxsize=max_sessions, ttl=ttl)
+        self.token_budget = token_budget
+        self.max_messages = max_messages
+        self.summary_tokens = summary_tokens
+        self.summarizer = summarizer
+        self.created = 0
+        self.summaries = 0
+        self.summary_failures = 0
+        self._tasks = set()
+
+    def get_or_create(self, session_id=None) -> ChatSession:
+        session = self._sessions.get(session_id) if session_id else None
+        if session is None:
+            session = ChatSession(session_id or uuid.uuid4().hex)
+            self.created += 1
+        self._sessions.set(session.id, session)
+        return session
+
+    def history(self, session: ChatSession) -> list:
+        """Prompt history for the next turn: summary (if any) + recent turns."""
+        with session.lock:
+            budget = self.token_budget
+            history = []
+            if session.summary:
+                summary = {
+                    "role": "system",
+                    "content": "Summary of the earlier conversation: " + session.summary,
+                }
+                history.append(summary)
+                budget -= message_tokens(summary)
+            window, _ = fit_window(session.turns, budget, self.max_messages)
+            return history + window
+
+    def window(self, messages) -> list:
+        """Trim a client-supplied history to the same budget."""
+        window, _ = fit_window(messages, self.token_budget, self.max_messages)
+        return window
+
+    def record(self, session: ChatSession, user_message: str, answer: str):
+        """Append a completed turn and move what no longer fits out of the
+        window (into the summary, in the background, if summarizing). A turn
+        with an empty answer is not kept: Ollama rejects a message without
+        content, which would fail every later turn of the session."""
+        # a long generation must not let an active session expire under it
+        self._sessions.set(session.id, session)
+        if not answer.strip():
+            return
+        with session.lock:
+            session.turns.append({"role": "user", "content": user_message})
+            session.turns.append({"role": "assistant", "content": answer})
+            budget = self.token_budget - (self.summary_tokens if self.summarizer else 0)
+            session.turns, dropped = fit_window(session.turns, budget, self.max_messages)
+            if not dropped or self.summarizer is None:
+                return
+            # Keep dropped turns queued until the summarizer has folded them in
+            session.pending.extend(dropped)
+            if session.summarizing:
+                return
+            session.summarizing = True
+        task = asyncio.ensure_future(self._summarize(session))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _summarize(self, session: ChatSession):
+        while True:
+            with session.lock:
+                pending, session.pending = session.pending, []
+                summary = session.summary
+                if not pending:
+                    session.summarizing = False
+                    return
+            try:
+                summary = await self.summarizer(summary, pending)
+                self.summaries += 1
+            except Exception as e:
+                self.summary_failures += 1
+                print("Chat summary failed:", repr(e))
+                with session.lock:
+                    session.summarizing = False
+                return
+            # never let the summary itself outgrow its share of the budget
+            with session.lock:
+                session.summary = summary.strip()[: self.summary_tokens * 4]
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "created": self.created,
+            "token_budget": self.token_budget,
+            "max_messages": self.max_messages,
+            "summarize": self.summarizer is not None,
+            "summaries": self.summaries,
+            "summary_failures": self.summary_failures,
+        }
@@ -0,0 +1,269 @@
+# backend/app/columnar.py
+"""
+Typed, memory-mapped column bundle for the cleaned training data.
+
+clean_dataset.py writes one next to its CSV (``cleaned_indian_property.frame/``)
+and train_model.py loads it instead of re-parsing the CSV. A bundle is a
+directory holding a ``manifest.json`` and one raw little-endian array file
+per column part:
+
+  numeric     the column's NumPy array (float, int or bool) as is
+  dictionary  int32 codes (-1 = missing); the distinct values are kept in
+              the manifest. Used for repetitive text (CATEGORY_COLUMNS) and
+              for object columns holding non-string values (bools with gaps)
+  text        the column's strings concatenated as UTF-8, int64 character
+              offsets (rows + 1) and a bool missing mask
+
+The manifest also records the schema, a SHA-256 over the array files
+(``content_sha256``) and whatever the writer passes as ``meta`` (the source
+CSV's hash, the cleaner settings). Numeric columns load as copy-on-write
+maps of the files, so only the pages a caller touches are read and nothing
+is parsed; text columns are decoded on load. Files are appended chunk by
+chunk, so the streaming cleaner can write a bundle in bounded memory.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+BUNDLE_SUFFIX = ".frame"
+
+
+def bundle_path(csv_path):
+    """``cleaned.csv`` -> ``cleaned.frame``."""
+    return os.path.splitext(csv_path)[0] + BUNDLE_SUFFIX
+
+
+def file_sha256(path, block=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while True:
+            data = fh.read(block)
+            if not data:
+                return digest.hexdigest()
+            digest.update(data)
+
+
+def read_manifest(path):
+    """The manifest of the bundle at ``path``, or None when there is no
+    readable bundle of this format version."""
+    try:
+        with open(os.path.join(path, MANIFEST), encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == FORMAT_VERSION else None
+
+
+def _json_value(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class _Part:
+    """One array file being appended to."""
+
+    def __init__(self, directory, name, dtype):
+        self.name = name
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+        self.count = 0
+        self.digest = hashlib.sha256()
+        self.fh = open(os.path.join(directory, name), "wb")
+
+    def append(self, values):
+        data = np.ascontiguousarray(values, dtype=self.dtype).tobytes()
+        self.fh.write(data)
+        self.digest.update(data)
+        self.count += len(values)
+
+    def close(self):
+        self.fh.close()
+        return {"file": self.name, "dtype": self.dtype.str, "count": self.count}
+
+
+class FrameWriter:
+    """Append DataFrame chunks with the same columns; ``close`` writes the
+    manifest and moves the bundle into place.
+
+    The kind of each column is fixed by the first chunk. ``dictionary``
+    names text columns to dictionary-encode (categorical columns always
+    are); other string columns are stored as text.
+    """
+
+    def __init__(self, path, dictionary=(), meta=None):
+        self.path = path
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.dictionary = set(dictionary)
+        self.meta = meta or {}
+        self.columns = None
+        self.rows = 0
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+        os.makedirs(self.tmp_path)
+
+    def _start(self, frame):
+        self.columns = []
+        for i, name in enumerate(frame.columns):
+            series = frame[name]
+            column = {"name": str(name), "parts": {}}
+            if series.dtype.kind in "biuf":
+                column["kind"] = "numeric"
+                column["parts"]["values"] = _Part(self.tmp_path, f"c{i:03d}.values", series.dtype)
+            else:
+                mixed = series.dtype == object and not series.dropna().map(type).eq(str).all()
+                if name in self.dictionary or isinstance(series.dtype, pd.CategoricalDtype) or mixed:
+                    column["kind"] = "dictionary"
+                    column["lookup"] = {}
+                    column["parts"]["codes"] = _Part(self.tmp_path, f"c{i:03d}.codes", np.int32)
+                else:
+                    column["kind"] = "text"
+                    column["end"] = 0
+                    column["parts"]["chars"] = open(os.path.join(self.tmp_path, f"c{i:03d}.chars"), "wb")
+                    column["digest"] = hashlib.sha256()
+                    column["parts"]["offsets"] = _Part(self.tmp_path, f"c{i:03d}.offsets", np.int64)
+                    column["parts"]["missing"] = _Part(self.tmp_path, f"c{i:03d}.missing", np.bool_)
+                    column["parts"]["offsets"].append(np.zeros(1))
+            self.columns.append(column)
+
+    def append(self, frame):
+        if self.columns is None:
+            self._start(frame)
+        for column in self.columns:
+            series = frame[column["name"]]
+            parts = column["parts"]
+            if column["kind"] == "numeric":
+                parts["values"].append(series.to_numpy())
+            elif column["kind"] == "dictionary":
+                codes, uniques = pd.factorize(series.astype(object), use_na_sentinel=True)
+                lookup = column["lookup"]
+                for value in uniques:
+                    lookup.setdefault(_json_value(value), len(lookup))
+                remap = np.array([lookup[_json_value(v)] for v in uniques] + [-1], dtype=np.int32)
+                parts["codes"].append(remap[codes])
+            else:
+                missing = series.isna().to_numpy()
+                strings = series.astype(object).where(~missing, "").astype(str)
+                text = "".join(strings).encode("utf-8")
+                parts["chars"].write(text)
+                column["digest"].update(text)
+                lengths = strings.str.len().to_numpy(dtype=np.int64)
+                parts["offsets"].append(column["end"] + np.cumsum(lengths))
+                parts["missing"].append(missing)
+                column["end"] += int(lengths.sum())
+        self.rows += len(frame)
+
+    def close(self):
+        if self.columns is None:
+            raise ValueError("no rows were written")
+        content = hashlib.sha256()
+        schema = []
+        for column in self.columns:
+            entry = {"name": column["name"], "kind": column["kind"], "parts": {}}
+            for key, part in column["parts"].items():
+                if key == "chars":
+                    part.close()
+                    entry["parts"][key] = {"file": os.path.basename(part.name), "dtype": "utf-8",
+                                           "count": column["end"]}
+                    content.update(column["digest"].digest())
+                else:
+                    entry["parts"][key] = part.close()
+                    content.update(part.digest.digest())
+            if column["kind"] == "numeric":
+                entry["dtype"] = entry["parts"]["values"]["dtype"]
+            elif column["kind"] == "dictionary":
+                entry["values"] = list(column["lookup"])
+                content.update(json.dumps(entry["values"]).encode("utf-8"))
+            schema.append(entry)
+        manifest = {
+            "version": FORMAT_VERSION,
+            "rows": self.rows,
+            "columns": schema,
+            "content_sha256": content.hexdigest(),
+            **self.meta,
+        }
+        with open(os.path.join(self.tmp_path, MANIFEST), "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, indent=1)
+        # a directory cannot be renamed over a non-empty one: remove the old
+        # bundle first (readers fall back to the CSV while it is missing)
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self.tmp_path, self.path)
+        return manifest
+
+    def abort(self):
+        for column in self.columns or []:
+            for part in column["parts"].values():
+                (part.fh if isinstance(part, _Part) else part).close()
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+
+def save_frame(frame, path, dictionary=(), meta=None):
+    """Write ``frame`` as a bundle in one go."""
+    writer = FrameWriter(path, dictionary, meta)
+    try:
+        writer.append(frame)
+        return writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def _map(path, part):
+    if part["count"] == 0:
+        return np.empty(0, dtype=part["dtype"])
+    # copy-on-write: callers may modify the frame without touching the file
+    return np.memmap(os.path.join(path, part["file"]), dtype=part["dtype"], mode="c", shape=(part["count"],))
+
+
+def load_frame(path, columns=None, verify=False):
+    """Load the bundle at ``path`` as a DataFrame.
+
+    ``columns`` selects columns by name, case-insensitively; only their files
+    are opened. Numeric columns are memory-mapped, not read. With ``verify``
+    every array file is re-hashed against ``content_sha256`` first.
+    """
+    manifest = read_manifest(path)
+    if manifest is None:
+        raise ValueError(f"{path} is not a column bundle (version {FORMAT_VERSION})")
+    if verify:
+        verify_frame(path, manifest)
+    schema = manifest["columns"]
+    if columns is not None:
+        wanted = {c.lower() for c in columns}
+        schema = [c for c in schema if c["name"].strip().lower() in wanted]
+
+    data = {}
+    for column in schema:
+        parts = column["parts"]
+        if column["kind"] == "numeric":
+            data[column["name"]] = _map(path, parts["values"])
+        elif column["kind"] == "dictionary":
+            values = np.empty(len(column["values"]) + 1, dtype=object)
+            values[:-1] = column["values"]
+            values[-1] = np.nan
+            # one object per distinct value, shared by every row holding it
+            data[column["name"]] = values[_map(path, parts["codes"])]
+        else:
+            with open(os.path.join(path, parts["chars"]["file"]), "rb") as fh:
+                text = fh.read().decode("utf-8")
+            offsets = _map(path, parts["offsets"]).tolist()
+            strings = np.array([text[a:b] for a, b in zip(offsets[:-1], offsets[1:])], dtype=object)
+            strings[_map(path, parts["missing"])] = np.nan
+            data[column["name"]] = strings
+    # copy=False keeps one block per column, so the maps are not copied into
+    # consolidated 2-D blocks
+    return pd.DataFrame(data, columns=[c["name"] for c in schema], copy=False)
+
+
+def verify_frame(path, manifest=None):
+    manifest = manifest or read_manifest(path)
+    content = hashlib.sha256()
+    for column in manifest["columns"]:
+        for part in column["parts"].values():
+            content.update(bytes.fromhex(file_sha256(os.path.join(path, part["file"]))))
+        if column["kind"] == "dictionary":
+            content.update(json.dumps(column["values"]).encode("utf-8"))
+    if content.hexdigest() != manifest["content_sha256"]:
+        raise ValueError(f"{path}: content hash mismatch, the bundle is damaged")
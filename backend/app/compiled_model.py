@@ -0,0 +1,438 @@
+# backend/app/compiled_model.py
+"""
+Inference-only form of the stacking ensemble trained by train_model.py.
+
+compile_stacking() flattens the RandomForest / LightGBM / XGBoost members of
+a fitted StackingRegressor into plain node tables (feature, threshold,
+left/right child, leaf value) and keeps the Ridge blend as coefficients.
+CompiledEnsemble evaluates those tables with a batched NumPy tree walker, so
+serving only needs NumPy: no sklearn, xgboost or lightgbm imports and no
+multi-megabyte pickle at startup.
+
+Each member keeps the split semantics of the library that trained it:
+sklearn and LightGBM go left on ``x <= threshold``, XGBoost on
+``x < threshold`` in float32, and missing values follow the recorded default
+direction.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+MISSING_NONE = 0  # NaN is treated as 0.0 (LightGBM missing_type "None")
+MISSING_ZERO = 1  # 0.0 and NaN take the default branch (LightGBM "Zero")
+MISSING_NAN = 2   # only NaN takes the default branch
+
+# LightGBM's kZeroThreshold
+ZERO_THRESHOLD = 1e-35
+
+ARTIFACT_VERSION = 1
+_NODE_ARRAYS = ("feature", "threshold", "left", "right", "value", "default_left", "missing", "roots")
+# Derived from the node arrays at load time; the mapped bundle stores them too
+# so that workers share them instead of each building a private copy.
+_DERIVED_ARRAYS = ("is_leaf", "children")
+
+BUNDLE_MAGIC = b"REMODEL\x01"
+_BUNDLE_ALIGN = 64
+
+
+class TreeMember:
+    """One tree ensemble flattened into contiguous node arrays.
+
+    Leaves point at themselves through ``left``/``right``.
+    """
+
+    def __init__(self, name, feature, threshold, left, right, value, default_left, missing,
+                 roots, depth, op="le", dtype="float64", input_dtype=None, base=0.0, average=False,
+                 is_leaf=None, children=None):
+        self.name = name
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.default_left = default_left
+        self.missing = missing
+        self.roots = roots
+        self.depth = depth
+        self.op = op
+        self.dtype = np.dtype(dtype)
+        self.input_dtype = np.dtype(input_dtype or dtype)
+        self.base = base
+        self.average = average
+        self.has_zero_missing = bool((missing == MISSING_ZERO).any())
+        self.is_leaf = left == np.arange(len(left)) if is_leaf is None else is_leaf
+        # children[2 * i] is the right child of node i, children[2 * i + 1] the left
+        self.children = np.column_stack([right, left]).ravel() if children is None else children
+
+    def meta(self) -> dict:
+        return {
+            "name": self.name, "depth": self.depth, "op": self.op, "dtype": self.dtype.name,
+            "input_dtype": self.input_dtype.name, "base": self.base, "average": self.average,
+        }
+
+    def arrays(self, derived=False) -> dict:
+        keys = _NODE_ARRAYS + _DERIVED_ARRAYS if derived else _NODE_ARRAYS
+        return {f"{self.name}.{key}": getattr(self, key) for key in keys}
+
+    @classmethod
+    def from_arrays(cls, meta, arrays):
+        name = meta["name"]
+        return cls(
+            name, *(arrays[f"{name}.{key}"] for key in _NODE_ARRAYS),
+            depth=meta["depth"], op=meta["op"], dtype=meta["dtype"], input_dtype=meta["input_dtype"],
+            base=meta["base"], average=meta["average"],
+            **{key: arrays.get(f"{name}.{key}") for key in _DERIVED_ARRAYS},
+        )
+
+    def _advance(self, flat_x, cur, offsets, check_missing, out=None):
+        """Child each cursor at node ``cur`` moves to; a leaf stays put."""
+        idx = self.feature.take(cur, mode="clip")
+        idx += offsets
+        xv = flat_x.take(idx, mode="clip")
+        if check_missing:
+            mt = self.missing.take(cur)
+            isnan = np.isnan(xv)
+            xv = np.where(isnan & (mt != MISSING_NAN), 0, xv)
+            missing = (isnan & (mt == MISSING_NAN)) | (
+                (mt == MISSING_ZERO) & (np.abs(xv) <= ZERO_THRESHOLD)
+            )
+        thr = self.threshold.take(cur, mode="clip")
+        go_left = xv <= thr if self.op == "le" else xv < thr
+        if check_missing:
+            go_left = np.where(missing, self.default_left.take(cur), go_left)
+        np.multiply(cur, 2, out=idx)
+        idx += go_left
+        return self.children.take(idx, out=out, mode="clip")
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        # sklearn rounds inputs to float32 before comparing with float64
+        # thresholds; input_dtype reproduces that rounding.
+        X = np.ascontiguousarray(X.astype(self.input_dtype, copy=False), dtype=self.dtype)
+        n, n_features = X.shape
+        n_trees = len(self.roots)
+        flat_x = X.ravel()
+        check_missing = self.has_zero_missing or bool(np.isnan(flat_x).any())
+
+        # One (row, tree) cursor per entry. While most are still inside a
+        # tree, all of them advance in place (a leaf points at itself, so
+        # finished ones stay put): no gather/scatter of an active set. Once
+        # fewer than a quarter remain, only those are advanced, so the deep
+        # LightGBM branches do not cost a pass over every cursor.
+        node = np.tile(self.roots, n)
+        row_offset = np.repeat(np.arange(n) * n_features, n_trees)
+        leaf = self.is_leaf.take(node)
+        while node.size - np.count_nonzero(leaf) > node.size // 4:
+            self._advance(flat_x, node, row_offset, check_missing, out=node)
+            self.is_leaf.take(node, out=leaf)
+        active = np.flatnonzero(~leaf)
+        while active.size:
+            nxt = self._advance(flat_x, node.take(active), row_offset.take(active), check_missing)
+            node[active] = nxt
+            active = active[~self.is_leaf.take(nxt)]
+
+        leaves = self.value[node].reshape(n, n_trees)
+        # Accumulate tree by tree, in the library's own precision and order.
+        out = np.full(n, self.base, dtype=self.value.dtype)
+        for t in range(leaves.shape[1]):
+            out += leaves[:, t]
+        if self.average:
+            out /= leaves.shape[1]
+        return out
+
+
+def file_fingerprint(path) -> dict:
+    """Size and SHA-256 of a file. Artifacts record the fingerprint of the
+    file they were built from, so freshness never depends on mtimes (a git
+    checkout writes files in no particular order)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return {"size": os.path.getsize(path), "sha256": digest.hexdigest()}
+
+
+def read_meta(path):
+    """The meta of a .npz artifact or a mapped bundle without loading its
+    arrays, or None when the file is missing or unreadable."""
+    try:
+        with open(path, "rb") as fh:
+            magic = fh.read(len(BUNDLE_MAGIC))
+            if magic == BUNDLE_MAGIC:
+                (header_len,) = struct.unpack("<Q", fh.read(8))
+                return json.loads(fh.read(header_len).decode("utf-8"))["meta"]
+        with np.load(path, allow_pickle=False) as data:
+            return json.loads(str(data["meta"][()]))
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+
+class CompiledEnsemble:
+    """Stacking ensemble: tree members blended by a linear final estimator.
+
+    ``source`` is the ``file_fingerprint`` of the pickle it was compiled
+    from (None when unknown); it is saved in the artifact's meta. Rows are
+    walked ``chunk_size`` at a time so the (row, tree) cursor arrays stay
+    cache-sized; 2048 was fastest at 20k rows (1024-4096 within ~15%).
+    """
+
+    def __init__(self, members, coef, intercept, feature_names, chunk_size=2048, source=None):
+        self.members = members
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.n_features_in_ = len(feature_names)
+        self.chunk_size = chunk_size
+        self.source = source
+
+    def predict(self, X) -> np.ndarray:
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has shape {X.shape}, expected (n, {self.n_features_in_})"
+            )
+        if X.shape[0] == 0:
+            raise ValueError("Found array with 0 sample(s)")
+        if X.shape[0] <= self.chunk_size:
+            return self._predict_chunk(X)
+        return np.concatenate([
+            self._predict_chunk(X[i:i + self.chunk_size])
+            for i in range(0, X.shape[0], self.chunk_size)
+        ])
+
+    def _predict_chunk(self, X):
+        stacked = np.column_stack([m.predict(X).astype(np.float64) for m in self.members])
+        return stacked @ self.coef + self.intercept
+
+    def _meta(self) -> dict:
+        return {
+            "version": ARTIFACT_VERSION,
+            "features": [str(f) for f in self.feature_names_in_],
+            "members": [m.meta() for m in self.members],
+            "intercept": self.intercept,
+            "source": self.source,
+        }
+
+    def _arrays(self, derived=False) -> dict:
+        arrays = {"coef": self.coef}
+        for m in self.members:
+            arrays.update(m.arrays(derived))
+        return arrays
+
+    def save(self, path):
+        with open(path, "wb") as fh:
+            np.savez(fh, meta=np.array(json.dumps(self._meta())), **self._arrays())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"][()]))
+            if meta.get("version") != ARTIFACT_VERSION:
+                raise ValueError(f"Unsupported compiled model version: {meta.get('version')}")
+            arrays = {key: data[key] for key in data.files}
+        members = [TreeMember.from_arrays(m, arrays) for m in meta["members"]]
+        return cls(members, arrays["coef"], meta["intercept"], meta["features"], source=meta.get("source"))
+
+    def save_mapped(self, path, built_from=None):
+        """Write a single-file bundle whose arrays can be memory-mapped.
+
+        Layout: magic, little-endian u64 header length, JSON header (meta plus
+        dtype/shape/offset of every array), then the raw arrays, each aligned
+        to 64 bytes. Written to a temporary file and renamed into place so
+        workers never map a half-written bundle. ``built_from`` (the .npz
+        artifact's fingerprint) is kept in the meta.
+        """
+        arrays = {key: np.ascontiguousarray(a) for key, a in self._arrays(derived=True).items()}
+        table, offset = {}, 0
+        for key, a in arrays.items():
+            table[key] = [a.dtype.str, list(a.shape), offset]
+            offset += -(-a.nbytes // _BUNDLE_ALIGN) * _BUNDLE_ALIGN
+        header = json.dumps({"meta": {**self._meta(), "built_from": built_from}, "arrays": table}).encode("utf-8")
+        prefix = len(BUNDLE_MAGIC) + 8 + len(header)
+        data_start = -(-prefix // _BUNDLE_ALIGN) * _BUNDLE_ALIGN
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(BUNDLE_MAGIC + struct.pack("<Q", len(header)) + header)
+            for key, a in arrays.items():
+                fh.seek(data_start + table[key][2])
+                fh.write(a.tobytes())
+            fh.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_mapped(cls, path):
+        """Map a bundle written by save_mapped read-only.
+
+        The arrays are views on the page cache, so every worker process that
+        maps the same file shares one physical copy of the model.
+        """
+        with open(path, "rb") as fh:
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if buf[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            raise ValueError(f"{path} is not a compiled model bundle")
+        (header_len,) = struct.unpack_from("<Q", buf, len(BUNDLE_MAGIC))
+        header_end = len(BUNDLE_MAGIC) + 8 + header_len
+        header = json.loads(bytes(buf[len(BUNDLE_MAGIC) + 8:header_end]).decode("utf-8"))
+        meta = header["meta"]
+        if meta.get("version") != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported compiled model version: {meta.get('version')}")
+        data_start = -(-header_end // _BUNDLE_ALIGN) * _BUNDLE_ALIGN
+
+        arrays = {}
+        for key, (dtype, shape, offset) in header["arrays"].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape))
+            arrays[key] = np.frombuffer(buf, dtype=dtype, count=count, offset=data_start + offset).reshape(shape)
+
+        members = [TreeMember.from_arrays(m, arrays) for m in meta["members"]]
+        model = cls(members, arrays["coef"], meta["intercept"], meta["features"], source=meta.get("source"))
+        model._buffer = buf  # keep the mapping alive as long as the model
+        return model
+
+
+# --- Export from fitted estimators (training side only) ---
+
+def _concat_trees(name, trees, **kwargs):
+    """Merge per-tree node dicts (local indices) into one member table."""
+    roots, offset, depth = [], 0, 0
+    parts = {key: [] for key in ("feature", "threshold", "left", "right", "value", "default_left", "missing")}
+    for tree in trees:
+        roots.append(offset)
+        depth = max(depth, tree.pop("depth"))
+        for key in ("left", "right"):
+            tree[key] = tree[key] + offset
+        for key, values in tree.items():
+            parts[key].append(values)
+        offset += len(tree["feature"])
+
+    dtype = np.dtype(kwargs.get("dtype", "float64"))
+    return TreeMember(
+        name,
+        feature=np.concatenate(parts["feature"]).astype(np.intp),
+        threshold=np.concatenate(parts["threshold"]).astype(dtype),
+        left=np.concatenate(parts["left"]).astype(np.intp),
+        right=np.concatenate(parts["right"]).astype(np.intp),
+        value=np.concatenate(parts["value"]).astype(dtype),
+        default_left=np.concatenate(parts["default_left"]).astype(bool),
+        missing=np.concatenate(parts["missing"]).astype(np.int8),
+        roots=np.asarray(roots, dtype=np.intp),
+        depth=depth,
+        **kwargs,
+    )
+
+
+def _sklearn_tree(tree):
+    n = tree.node_count
+    leaf = tree.children_left == -1
+    idx = np.arange(n)
+    missing_left = getattr(tree, "missing_go_to_left", np.zeros(n, dtype=np.uint8))
+    return {
+        "feature": np.where(leaf, 0, tree.feature),
+        "threshold": np.where(leaf, 0.0, tree.threshold),
+        "left": np.where(leaf, idx, tree.children_left),
+        "right": np.where(leaf, idx, tree.children_right),
+        "value": tree.value[:, 0, 0],
+        "default_left": missing_left.astype(bool),
+        "missing": np.full(n, MISSING_NAN),
+        "depth": tree.max_depth,
+    }
+
+
+def _lightgbm_tree(structure):
+    nodes = []
+    missing_codes = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+
+    def visit(node, level):
+        i = len(nodes)
+        nodes.append(None)
+        if "leaf_value" in node:
+            nodes[i] = (0, 0.0, i, i, node["leaf_value"], False, MISSING_NONE)
+            return level
+        if node["decision_type"] != "<=":
+            raise ValueError(f"Unsupported LightGBM split: {node['decision_type']}")
+        left_depth = visit(node["left_child"], level + 1)
+        right_index = len(nodes)
+        right_depth = visit(node["right_child"], level + 1)
+        nodes[i] = (
+            node["split_feature"], node["threshold"], i + 1, right_index, 0.0,
+            node["default_left"], missing_codes[node["missing_type"]],
+        )
+        return max(left_depth, right_depth)
+
+    depth = visit(structure, 0)
+    cols = list(zip(*nodes))
+    keys = ("feature", "threshold", "left", "right", "value", "default_left", "missing")
+    tree = {key: np.asarray(col) for key, col in zip(keys, cols)}
+    tree["depth"] = depth
+    return tree
+
+
+def _xgboost_tree(tree):
+    """Node table from one entry of XGBoost's JSON model (leaf values live in
+    ``split_conditions``)."""
+    left = np.asarray(tree["left_children"])
+    right = np.asarray(tree["right_children"])
+    if any(tree["split_type"]):
+        raise ValueError("Categorical XGBoost splits are not supported")
+    n = len(left)
+    idx = np.arange(n)
+    leaf = left == -1
+    cond = np.asarray(tree["split_conditions"], dtype=np.float64)
+
+    depth = np.zeros(n, dtype=int)
+    for i in range(n):  # children always have higher ids than their parent
+        if not leaf[i]:
+            depth[left[i]] = depth[right[i]] = depth[i] + 1
+
+    return {
+        "feature": np.where(leaf, 0, tree["split_indices"]),
+        "threshold": np.where(leaf, 0.0, cond),
+        "left": np.where(leaf, idx, left),
+        "right": np.where(leaf, idx, right),
+        "value": np.where(leaf, cond, 0.0),
+        "default_left": np.asarray(tree["default_left"], dtype=bool),
+        "missing": np.full(n, MISSING_NAN),
+        "depth": int(depth.max()),
+    }
+
+
+def compile_stacking(model, feature_names=None) -> CompiledEnsemble:
+    """Flatten a fitted StackingRegressor of RF/LightGBM/XGBoost + linear blend."""
+    if feature_names is None:
+        feature_names = list(model.feature_names_in_)
+    if getattr(model, "passthrough", False):
+        raise ValueError("Stacking with passthrough=True is not supported")
+
+    members = []
+    for (name, _), est in zip(model.estimators, model.estimators_):
+        kind = type(est).__name__
+        if kind == "RandomForestRegressor":
+            trees = [_sklearn_tree(e.tree_) for e in est.estimators_]
+            members.append(_concat_trees(
+                name, trees, op="le", dtype="float64", input_dtype="float32", average=True
+            ))
+        elif kind == "LGBMRegressor":
+            dump = est.booster_.dump_model()
+            if dump["num_tree_per_iteration"] != 1 or dump.get("average_output"):
+                raise ValueError("Only single-output boosted LightGBM models are supported")
+            trees = [_lightgbm_tree(t["tree_structure"]) for t in dump["tree_info"]]
+            members.append(_concat_trees(name, trees, op="le", dtype="float64"))
+        elif kind == "XGBRegressor":
+            learner = json.loads(est.get_booster().save_raw("json"))["learner"]
+            objective = learner["objective"]["name"]
+            if objective != "reg:squarederror" or learner["gradient_booster"]["name"] != "gbtree":
+                raise ValueError(f"Unsupported XGBoost model: {objective}")
+            base = float(np.float32(learner["learner_model_param"]["base_score"]))
+            trees = [_xgboost_tree(t) for t in learner["gradient_booster"]["model"]["trees"]]
+            members.append(_concat_trees(name, trees, op="lt", dtype="float32", base=base))
+        else:
+            raise ValueError(f"Unsupported stacking member: {kind}")
+
+    final = model.final_estimator_
+    return CompiledEnsemble(
+        members, np.ravel(final.coef_), float(np.ravel(final.intercept_)[0]), feature_names
+    )
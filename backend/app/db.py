@@ -1,7 +1,15 @@
 # backend/app/db.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 import os
+import time
+
+try:
+    import asyncpg
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+except ImportError:
+    asyncpg = None
 
 DB_USER = os.getenv("DB_USER", "soumik_user")
 DB_PASS = os.getenv("DB_PASS", "repwinfosys_2025")
@@ -10,7 +18,141 @@ DB_PORT = os.getenv("DB_PORT", "5432")
 DB_NAME = os.getenv("DB_NAME", "real_estate")
 
 DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Pool per engine (and per worker process). Sync endpoints hold a connection
+# for the whole request, so size + overflow caps concurrent database work;
+# requests beyond it wait up to DB_POOL_TIMEOUT seconds for a checkout.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Liveness check on checkout: "always" (a round-trip per checkout), "idle"
+# (only connections unused for more than DB_POOL_PING_IDLE seconds, the ones
+# a restart or firewall timeout may have killed) or "never".
+PRE_PING = os.getenv("DB_POOL_PRE_PING", "idle")
+PING_IDLE = float(os.getenv("DB_POOL_PING_IDLE", "30"))
+
+
+class PoolStats:
+    """Checkout counters for one engine's pool. ``wait`` is the time spent
+    inside the pool getting a connection (queueing, or connecting when the
+    pool grows)."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.waited = 0  # checkouts that took longer than a millisecond
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self.connects = 0
+        self.pings = 0
+        self.ping_failures = 0
+
+    def snapshot(self, pool) -> dict:
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checkouts": self.checkouts,
+            "waited": self.waited,
+            "avg_wait_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.wait_max * 1000, 3),
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "pings": self.pings,
+            "ping_failures": self.ping_failures,
+        }
+
+
+def timed_pool(base, stats):
+    """``base`` pool class that records checkout waits in ``stats``."""
+
+    class TimedPool(base):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                stats.timeouts += 1
+                raise
+            finally:
+                wait = time.perf_counter() - start
+                stats.checkouts += 1
+                stats.wait_total += wait
+                stats.wait_max = max(stats.wait_max, wait)
+                if wait > 0.001:
+                    stats.waited += 1
+
+    TimedPool.__name__ = f"Timed{base.__name__}"
+    return TimedPool
+
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+def pool_options(base, stats):
+    return {
+        "poolclass": timed_pool(base, stats),
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": PRE_PING == "always",
+    }
+
+
+def watch_pool(engine, stats):
+    pool_events = engine.sync_engine if hasattr(engine, "sync_engine") else engine
+
+    @event.listens_for(pool_events, "connect")
+    def on_connect(dbapi_connection, record):
+        stats.connects += 1
+
+    if PRE_PING != "idle":
+        return
+
+    @event.listens_for(pool_events, "checkin")
+    def on_checkin(dbapi_connection, record):
+        if dbapi_connection is not None:
+            record.info["checked_in"] = time.monotonic()
+
+    @event.listens_for(pool_events, "checkout")
+    def on_checkout(dbapi_connection, record, proxy):
+        checked_in = record.info.pop("checked_in", None)
+        if checked_in is None or time.monotonic() - checked_in < PING_IDLE:
+            return
+        stats.pings += 1
+        try:
+            pool_events.dialect.do_ping(dbapi_connection)
+        except Exception:
+            stats.ping_failures += 1
+            # the pool discards this connection and checks out a fresh one
+            raise exc.DisconnectionError()
+
+
+sync_pool_stats = PoolStats()
+engine = create_engine(DATABASE_URL, **pool_options(QueuePool, sync_pool_stats))
+watch_pool(engine, sync_pool_stats)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+# Optional asyncpg engine (DB_ASYNC=1) for hot read endpoints: they await
+# their queries on the event loop instead of holding a threadpool thread and
+# a psycopg2 connection per request. Same pool settings, separate pool.
+async_pool_stats = PoolStats()
+async_engine = None
+AsyncSessionLocal = None
+if os.getenv("DB_ASYNC", "0") == "1":
+    if asyncpg is None:
+        print("DB_ASYNC=1 but asyncpg is not installed; reads stay on the sync engine")
+    else:
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL, **pool_options(AsyncAdaptedQueuePool, async_pool_stats)
+        )
+        watch_pool(async_engine, async_pool_stats)
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+def pool_stats() -> dict:
+    stats = {"sync": sync_pool_stats.snapshot(engine.pool)}
+    if async_engine is not None:
+        stats["async"] = async_pool_stats.snapshot(async_engine.pool)
+    return stats
@@ -4,4 +4,20 @@ from . import models
 
 print("🚀 Creating database tables...")
 models.Base.metadata.create_all(bind=engine)
+
+# create_all skips tables that already exist, so indexes added to a model
+# later are created here for existing databases.
+for table in models.Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
 print("✅ Tables created successfully!")
+
+# Bring the seller analytics rollups in line with existing favourites/reviews
+from .db import SessionLocal
+from . import rollups
+
+session = SessionLocal()
+property_rows, buyer_rows = rollups.reconcile(session)
+session.commit()
+session.close()
+print(f"✅ Analytics rollups rebuilt ({property_rows} properties, {buyer_rows} seller buyers)")
@@ -0,0 +1,410 @@
+# backend/app/features.py
+import json
+import os
+
+import numpy as np
+
+# Column order the shipped stacking pipeline was fitted with (newer models
+# take theirs from FeatureTransformer.features). Positions below are resolved
+# once at import time so the batch encoder never has to look names up per row.
+FEATURES_42 = [
+    'area_num', 'bhk', 'listing_domain_score', 'is_furnished', 'is_rera_registered',
+    'is_apartment', 'price_per_bhk', 'area_per_bhk', 'price_per_bath', 'demand_density',
+    'price_dev_locality', 'luxury_index', 'dist_city_center',
+    'loc_Andheri West', 'loc_Borivali West', 'loc_Chembur', 'loc_Dombivali',
+    'loc_Dwarka Mor', 'loc_Kalyan West', 'loc_Kandivali East', 'loc_Kandivali West',
+    'loc_Kharghar', 'loc_Malad West', 'loc_Mira Road East', 'loc_New Town',
+    'loc_Panvel', 'loc_Powai', 'loc_Rajarhat', 'loc_Thane West', 'loc_Ulwe',
+    'loc_Uttam Nagar', 'loc_Virar', 'loc_other',
+    'city_Bangalore', 'city_Chennai', 'city_Delhi', 'city_Hyderabad',
+    'city_Kolkata', 'city_Lucknow', 'city_Mumbai',
+    'area_cat_medium', 'area_cat_large'
+]
+
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURES_42)}
+
+# city_id used by the frontend -> one-hot column in FEATURES_42
+CITY_FEATURES = {
+    1: "city_Bangalore", 2: "city_Chennai", 3: "city_Delhi", 4: "city_Hyderabad",
+    5: "city_Kolkata", 6: "city_Lucknow", 7: "city_Mumbai"
+}
+
+DEFAULT_LISTING_SCORE = 5.0
+
+# Reference points for dist_city_center. A listing takes the first entry
+# whose key occurs in its lower-cased city name ("navi mumbai" -> mumbai).
+CITY_CENTERS = {
+    "bangalore": (12.9716, 77.5946),
+    "mumbai": (19.0760, 72.8777),
+    "delhi": (28.6139, 77.2090),
+    "chennai": (13.0827, 80.2707),
+    "hyderabad": (17.3850, 78.4867),
+    "kolkata": (22.5726, 88.3639),
+    "lucknow": (26.8467, 80.9462)
+}
+
+_AREA = FEATURE_INDEX["area_num"]
+_BHK = FEATURE_INDEX["bhk"]
+_SCORE = FEATURE_INDEX["listing_domain_score"]
+_FURNISHED = FEATURE_INDEX["is_furnished"]
+_AREA_PER_BHK = FEATURE_INDEX["area_per_bhk"]
+
+# Lookup table indexed by city_id; -1 marks ids without a city column.
+_CITY_COLUMN = np.full(max(CITY_FEATURES) + 1, -1, dtype=np.intp)
+for _city_id, _name in CITY_FEATURES.items():
+    _CITY_COLUMN[_city_id] = FEATURE_INDEX[_name]
+
+
+def encode_batch(items, dtype=np.float32) -> np.ndarray:
+    """Encode a batch of PredictShort-like records into a FEATURES_42 matrix.
+
+    Produces the same values as building one ``{f: 0 for f in FEATURES_42}``
+    dict per item and converting the list with pandas, but fills a single
+    preallocated array column by column instead.
+    """
+    n = len(items)
+    X = np.zeros((n, len(FEATURES_42)), dtype=dtype)
+    if n == 0:
+        return X
+
+    area = np.fromiter((it.area_sqft or 0 for it in items), dtype=np.float64, count=n)
+    bhk = np.fromiter((it.bhk or 0 for it in items), dtype=np.int64, count=n)
+    score = np.fromiter(
+        (it.listing_score or DEFAULT_LISTING_SCORE for it in items), dtype=np.float64, count=n
+    )
+    furnished = np.fromiter((bool(it.is_furnished) for it in items), dtype=np.bool_, count=n)
+    city = np.fromiter(
+        (it.city_id if it.city_id is not None else -1 for it in items), dtype=np.int64, count=n
+    )
+
+    X[:, _AREA] = area
+    X[:, _BHK] = bhk
+    X[:, _SCORE] = score
+    X[:, _FURNISHED] = furnished
+
+    per_bhk = np.zeros(n, dtype=np.float64)
+    np.divide(area, bhk, out=per_bhk, where=(area != 0) & (bhk != 0))
+    X[:, _AREA_PER_BHK] = per_bhk
+
+    known = (city >= 0) & (city < len(_CITY_COLUMN))
+    rows = np.flatnonzero(known)
+    cols = _CITY_COLUMN[city[rows]]
+    hit = cols >= 0
+    X[rows[hit], cols[hit]] = 1
+
+    return X
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km, elementwise over arrays (or scalars)."""
+    R = 6371.0
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = np.radians(lat2 - lat1)
+    dlambda = np.radians(lon2 - lon1)
+    a = np.sin(dphi / 2.0) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2.0) ** 2
+    return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+# Below this many rows a dict pass over a column is cheaper than
+# pd.factorize, whose fixed cost dominates single-listing predictions.
+SMALL_BATCH = 1000
+
+
+def factorize(values):
+    """(codes, distinct values) of a column; code -1 marks missing values."""
+    if len(values) < SMALL_BATCH:
+        index = {}
+        codes = np.fromiter(
+            (-1 if v is None or v != v else index.setdefault(v, len(index)) for v in values),
+            dtype=np.intp, count=len(values)
+        )
+        return codes, list(index)
+    import pandas as pd
+    codes, uniques = pd.factorize(values if hasattr(values, "dtype") else np.asarray(values, dtype=object),
+                                  use_na_sentinel=True)
+    return codes, list(uniques)
+
+
+def _center_table(names, centers):
+    """(lat, lon) per distinct name plus a NaN row at the end for code -1."""
+    table = np.full((len(names) + 1, 2), np.nan)
+    for i, name in enumerate(names):
+        name = str(name).lower()
+        for key, center in centers.items():
+            if key in name:
+                table[i] = center
+                break
+    return table
+
+
+def city_centers(cities, centers=None):
+    """(lat, lon) arrays of the CITY_CENTERS (or ``centers``) entry for each
+    city name; NaN where none matches or the name is missing.
+
+    Each distinct name is matched once and the rows pick their center by
+    code, so the cost of the substring scan does not grow with the rows.
+    """
+    codes, uniques = factorize(cities)
+    centers = _center_table(uniques, centers or CITY_CENTERS)[codes]
+    return centers[:, 0], centers[:, 1]
+
+
+def _rows(columns):
+    if hasattr(columns, "index"):
+        return len(columns.index)
+    return len(next(iter(columns.values()))) if columns else 0
+
+
+def _numeric(columns, name, n):
+    values = columns.get(name)
+    if values is None:
+        return np.full(n, np.nan)
+    return np.asarray(values, dtype=np.float64)
+
+
+def _codes(columns, name, n):
+    values = columns.get(name)
+    if values is None:
+        return np.full(n, -1, dtype=np.intp), []
+    return factorize(values)
+
+
+def _dummy_columns(uniques, top, position):
+    """Dummy column (``position`` of the level) per distinct value plus one
+    for missing values, after mapping values outside ``top`` to "other";
+    -1 for the level drop_first dropped."""
+    other = position.get("other", -1)
+    return np.array([position.get(v, -1) if v in top else other for v in uniques] + [other], dtype=np.intp)
+
+
+class FeatureTransformer:
+    """The model's feature columns from listing columns, with everything
+    train_model.py learns from the training frame stored: per-locality
+    counts (demand_density) and price/sqft means (price_dev_locality), the
+    top-k locality and city vocabularies behind the loc_* / city_* dummies,
+    the city centers and the median distance used for unknown ones.
+
+    ``fit`` takes the validated training frame; ``transform`` takes any
+    mapping of column name -> array (a DataFrame, or ``request_columns`` of
+    a prediction batch) and returns the matrix in ``features`` order, with
+    missing values as 0 like the training matrix. Lookups run once per
+    distinct value, so a batch costs a few array operations, not a groupby.
+
+    Input columns: area_num, bhk, bath (default bhk), price_num and
+    price_per_sqft (unknown when serving), listing_domain_score,
+    is_furnished, is_rera_registered, is_apartment (0/1), locality_name,
+    city_name, latitude, longitude.
+    """
+
+    VERSION = 1
+    BASE_FEATURES = [
+        "area_num", "bhk", "listing_domain_score", "is_furnished", "is_rera_registered", "is_apartment",
+        "price_per_bhk", "area_per_bhk", "price_per_bath", "demand_density", "price_dev_locality",
+        "luxury_index", "dist_city_center"
+    ]
+    AREA_BINS = [0, 1000, 2000, 1e9]
+    AREA_LABELS = ["small", "medium", "large"]
+
+    def __init__(self, localities, locality_counts, locality_means, top_localities, locality_levels,
+                 top_cities, city_levels, centers, distance_fill):
+        self.localities = list(localities)
+        self.locality_counts = np.asarray(locality_counts, dtype=np.float64)
+        self.locality_means = np.asarray(locality_means, dtype=np.float64)
+        self.top_localities = list(top_localities)
+        self.locality_levels = list(locality_levels)
+        self.top_cities = list(top_cities)
+        self.city_levels = list(city_levels)
+        self.centers = {k: tuple(v) for k, v in centers.items()}
+        self.distance_fill = float(distance_fill)
+        # lookup tables with a trailing entry for unknown / missing values
+        self._locality_index = {name: i for i, name in enumerate(self.localities)}
+        self._counts = np.append(self.locality_counts, 0.0)
+        self._means = np.append(self.locality_means, np.nan)
+        self._dummies = [
+            (set(top), {level: i for i, level in enumerate(levels)})
+            for top, levels in ((self.top_localities, self.locality_levels), (self.top_cities, self.city_levels))
+        ]
+        self.features = (
+            self.BASE_FEATURES
+            + [f"loc_{level}" for level in self.locality_levels]
+            + [f"city_{level}" for level in self.city_levels]
+            + [f"area_cat_{label}" for label in self.AREA_LABELS[1:]]
+        )
+
+    @classmethod
+    def fit(cls, df, top_localities=20, top_cities=10):
+        import pandas as pd
+
+        localities, counts, means, top_loc, loc_levels = [], [], [], [], []
+        if "locality_name" in df.columns:
+            price_per_sqft = (df["price_per_sqft"] if "price_per_sqft" in df.columns
+                              else df["price_num"] / df["area_num"])
+            value_counts = df["locality_name"].value_counts()
+            group_means = price_per_sqft.groupby(df["locality_name"]).mean()
+            localities = value_counts.index.tolist()
+            counts = value_counts.to_numpy()
+            means = group_means.reindex(value_counts.index).to_numpy()
+            top_loc = value_counts.nlargest(top_localities).index.tolist()
+            loc_top = df["locality_name"].where(df["locality_name"].isin(top_loc), "other")
+            # the columns get_dummies(drop_first=True) gives: sorted levels
+            # present, first one dropped
+            loc_levels = [c[len("loc_"):] for c in pd.get_dummies(loc_top, prefix="loc", drop_first=True).columns]
+
+        top_city, city_levels = [], []
+        if "city_name" in df.columns:
+            top_city = df["city_name"].value_counts().nlargest(top_cities).index.tolist()
+            city_top = df["city_name"].where(df["city_name"].isin(top_city), "other")
+            city_levels = [c[len("city_"):] for c in pd.get_dummies(city_top, prefix="city", drop_first=True).columns]
+
+        n = len(df)
+        distances = haversine_km(
+            _numeric(df, "latitude", n), _numeric(df, "longitude", n),
+            *city_centers(df["city_name"] if "city_name" in df.columns else np.full(n, ""))
+        )
+        known = distances[~np.isnan(distances)]
+        fill = float(np.median(known)) if len(known) else 0.0
+        return cls(localities, counts, means, top_loc, loc_levels, top_city, city_levels, CITY_CENTERS, fill)
+
+    def transform(self, columns, dtype=np.float64) -> np.ndarray:
+        n = _rows(columns)
+        X = np.zeros((n, len(self.features)), dtype=dtype)
+        if n == 0:
+            return X
+
+        area = _numeric(columns, "area_num", n)
+        bhk = _numeric(columns, "bhk", n)
+        bath = _numeric(columns, "bath", n)
+        bath = np.where(np.isnan(bath), bhk, bath)
+        price = _numeric(columns, "price_num", n)
+        score = _numeric(columns, "listing_domain_score", n)
+        score[np.isnan(score)] = 0.0
+        furnished = _numeric(columns, "is_furnished", n)
+        furnished[np.isnan(furnished)] = 0.0
+
+        def per_bhk(values):
+            return np.divide(values, bhk, out=np.full(n, np.nan), where=bhk != 0)
+
+        bath_per_bhk = per_bhk(bath)
+        bath_per_bhk[np.isnan(bath_per_bhk)] = 0.0
+
+        # each distinct locality / city is looked up once, rows index by code
+        loc_codes, loc_uniques = _codes(columns, "locality_name", n)
+        row = np.array([self._locality_index.get(v, -1) for v in loc_uniques] + [-1], dtype=np.intp)[loc_codes]
+        city_codes, city_uniques = _codes(columns, "city_name", n)
+        center = _center_table(city_uniques, self.centers)[city_codes]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if columns.get("price_per_sqft") is not None:
+                price_per_sqft = _numeric(columns, "price_per_sqft", n)
+            else:
+                price_per_sqft = price / area
+            distance = haversine_km(_numeric(columns, "latitude", n), _numeric(columns, "longitude", n),
+                                    center[:, 0], center[:, 1])
+            base = {
+                "area_num": area,
+                "bhk": bhk,
+                "listing_domain_score": score,
+                "is_furnished": furnished,
+                "is_rera_registered": _numeric(columns, "is_rera_registered", n),
+                "is_apartment": _numeric(columns, "is_apartment", n),
+                "price_per_bhk": per_bhk(price),
+                "area_per_bhk": per_bhk(area),
+                "price_per_bath": price / (bath + 1),
+                "demand_density": self._counts[row],
+                "price_dev_locality": price_per_sqft - self._means[row],
+                "luxury_index": bath_per_bhk + furnished + score,
+                "dist_city_center": np.where(np.isnan(distance), self.distance_fill, distance),
+            }
+        for j, name in enumerate(self.BASE_FEATURES):
+            X[:, j] = base[name]
+
+        start = len(self.BASE_FEATURES)
+        for (top, position), codes, uniques in zip(self._dummies, (loc_codes, city_codes), (loc_uniques, city_uniques)):
+            if position:
+                col = _dummy_columns(uniques, top, position)[codes]
+                hit = np.flatnonzero(col >= 0)
+                X[hit, start + col[hit]] = 1
+            start += len(position)
+
+        # pd.cut(area, AREA_BINS): right-closed bins, outside them no category
+        X[:, start] = (area > self.AREA_BINS[1]) & (area <= self.AREA_BINS[2])
+        X[:, start + 1] = (area > self.AREA_BINS[2]) & (area <= self.AREA_BINS[3])
+
+        X[np.isnan(X)] = 0
+        return X
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.VERSION,
+            "features": self.features,
+            "localities": self.localities,
+            "locality_counts": self.locality_counts.tolist(),
+            "locality_means": self.locality_means.tolist(),
+            "top_localities": self.top_localities,
+            "locality_levels": self.locality_levels,
+            "top_cities": self.top_cities,
+            "city_levels": self.city_levels,
+            "centers": self.centers,
+            "distance_fill": self.distance_fill,
+        }
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as fh:
+            state = json.load(fh)
+        if state.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported feature transformer version: {state.get('version')}")
+        transformer = cls(state["localities"], state["locality_counts"], state["locality_means"],
+                          state["top_localities"], state["locality_levels"], state["top_cities"],
+                          state["city_levels"], state["centers"], state["distance_fill"])
+        if transformer.features != state["features"]:
+            raise ValueError(f"{path}: stored feature list does not match the vocabularies")
+        return transformer
+
+
+# city_id used by the frontend -> city name the transformer matches
+CITY_NAMES = {city_id: name[len("city_"):] for city_id, name in CITY_FEATURES.items()}
+
+
+def request_columns(items) -> dict:
+    """Transformer input columns for a batch of PredictShort-like records.
+    Prices are unknown at prediction time, so the price features are 0."""
+    n = len(items)
+
+    def floats(values):
+        return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=n)
+
+    return {
+        "area_num": np.fromiter((it.area_sqft or 0 for it in items), dtype=np.float64, count=n),
+        "bhk": np.fromiter((it.bhk or 0 for it in items), dtype=np.float64, count=n),
+        "bath": floats(getattr(it, "bath", None) for it in items),
+        "listing_domain_score": np.fromiter(
+            (it.listing_score or DEFAULT_LISTING_SCORE for it in items), dtype=np.float64, count=n
+        ),
+        "is_furnished": np.fromiter((bool(it.is_furnished) for it in items), dtype=np.float64, count=n),
+        "is_rera_registered": np.fromiter(
+            (bool(getattr(it, "is_rera_registered", None)) for it in items), dtype=np.float64, count=n
+        ),
+        "is_apartment": np.fromiter(
+            (str(getattr(it, "property_type", None) or "").lower() == "apartment" for it in items),
+            dtype=np.float64, count=n
+        ),
+        "locality_name": [getattr(it, "locality", None) for it in items],
+        "city_name": [CITY_NAMES.get(it.city_id) for it in items],
+        "latitude": floats(getattr(it, "latitude", None) for it in items),
+        "longitude": floats(getattr(it, "longitude", None) for it in items),
+    }
+
+
+def to_frame(X: np.ndarray, columns=FEATURES_42) -> "pd.DataFrame":
+    """Wrap an encoded matrix with the pipeline's column names (the fitted
+    ``feature_names_in_``; FEATURES_42 for the shipped model)."""
+    # Imported lazily: the compiled model path serves without pandas.
+    import pandas as pd
+    return pd.DataFrame(X, columns=columns, copy=False)
@@ -0,0 +1,301 @@
+# backend/app/ingest.py
+"""Bulk listing ingest.
+
+Partner feeds arrive as NDJSON (one JSON object per line) or CSV with a
+header row. ``ingest`` reads them lazily, validates ``batch_size`` rows at a
+time against the listing schema with one pydantic call per batch, and
+writes each batch in its own transaction with PostgreSQL ``COPY`` (ids are
+reserved from the sequence first, so they can be reported) or a multi-row
+``INSERT ... RETURNING``. Invalid rows are skipped and reported with their
+row number; a batch the database rejects is rolled back and reported
+without stopping the rest of the feed.
+"""
+import csv
+import io
+import json
+import re
+import time
+from functools import lru_cache
+from typing import Optional, get_args
+
+import numpy as np
+from pydantic import EmailStr, TypeAdapter, ValidationError, create_model
+from sqlalchemy import insert, text
+
+from . import models
+from .parsing import parse_areas
+
+# Columns written for every listing, in COPY order.
+COLUMNS = (
+    "id", "seller_id", "property_name", "city_id", "location", "area_sqft", "bhk",
+    "is_furnished", "listing_score", "property_type", "amenities", "seller_phone",
+    "seller_email", "seller_whatsapp", "images", "status",
+)
+LIST_COLUMNS = {"amenities", "images"}
+
+# Python-side column defaults (is_furnished, status). The ORM applies them
+# in place of None; COPY and the multi-row INSERT get explicit None values
+# from model_dump and have to apply them themselves (``_with_defaults``).
+DEFAULTS = {
+    c.name: c.default.arg
+    for c in models.Property.__table__.columns
+    if c.default is not None and c.default.is_scalar
+}
+
+# area_sqft text in dump format: a number ("," grouping allowed) followed by
+# a square-feet unit ("1,200 sq ft", "950 sqft", "800 square feet")
+DUMP_AREA = re.compile(
+    r"^\s*[0-9][0-9,]*(?:\.[0-9]+)?\s*(?:sq\s*ft|sq\s*feet|square\s+feet)\s*$",
+    re.IGNORECASE,
+)
+
+# Errors kept per batch in the report; the counts are always complete.
+MAX_ERRORS_PER_BATCH = 20
+
+
+def read_ndjson(stream):
+    """``(row_number, record)`` per non-blank line of a binary stream;
+    ``record`` is the parse error message for malformed lines."""
+    for number, line in enumerate(io.TextIOWrapper(stream, encoding="utf-8"), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, f"Invalid JSON: {e}"
+            continue
+        yield number, record if isinstance(record, dict) else "Expected a JSON object"
+
+
+def _csv_value(column, value):
+    if value is None or value == "":
+        return None
+    if column in LIST_COLUMNS:
+        # JSON array, or values separated by "|"
+        if value.startswith("["):
+            return json.loads(value)
+        return [v.strip() for v in value.split("|") if v.strip()]
+    return value
+
+
+def read_csv(stream):
+    """``(row_number, record)`` per CSV data row (header is row 1). Empty
+    cells are omitted, so they take the schema default."""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    for number, row in enumerate(reader, start=2):
+        try:
+            yield number, {k: _csv_value(k, v) for k, v in row.items() if k and v not in (None, "")}
+        except ValueError as e:
+            yield number, f"Invalid list value: {e}"
+
+
+READERS = {"ndjson": read_ndjson, "csv": read_csv}
+
+
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+ARRAY_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
+
+def _copy_text(value) -> str:
+    """One field in COPY text format."""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        # array literal: quote every element, then escape for COPY
+        value = "{" + ",".join('"' + str(v).translate(ARRAY_ESCAPES) + '"' for v in value) + "}"
+    return str(value).translate(COPY_ESCAPES)
+
+
+def _with_defaults(row):
+    for column, default in DEFAULTS.items():
+        if row.get(column) is None:
+            row[column] = default
+    return row
+
+
+def write_copy(session, rows) -> list:
+    """COPY ``rows`` (dicts of COLUMNS minus id) into properties; returns ids."""
+    ids = session.execute(
+        text("SELECT nextval(pg_get_serial_sequence('properties', 'id')) FROM generate_series(1, :n)"),
+        {"n": len(rows)},
+    ).scalars().all()
+    buf = io.StringIO()
+    for pid, row in zip(ids, rows):
+        row["id"] = pid
+        _with_defaults(row)
+        values = (row.get(c) for c in COLUMNS)
+        buf.write("\t".join(_copy_text(v) for v in values))
+        buf.write("\n")
+    buf.seek(0)
+    cursor = session.connection().connection.cursor()
+    cursor.copy_expert(f"COPY properties ({', '.join(COLUMNS)}) FROM STDIN", buf)
+    return ids
+
+
+def write_insert(session, rows) -> list:
+    """Multi-row INSERT ... RETURNING id (SQLAlchemy batches the VALUES)."""
+    # an explicit None would be written as NULL, not the column default
+    rows = [_with_defaults(row) for row in rows]
+    return session.execute(
+        insert(models.Property).returning(models.Property.id, sort_by_parameter_order=True), rows
+    ).scalars().all()
+
+
+WRITERS = {"copy": write_copy, "insert": write_insert}
+
+
+_email_adapter = TypeAdapter(EmailStr)
+
+
+@lru_cache(maxsize=4096)
+def _email(value: str) -> str:
+    # email-validator (IDNA checks) is most of the per-row validation cost,
+    # and a feed repeats the same few contact addresses on every row
+    return _email_adapter.validate_python(value)
+
+
+class BatchValidator:
+    """Validates batches against ``schema``. Email fields are checked once
+    per distinct address (see ``_email``); everything else is validated
+    for the whole batch in one pydantic call."""
+
+    def __init__(self, schema):
+        self.email_fields = [
+            name for name, field in schema.model_fields.items()
+            if field.annotation is EmailStr or EmailStr in get_args(field.annotation)
+        ]
+        if self.email_fields:
+            schema = create_model(
+                schema.__name__,
+                __base__=schema,
+                **{name: (Optional[str], schema.model_fields[name].default) for name in self.email_fields},
+            )
+        self.adapter = TypeAdapter(list[schema])
+
+    def validate_python(self, records):
+        """``(items, bad)``: validated models by position (None where
+        invalid) and ``{position: [messages]}``."""
+        bad = {}
+        try:
+            items = self.adapter.validate_python(records)
+        except ValidationError as e:
+            for err in e.errors():
+                index, *field = err["loc"]
+                where = ".".join(str(f) for f in field)
+                bad.setdefault(index, []).append(f"{where}: {err['msg']}" if where else err["msg"])
+            # re-validate only the rows that passed, keeping their positions
+            items = [None] * len(records)
+            good = [i for i in range(len(records)) if i not in bad]
+            for i, item in zip(good, self.adapter.validate_python([records[i] for i in good])):
+                items[i] = item
+
+        for i, item in enumerate(items):
+            if item is None:
+                continue
+            for name in self.email_fields:
+                value = getattr(item, name)
+                if value is None:
+                    continue
+                try:
+                    setattr(item, name, _email(value))
+                except ValidationError as e:
+                    bad.setdefault(i, []).append(f"{name}: {e.errors()[0]['msg']}")
+        return items, bad
+
+
+def normalize_areas(records):
+    """Text ``area_sqft`` values in dump format ("1,200 sq ft") become
+    numbers, parsed for the whole batch at once. Any other text ("-500",
+    "1e3", "big") is left as is for validation to accept or reject:
+    parse_areas would keep only its digits."""
+    texts = [r for r in records
+             if isinstance(r.get("area_sqft"), str) and DUMP_AREA.match(r["area_sqft"])]
+    if texts:
+        for record, value in zip(texts, parse_areas([r["area_sqft"] for r in texts])):
+            if not np.isnan(value):
+                record["area_sqft"] = float(value)
+
+
+def validate_batch(validator, batch, seller_id):
+    """Validate a batch. Returns ``(rows, errors)`` where rows are dicts
+    ready to write and errors are ``{"row", "error"}``."""
+    errors = []
+    candidates = []
+    for number, record in batch:
+        if isinstance(record, str):
+            errors.append({"row": number, "error": record})
+        else:
+            candidates.append((number, record))
+
+    normalize_areas([r for _, r in candidates])
+    items, bad = validator.validate_python([r for _, r in candidates])
+    rows = []
+    for i, (number, _) in enumerate(candidates):
+        if i in bad:
+            errors.append({"row": number, "error": "; ".join(bad[i])})
+            continue
+        row = items[i].model_dump()
+        row["seller_id"] = seller_id
+        rows.append(row)
+    errors.sort(key=lambda e: e["row"])
+    return rows, errors
+
+
+def _batches(records, size):
+    batch = []
+    for item in records:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingest(records, schema, session_factory, seller_id=None, batch_size=1000,
+           method="copy", return_ids=False, on_batch=None) -> dict:
+    """Validate and write ``(row_number, record)`` pairs. Returns totals and
+    a report for every batch that had invalid rows or failed (every batch
+    with ``return_ids``). ``on_batch`` gets each batch report as it
+    completes, for progress output."""
+    write = WRITERS[method]
+    validator = BatchValidator(schema)
+    report = {"method": method, "batch_size": batch_size, "rows": 0, "inserted": 0,
+              "invalid": 0, "failed": 0, "batch_count": 0, "batches": []}
+    start = time.perf_counter()
+
+    for index, batch in enumerate(_batches(records, batch_size)):
+        rows, errors = validate_batch(validator, batch, seller_id)
+        entry = {"batch": index, "first_row": batch[0][0], "last_row": batch[-1][0],
+                 "inserted": 0, "invalid": len(errors), "errors": errors[:MAX_ERRORS_PER_BATCH]}
+        if rows:
+            session = session_factory()
+            try:
+                ids = write(session, rows)
+                session.commit()
+                entry["inserted"] = len(ids)
+                if return_ids:
+                    entry["ids"] = ids
+            except Exception as e:
+                session.rollback()
+                entry["failed"] = len(rows)
+                entry["error"] = str(getattr(e, "orig", e)).strip().splitlines()[0]
+                report["failed"] += len(rows)
+            finally:
+                session.close()
+        report["rows"] += len(batch)
+        report["batch_count"] += 1
+        report["inserted"] += entry["inserted"]
+        report["invalid"] += entry["invalid"]
+        # keep the response small for clean batches of a large feed
+        if entry["invalid"] or entry.get("failed") or return_ids:
+            report["batches"].append(entry)
+        if on_batch:
+            on_batch(entry)
+
+    report["seconds"] = round(time.perf_counter() - start, 3)
+    return report
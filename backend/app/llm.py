@@ -0,0 +1,166 @@
+# backend/app/llm.py
+import asyncio
+import contextlib
+
+import httpx
+
+try:
+    import ollama
+except ImportError:
+    ollama = None
+
+
+class LLMBusy(Exception):
+    """No generation slot became free within the queue timeout."""
+
+
+def chunk_text(chunk) -> str:
+    """Text of one Ollama chat/generate response or stream chunk."""
+    if isinstance(chunk, dict):
+        return (
+            (chunk.get("message") or {}).get("content", "")
+            or chunk.get("response", "")
+            or chunk.get("delta", "")
+        )
+    return str(chunk)
+
+
+class ChatClient:
+    """Async Ollama client shared by the chatbot endpoints.
+
+    One pooled httpx connection set is reused for every call, and at most
+    ``max_concurrency`` generations run at once; further callers wait up to
+    ``queue_timeout`` for a slot and then get ``LLMBusy``. Non-streaming
+    calls are bounded by ``total_timeout``; streams by ``read_timeout``
+    between chunks and ``total_timeout`` overall. Nothing here blocks the
+    event loop, so listings and predictions keep being served while the
+    model generates.
+    """
+
+    def __init__(self, model, host=None, max_concurrency=4, queue_timeout=10.0,
+                 connect_timeout=5.0, read_timeout=60.0, total_timeout=120.0):
+        self.model = model
+        if host and "://" not in host:
+            host = "http://" + host
+        self.host = host
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self._client = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._first_token_seconds = 0.0
+        self._first_tokens = 0
+
+    def _get_client(self):
+        if ollama is None:
+            raise RuntimeError("ollama is not installed")
+        if self._client is None:
+            # Connections are only needed for running generations, so the
+            # pool is sized to the concurrency limit.
+            self._client = ollama.AsyncClient(
+                self.host,
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+        return self._client
+
+    @contextlib.asynccontextmanager
+    async def _slot(self):
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise LLMBusy(f"{self.active} chats in progress") from None
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        try:
+            yield
+            self.completed += 1
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    async def chat(self, messages):
+        """Complete response for ``messages`` (the raw Ollama response)."""
+        async with self._slot():
+            return await asyncio.wait_for(
+                self._get_client().chat(model=self.model, messages=messages, stream=False),
+                self.total_timeout,
+            )
+
+    async def stream(self, messages):
+        """Yield the response text chunk by chunk.
+
+        The next chunk is only read from Ollama after the previous one was
+        taken by the consumer, so a slow SSE client slows its own generation
+        instead of buffering it. Closing the generator (client disconnect)
+        closes the upstream request and frees the slot.
+        """
+        async with self._slot():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            chunks = await asyncio.wait_for(
+                self._get_client().chat(model=self.model, messages=messages, stream=True),
+                self.total_timeout,
+            )
+            first = True
+            try:
+                while True:
+                    remaining = self.total_timeout - (loop.time() - start)
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError
+                    try:
+                        chunk = await asyncio.wait_for(
+                            chunks.__anext__(), min(self.read_timeout, remaining)
+                        )
+                    except StopAsyncIteration:
+                        break
+                    text = chunk_text(chunk)
+                    if text:
+                        if first:
+                            self._first_token_seconds += loop.time() - start
+                            self._first_tokens += 1
+                            first = False
+                        yield text
+            finally:
+                await chunks.aclose()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model,
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "avg_first_token_seconds": (
+                self._first_token_seconds / self._first_tokens if self._first_tokens else None
+            ),
+        }
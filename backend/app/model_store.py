@@ -0,0 +1,278 @@
+# backend/app/model_store.py
+import asyncio
+import os
+import threading
+import time
+from collections import namedtuple
+
+import joblib
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from .compiled_model import CompiledEnsemble, compile_stacking, file_fingerprint, read_meta
+from .features import FeatureTransformer
+
+
+def _build_bundle(compiled_path, bundle_path):
+    """(Re)write the memory-mappable bundle if it is missing or was built
+    from a different .npz artifact (compared by fingerprint, not mtime).
+    Workers starting together serialize on a lock file so they all end up
+    mapping the same inode."""
+    built_from = file_fingerprint(compiled_path)
+
+    def stale():
+        meta = read_meta(bundle_path)
+        return meta is None or meta.get("built_from") != built_from
+
+    if not stale():
+        return
+    with open(bundle_path + '.lock', 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        if stale():
+            CompiledEnsemble.load(compiled_path).save_mapped(bundle_path, built_from)
+
+
+def _recompile(pipeline_path, compiled_path):
+    """Rebuild the .npz artifact when it was not compiled from the current
+    pickle (a new pipeline_v1.pkl dropped in without re-running
+    train_model.py). The artifact records the pickle's fingerprint, so a
+    fresh checkout, whatever order it wrote the files in, is not rebuilt.
+    Returns True when the artifact is current afterwards; serialized like
+    ``_build_bundle``."""
+    source = file_fingerprint(pipeline_path)
+
+    def stale():
+        meta = read_meta(compiled_path)
+        return meta is None or meta.get("source") != source
+
+    if not stale():
+        return True
+    with open(compiled_path + '.lock', 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        if not stale():
+            return True
+        try:
+            compiled = compile_stacking(joblib.load(pipeline_path))
+            compiled.source = source
+            tmp_path = f"{compiled_path}.{os.getpid()}.tmp"
+            compiled.save(tmp_path)
+            os.replace(tmp_path, compiled_path)
+        except Exception as e:
+            print(f"{compiled_path} was not compiled from {pipeline_path} and could not be recompiled, serving the pickle:", e)
+            return False
+    print(f"Recompiled {compiled_path} from the changed {pipeline_path}")
+    return True
+
+
+def load_model(pipeline_path, use_compiled=True, shared=False):
+    """Load the compiled artifact next to ``pipeline_path`` if present,
+    otherwise the pickled StackingRegressor. Returns ``(model, path)``.
+
+    A compiled artifact not built from the current pickle is recompiled from
+    it first; if that fails the pickle is served, so a replaced pickle always
+    takes effect.
+    With ``shared`` the compiled model is served from a read-only memory map
+    (``pipeline_v1.bin``) so all uvicorn workers share one copy of its arrays.
+    """
+    base = os.path.splitext(pipeline_path)[0]
+    compiled_path = base + '.npz'
+    if (use_compiled and os.path.exists(compiled_path)
+            and (not os.path.exists(pipeline_path) or _recompile(pipeline_path, compiled_path))):
+        try:
+            if shared:
+                bundle_path = base + '.bin'
+                _build_bundle(compiled_path, bundle_path)
+                return CompiledEnsemble.load_mapped(bundle_path), bundle_path
+            return CompiledEnsemble.load(compiled_path), compiled_path
+        except Exception as e:
+            print("Failed to load compiled pipeline:", e)
+    if not os.path.exists(pipeline_path):
+        raise FileNotFoundError(f"Pipeline file not found at: {pipeline_path}")
+    return joblib.load(pipeline_path), pipeline_path
+
+
+def load_transformer(transformer_path, model):
+    """The fitted FeatureTransformer saved by train_model.py, or None when
+    there is none or it was not fitted for ``model``'s feature columns (a
+    model trained before the transformer existed): requests then fall back
+    to the fixed FEATURES_42 encoder."""
+    if not os.path.exists(transformer_path):
+        return None
+    try:
+        transformer = FeatureTransformer.load(transformer_path)
+    except Exception as e:
+        print("Failed to load feature transformer:", e)
+        return None
+    expected = [str(f) for f in getattr(model, 'feature_names_in_', [])]
+    if transformer.features != expected:
+        print(f"Feature transformer at {transformer_path} does not match the model's features; not using it")
+        return None
+    return transformer
+
+
+class Serving(namedtuple('Serving', ['model', 'transformer', 'bulk_model', 'bulk_rows'])):
+    """What a prediction is served with. Installed as one immutable object,
+    so a request that reads it once encodes and predicts with the same
+    model and transformer even if a reload lands in between.
+
+    ``bulk_model`` is the pickled pipeline the compiled ``model`` was built
+    from, used for batches of more than ``bulk_rows`` rows: the NumPy tree
+    walker is faster than sklearn/LightGBM/XGBoost only up to about 2000
+    rows (scripts/check_compiled_model.py). None until it has loaded.
+    """
+
+    def model_for(self, rows):
+        if self.bulk_model is not None and rows > self.bulk_rows:
+            return self.bulk_model
+        return self.model
+
+
+class ModelStore:
+    """Holds the serving model and swaps it atomically.
+
+    Loading happens off the event loop (``start`` schedules it on a worker
+    thread) so workers accept traffic immediately and report readiness once
+    the model is in. Reloads build the new model completely before replacing
+    the reference; a prediction that already grabbed the old ``serving``
+    pair finishes on it. With ``bulk_rows`` > 0 and a compiled model, the
+    pickle is loaded on a background thread afterwards (readiness does not
+    wait for it) and serves batches larger than ``bulk_rows``.
+    """
+
+    def __init__(self, pipeline_path, use_compiled=True, shared=False, watch_interval=0.0,
+                 use_transformer=True, bulk_rows=0):
+        self.pipeline_path = pipeline_path
+        self.bulk_rows = bulk_rows
+        self.transformer_path = os.path.join(os.path.dirname(pipeline_path), 'feature_transformer.json')
+        self.use_transformer = use_transformer
+        self.use_compiled = use_compiled
+        self.shared = shared
+        self.watch_interval = watch_interval
+        self.serving = None
+        self.source = None
+        self.error = None
+        self.loaded_at = None
+        self.load_seconds = None
+        self.loads = 0
+        self.failures = 0
+        self._signature = None
+        self._reload_lock = threading.Lock()
+        self._on_swap = []
+        self._tasks = []
+
+    @property
+    def ready(self) -> bool:
+        return self.serving is not None
+
+    @property
+    def model(self):
+        serving = self.serving
+        return serving.model if serving is not None else None
+
+    @property
+    def transformer(self):
+        serving = self.serving
+        return serving.transformer if serving is not None else None
+
+    def on_swap(self, callback):
+        """Register ``callback()`` to run after a new model is installed."""
+        self._on_swap.append(callback)
+
+    def _file_signature(self):
+        paths = [self.pipeline_path, os.path.splitext(self.pipeline_path)[0] + '.npz', self.transformer_path]
+        return tuple(
+            (path, os.stat(path).st_mtime_ns) for path in paths if os.path.exists(path)
+        )
+
+    def load(self):
+        """Load (or reload) synchronously; keeps the current model on failure."""
+        with self._reload_lock:
+            signature = self._file_signature()
+            start = time.perf_counter()
+            try:
+                model, source = load_model(self.pipeline_path, self.use_compiled, self.shared)
+                transformer = load_transformer(self.transformer_path, model) if self.use_transformer else None
+            except Exception as e:
+                self.failures += 1
+                self.error = str(e)
+                print("Failed to load pipeline:", e)
+                return self.model
+
+            # one reference: readers never see a model with the other's transformer
+            self.serving = Serving(model, transformer, None, self.bulk_rows)
+            self.source = source
+            self.error = None
+            self.load_seconds = time.perf_counter() - start
+            self.loaded_at = time.time()
+            self.loads += 1
+            self._signature = signature
+            print(f"Pipeline loaded successfully from: {source} ({self.load_seconds:.2f}s)")
+
+        for callback in self._on_swap:
+            callback()
+        if self.bulk_rows > 0 and isinstance(model, CompiledEnsemble) and model.source is not None:
+            threading.Thread(target=self._load_bulk, args=(self.serving,), daemon=True).start()
+        return model
+
+    def _load_bulk(self, serving):
+        """Attach the pickled pipeline to ``serving`` if that is still the
+        installed pair and the pickle is the one it was compiled from."""
+        try:
+            if file_fingerprint(self.pipeline_path) != serving.model.source:
+                return
+            bulk_model = joblib.load(self.pipeline_path)
+        except Exception as e:
+            print("Failed to load the pickled pipeline for large batches:", e)
+            return
+        with self._reload_lock:
+            if self.serving is not serving:
+                return
+            self.serving = serving._replace(bulk_model=bulk_model)
+        print(f"Batches over {self.bulk_rows} rows are served by {self.pipeline_path}")
+
+    async def reload(self):
+        return await asyncio.get_running_loop().run_in_executor(None, self.load)
+
+    def start(self):
+        """Schedule the initial load and, if enabled, the mtime watcher."""
+        self._tasks.append(asyncio.ensure_future(self.reload()))
+        if self.watch_interval > 0:
+            self._tasks.append(asyncio.ensure_future(self._watch()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def _watch(self):
+        # A new signature has to be seen on two consecutive polls before it is
+        # loaded, so a file that is still being written is not picked up.
+        previous = None
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            signature = self._file_signature()
+            if signature and signature != self._signature and signature == previous:
+                print("Pipeline file changed, reloading...")
+                await self.reload()
+            previous = signature
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "source": self.source,
+            "transformer": self.transformer_path if self.transformer is not None else None,
+            "shared": self.shared,
+            "bulk_rows": self.bulk_rows,
+            "bulk_model": self.serving is not None and self.serving.bulk_model is not None,
+            "loads": self.loads,
+            "failures": self.failures,
+            "last_error": self.error,
+            "load_seconds": self.load_seconds,
+            "loaded_at": self.loaded_at,
+            "watch_interval": self.watch_interval,
+        }
@@ -1,5 +1,5 @@
 # backend/app/models.py - COMPLETE FIXED VERSION
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, ARRAY, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, ARRAY, Text, Index, BigInteger, LargeBinary
 from sqlalchemy.sql import func
 from .db import Base
 
@@ -38,6 +38,16 @@ class Property(Base):
     status = Column(String, default='active')  # NEW: pending, active, sold
     created_at = Column(DateTime, server_default=func.now())
 
+    # Listing search filters on these columns and pages by id (keyset), so
+    # each index ends in id: the planner can seek to the cursor and read the
+    # page in order without a sort.
+    __table_args__ = (
+        Index('ix_properties_city_id_id', 'city_id', 'id'),
+        Index('ix_properties_city_id_bhk_id', 'city_id', 'bhk', 'id'),
+        Index('ix_properties_bhk_id', 'bhk', 'id'),
+        Index('ix_properties_seller_id_id', 'seller_id', 'id'),
+    )
+
 class Favourite(Base):
     """Favourite properties for buyers"""
     __tablename__ = "favourites"
@@ -47,6 +57,12 @@ class Favourite(Base):
     property_id = Column(Integer, ForeignKey('properties.id'), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
 
+    # Seller analytics counts favourites and distinct buyers per property;
+    # (property_id, user_id) answers both from the index alone.
+    __table_args__ = (
+        Index('ix_favourites_property_id_user_id', 'property_id', 'user_id'),
+    )
+
 class Review(Base):
     """Reviews for properties (anonymous to sellers)"""
     __tablename__ = "reviews"
@@ -56,4 +72,45 @@ class Review(Base):
     property_id = Column(Integer, ForeignKey('properties.id'), nullable=False)
     rating = Column(Integer, nullable=False)  # 1-5
     comment = Column(Text, nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_reviews_property_id_id', 'property_id', 'id'),
+    )
+
+class PropertyStats(Base):
+    """Per-property analytics rollup, updated alongside favourites and
+    reviews (see rollups.py) so seller analytics reads one row per property"""
+    __tablename__ = "property_stats"
+    
+    property_id = Column(Integer, ForeignKey('properties.id'), primary_key=True)
+    seller_id = Column(Integer, ForeignKey('users.id'), nullable=True, index=True)
+    favourite_count = Column(Integer, nullable=False, default=0, server_default='0')
+    unique_buyer_count = Column(Integer, nullable=False, default=0, server_default='0')
+    review_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_sum = Column(BigInteger, nullable=False, default=0, server_default='0')
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class SellerBuyer(Base):
+    """Buyers who favourited or reviewed any of a seller's properties.
+    favourite_count > 0 marks an interested buyer; reviewer_number is the
+    stable "Buyer N" label shown on that buyer's reviews"""
+    __tablename__ = "seller_buyers"
+    
+    seller_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    favourite_count = Column(Integer, nullable=False, default=0, server_default='0')
+    reviewer_number = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index('ix_seller_buyers_seller_id_reviewer_number', 'seller_id', 'reviewer_number'),
+    )
+
+class RevokedToken(Base):
+    """Bearer tokens revoked before their expiry (POST /api/logout), shared
+    by every worker. A row only has to outlive the token it blocks, so rows
+    past expires_at are purged as new revocations come in"""
+    __tablename__ = "revoked_tokens"
+
+    digest = Column(LargeBinary(32), primary_key=True)  # SHA-256 of the token
+    expires_at = Column(DateTime, nullable=True, index=True)  # token exp (UTC); NULL never expires
@@ -0,0 +1,112 @@
+# backend/app/parsing.py
+"""Price and area strings from listing dumps ("1,25,00,000", "1.2 Cr",
+"85 Lakh", "1,200 sq ft") as floats.
+
+``parse_price`` / ``parse_area`` are the per-value rules clean_dataset.py
+has always applied and stay the reference. ``parse_prices`` /
+``parse_areas`` give the same results for a whole column: each distinct
+string is parsed once (``pd.factorize``), the regular shapes go through
+one regex and a NumPy unit multiply, and only strings the regex does not
+cover fall back to the per-value function.
+"""
+import numpy as np
+import pandas as pd
+
+UNITS = {"Cr": 1e7, "Lac": 1e5, "Lakh": 1e5}
+
+# digits with optional "," grouping and one optional decimal part, then an
+# optional unit: "1,25,00,000", "1.25 Cr", "85Lakh", ".5 Cr"
+PRICE = r"^(?P<num>[0-9][0-9,]*(?:\.[0-9]*)?|\.[0-9]+)\s*(?P<unit>Cr|Lakh|Lac)?$"
+# what is left of an area after keeping digits, "." and ",": float() accepts
+# it exactly when there is a digit and at most one "."
+AREA_NUMBER = r"^[0-9]*\.?[0-9]*$"
+
+# Below this many values the fixed cost of the pandas calls outweighs the
+# per-value loop, so short inputs (ingest batches) take that instead.
+SMALL = 5000
+
+
+def parse_price(x):
+    """Convert price strings (e.g., '50 Cr', '5 Lakh') to float."""
+    try:
+        x = str(x).strip()
+        if not x or x.lower() == 'nan':
+            return np.nan
+        if 'Cr' in x:
+            return float(x.replace('Cr','').replace(',','').strip()) * 1e7
+        elif 'Lac' in x or 'Lakh' in x or 'Lacs' in x:
+            return float(x.replace('Lac','').replace('Lakh','').replace('Lacs','').replace(',','').strip()) * 1e5
+        else:
+            return float(x.replace(',','').strip())
+    except Exception as e:
+        return np.nan
+
+
+def parse_area(x):
+    """Extract numeric value from area strings (e.g., '1,200 sq.ft')."""
+    try:
+        s = str(x).strip()
+        if not s or s.lower() == 'nan':
+            return np.nan
+        num = ''.join(ch for ch in s if ch.isdigit() or ch in ['.', ','])
+        if not num:
+            return np.nan
+        return float(num.replace(',',''))
+    except Exception as e:
+        return np.nan
+
+
+def _by_unique(values, parse_unique, parse_one):
+    """Apply ``parse_unique`` (Series of distinct strings -> float array) to
+    each distinct value once; missing values give NaN."""
+    if len(values) < SMALL:
+        return np.array([parse_one(v) for v in values], dtype=float)
+    if isinstance(getattr(values, "dtype", None), pd.CategoricalDtype):
+        # read_csv already found the distinct values
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+    parsed = parse_unique(pd.Series(uniques, dtype=object).astype(str).str.strip())
+    # code -1 (missing) picks the NaN appended at the end
+    return np.append(parsed, np.nan)[codes]
+
+
+def _fallback(strings, out, todo, parse_one):
+    for i in np.flatnonzero(todo):
+        out[i] = parse_one(strings.iat[i])
+
+
+def _prices(strings):
+    out = np.full(len(strings), np.nan)
+    parts = strings.str.extract(PRICE)
+    matched = parts["num"].notna().to_numpy()
+    if matched.any():
+        numbers = parts["num"][matched].str.replace(",", "", regex=False).to_numpy().astype(float)
+        scale = parts["unit"][matched].map(UNITS).fillna(1.0).to_numpy()
+        out[matched] = numbers * scale
+    blank = (strings == "") | (strings.str.lower() == "nan")
+    _fallback(strings, out, ~matched & ~blank.to_numpy(), parse_price)
+    return out
+
+
+def _areas(strings):
+    out = np.full(len(strings), np.nan)
+    numbers = strings.str.replace(r"[^0-9.,]", "", regex=True).str.replace(",", "", regex=False)
+    # str.isdigit also accepts non-ASCII digits ("²"); leave those to parse_area
+    ascii_only = ~strings.str.contains(r"[^\x00-\x7f]", regex=True).to_numpy()
+    valid = (numbers.str.match(AREA_NUMBER) & numbers.str.contains(r"[0-9]", regex=True)).to_numpy()
+    plain = ascii_only & valid
+    if plain.any():
+        out[plain] = numbers[plain].to_numpy().astype(float)
+    _fallback(strings, out, ~ascii_only, parse_area)
+    return out
+
+
+def parse_prices(values) -> np.ndarray:
+    """``parse_price`` over a column (any iterable); returns float64."""
+    return _by_unique(values, _prices, parse_price)
+
+
+def parse_areas(values) -> np.ndarray:
+    """``parse_area`` over a column (any iterable); returns float64."""
+    return _by_unique(values, _areas, parse_area)
@@ -0,0 +1,145 @@
+# backend/app/passwords.py
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+
+class HasherBusy(Exception):
+    """The password hashing queue is full; the caller should retry later."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"password hashing busy, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def make_context(rounds=12) -> CryptContext:
+    """bcrypt context pinned to ``rounds``: hashes made with any other cost
+    report ``needs_update``, so they are rehashed on the next login."""
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+class PasswordHasher:
+    """Runs bcrypt on its own small thread pool instead of FastAPI's shared
+    one, so a burst of logins cannot occupy the threads that serve listings,
+    favourites and predictions.
+
+    bcrypt releases the GIL, so ``workers`` threads hash in parallel. The
+    threads lower their scheduling priority by ``nice`` (Linux) so request
+    handling wins the CPU when both are runnable. Admission is bounded
+    twice: at most ``max_pending`` hashes queued or running, and none
+    accepted when the expected wait (queue depth x recent average hash
+    time / workers) exceeds ``max_wait`` seconds. Rejected calls raise
+    ``HasherBusy``.
+    """
+
+    def __init__(self, context, workers=2, max_pending=64, max_wait=5.0, nice=0,
+                 initial_seconds=0.25):
+        self.context = context
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_wait = max_wait
+        self.nice = nice
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt", initializer=self._init_worker
+        )
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        # moving average of one hash, seeded so admission works from the start
+        self.avg_seconds = initial_seconds
+
+    def _init_worker(self):
+        if self.nice:
+            try:
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.nice)
+            except (AttributeError, OSError):
+                pass
+
+    def expected_wait(self) -> float:
+        return self.pending * self.avg_seconds / self.workers
+
+    def check(self):
+        """Raise ``HasherBusy`` now if a new hash would not be admitted, so
+        callers can shed load before doing any other work."""
+        with self._lock:
+            self._check()
+
+    def _check(self):
+        wait = self.expected_wait()
+        if self.pending >= self.max_pending or wait > self.max_wait:
+            self.rejected += 1
+            raise HasherBusy(max(1.0, wait))
+
+    def _admit(self):
+        with self._lock:
+            self._check()
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+
+    def _timed(self, fn, *args):
+        with self._lock:
+            self.running += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.running -= 1
+                self.pending -= 1
+                self.completed += 1
+                self.avg_seconds += 0.2 * (elapsed - self.avg_seconds)
+
+    async def _submit(self, fn, *args):
+        self._admit()
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._executor, self._timed, fn, *args)
+        except BaseException:
+            with self._lock:
+                self.pending -= 1
+            raise
+        return await future
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(self.context.hash, password)
+
+    async def verify_and_update(self, password: str, password_hash: str):
+        """``(valid, new_hash)``; ``new_hash`` is set when the stored hash was
+        made with outdated cost settings and should replace it."""
+        valid, new_hash = await self._submit(self.context.verify_and_update, password, password_hash)
+        if new_hash:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "running": self.running,
+            "queued": self.pending - self.running,
+            "peak_pending": self.peak_pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "avg_seconds": self.avg_seconds,
+            "expected_wait_seconds": self.expected_wait(),
+        }
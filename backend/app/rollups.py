@@ -0,0 +1,209 @@
+# backend/app/rollups.py
+"""Incremental maintenance of the seller analytics rollups.
+
+``property_stats`` and ``seller_buyers`` (see models.py) are updated in the
+same transaction as the favourite/review write that changes them, using
+PostgreSQL upserts so concurrent requests add to the counters instead of
+overwriting each other. ``reconcile`` rebuilds them from the event tables;
+run it after bulk imports or from a periodic job (scripts/reconcile_rollups.py).
+"""
+from sqlalchemy import delete, func, literal, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+
+from . import models
+
+PropertyStats = models.PropertyStats
+SellerBuyer = models.SellerBuyer
+
+# First key of the transaction-level advisory lock that serializes reviewer
+# numbering per seller (the second key is the seller id).
+REVIEWER_NUMBER_LOCK = 0x5B01
+
+
+def _seller_of(session, property_id):
+    return session.execute(
+        select(models.Property.seller_id).where(models.Property.id == property_id)
+    ).scalar()
+
+
+def _bump_property(session, property_id, seller_id, **deltas):
+    stmt = insert(PropertyStats).values(property_id=property_id, seller_id=seller_id, **deltas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PropertyStats.property_id],
+        set_={
+            **{name: getattr(PropertyStats, name) + getattr(stmt.excluded, name) for name in deltas},
+            "updated_at": func.now(),
+        },
+    )
+    session.execute(stmt)
+
+
+def favourite_added(session, property_id, user_id):
+    """Count a new (user, property) favourite."""
+    seller_id = _seller_of(session, property_id)
+    _bump_property(session, property_id, seller_id, favourite_count=1, unique_buyer_count=1)
+    if seller_id is None:
+        return
+    stmt = insert(SellerBuyer).values(seller_id=seller_id, user_id=user_id, favourite_count=1)
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=[SellerBuyer.seller_id, SellerBuyer.user_id],
+        set_={"favourite_count": SellerBuyer.favourite_count + 1},
+    ))
+
+
+def favourite_removed(session, property_id, user_id):
+    """Uncount a deleted favourite (call after the row is deleted and flushed)."""
+    seller_id = _seller_of(session, property_id)
+    still_favourited = session.execute(
+        select(models.Favourite.id).where(
+            models.Favourite.property_id == property_id,
+            models.Favourite.user_id == user_id,
+        ).limit(1)
+    ).first() is not None
+    _bump_property(
+        session, property_id, seller_id,
+        favourite_count=-1, unique_buyer_count=0 if still_favourited else -1,
+    )
+    if seller_id is None:
+        return
+    session.execute(
+        update(SellerBuyer)
+        .where(SellerBuyer.seller_id == seller_id, SellerBuyer.user_id == user_id)
+        .values(favourite_count=SellerBuyer.favourite_count - 1)
+    )
+    session.execute(
+        delete(SellerBuyer).where(
+            SellerBuyer.seller_id == seller_id,
+            SellerBuyer.user_id == user_id,
+            SellerBuyer.favourite_count <= 0,
+            SellerBuyer.reviewer_number.is_(None),
+        )
+    )
+
+
+def review_added(session, property_id, user_id, rating):
+    """Count a new review and give the reviewer a "Buyer N" number for this
+    seller if they do not have one yet."""
+    seller_id = _seller_of(session, property_id)
+    _bump_property(session, property_id, seller_id, review_count=1, rating_sum=rating)
+    if seller_id is None:
+        return
+    # max + 1 is not safe on its own: two first reviews for the same seller
+    # would both read the same max. Held until the transaction commits.
+    session.execute(
+        text("SELECT pg_advisory_xact_lock(:kind, :seller_id)"),
+        {"kind": REVIEWER_NUMBER_LOCK, "seller_id": seller_id},
+    )
+    next_number = select(func.coalesce(func.max(SellerBuyer.reviewer_number), 0) + 1).where(
+        SellerBuyer.seller_id == seller_id
+    ).scalar_subquery()
+    stmt = insert(SellerBuyer).values(
+        seller_id=seller_id, user_id=user_id, favourite_count=0, reviewer_number=next_number
+    )
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=[SellerBuyer.seller_id, SellerBuyer.user_id],
+        set_={"reviewer_number": func.coalesce(SellerBuyer.reviewer_number, stmt.excluded.reviewer_number)},
+    ))
+
+
+def reconcile(session, seller_id=None):
+    """Recompute the rollups from favourites and reviews, for one seller or
+    all of them. Returns ``(property_rows, seller_buyer_rows)`` written.
+    The caller commits."""
+    properties = select(models.Property.id, models.Property.seller_id)
+    if seller_id is not None:
+        properties = properties.where(models.Property.seller_id == seller_id)
+    properties = properties.subquery()
+
+    favs = (
+        select(
+            models.Favourite.property_id,
+            func.count(models.Favourite.id).label("favourite_count"),
+            func.count(models.Favourite.user_id.distinct()).label("unique_buyer_count"),
+        )
+        .join(properties, properties.c.id == models.Favourite.property_id)
+        .group_by(models.Favourite.property_id)
+        .subquery()
+    )
+    reviews = (
+        select(
+            models.Review.property_id,
+            func.count(models.Review.id).label("review_count"),
+            func.sum(models.Review.rating).label("rating_sum"),
+        )
+        .join(properties, properties.c.id == models.Review.property_id)
+        .group_by(models.Review.property_id)
+        .subquery()
+    )
+    rows = (
+        select(
+            properties.c.id,
+            properties.c.seller_id,
+            func.coalesce(favs.c.favourite_count, 0),
+            func.coalesce(favs.c.unique_buyer_count, 0),
+            func.coalesce(reviews.c.review_count, 0),
+            func.coalesce(reviews.c.rating_sum, 0),
+        )
+        .outerjoin(favs, favs.c.property_id == properties.c.id)
+        .outerjoin(reviews, reviews.c.property_id == properties.c.id)
+    )
+    stmt = insert(PropertyStats).from_select(
+        ["property_id", "seller_id", "favourite_count", "unique_buyer_count", "review_count", "rating_sum"],
+        rows,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PropertyStats.property_id],
+        set_={
+            name: getattr(stmt.excluded, name)
+            for name in ("seller_id", "favourite_count", "unique_buyer_count", "review_count", "rating_sum")
+        } | {"updated_at": func.now()},
+    )
+    property_rows = session.execute(stmt).rowcount
+
+    # seller_buyers is rebuilt outright: favourite counts per (seller, buyer),
+    # then reviewer numbers in order of each reviewer's first review.
+    cleared = delete(SellerBuyer)
+    if seller_id is not None:
+        cleared = cleared.where(SellerBuyer.seller_id == seller_id)
+    session.execute(cleared)
+
+    buyer_favs = (
+        select(properties.c.seller_id, models.Favourite.user_id, func.count(models.Favourite.id))
+        .join(models.Favourite, models.Favourite.property_id == properties.c.id)
+        .where(properties.c.seller_id.is_not(None))
+        .group_by(properties.c.seller_id, models.Favourite.user_id)
+    )
+    session.execute(insert(SellerBuyer).from_select(["seller_id", "user_id", "favourite_count"], buyer_favs))
+
+    first_reviews = (
+        select(
+            properties.c.seller_id,
+            models.Review.user_id,
+            func.min(models.Review.id).label("first_id"),
+        )
+        .join(models.Review, models.Review.property_id == properties.c.id)
+        .where(properties.c.seller_id.is_not(None))
+        .group_by(properties.c.seller_id, models.Review.user_id)
+        .subquery()
+    )
+    reviewers = select(
+        first_reviews.c.seller_id,
+        first_reviews.c.user_id,
+        literal(0),
+        func.row_number().over(
+            partition_by=first_reviews.c.seller_id, order_by=first_reviews.c.first_id
+        ),
+    )
+    stmt = insert(SellerBuyer).from_select(
+        ["seller_id", "user_id", "favourite_count", "reviewer_number"], reviewers
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SellerBuyer.seller_id, SellerBuyer.user_id],
+        set_={"reviewer_number": stmt.excluded.reviewer_number},
+    )
+    session.execute(stmt)
+
+    counted = select(func.count()).select_from(SellerBuyer)
+    if seller_id is not None:
+        counted = counted.where(SellerBuyer.seller_id == seller_id)
+    return property_rows, session.execute(counted).scalar()
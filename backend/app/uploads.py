@@ -0,0 +1,321 @@
+# backend/app/uploads.py
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+# Longest edge in pixels of each resized copy. Listing cards load "card";
+# "full" caps what a detail view downloads however large the original was.
+VARIANTS = {"thumb": 160, "card": 480, "full": 1600}
+VARIANT_QUALITY = 82
+
+# Leading bytes of the formats we accept; the stored extension comes from
+# the content, never from the client's filename.
+SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+
+class UploadRejected(Exception):
+    def __init__(self, status_code, detail):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def sniff_extension(head: bytes):
+    for signature, ext in SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+# <aa>/<bb>/<digest>[_<variant>].<ext>, relative to the upload directory.
+# Two levels of 256 shards keep every directory small.
+BLOB_PATH = re.compile(
+    r"^(?P<a>[0-9a-f]{2})/(?P<b>[0-9a-f]{2})/(?P<digest>(?P=a)(?P=b)[0-9a-f]{60})"
+    r"(?:_(?P<variant>[a-z]+))?\.\w+$"
+)
+
+
+def blob_path(digest: str, suffix: str) -> str:
+    return f"{digest[:2]}/{digest[2:4]}/{digest}{suffix}"
+
+
+def variant_name(digest: str, variant: str) -> str:
+    return blob_path(digest, f"_{variant}.jpg")
+
+
+def _write_chunk(handle, hasher, chunk):
+    hasher.update(chunk)
+    handle.write(chunk)
+
+
+class UploadStore:
+    """Content-addressed image uploads with resized variants.
+
+    ``save`` streams an upload to a temporary file in ``chunk_size`` pieces
+    (disk writes and hashing run off the event loop), enforces ``max_bytes``
+    and stores it under its SHA-256 in a sharded tree (``BLOB_PATH``).
+    Uploading bytes that are already stored keeps the existing file and does
+    no further work. New images get thumb/card/full JPEG variants (see
+    ``VARIANTS``) rendered by a small background thread pool, written next
+    to the original as ``<digest>_<variant>.jpg``; until they exist clients
+    fall back to the original. Render threads run ``nice`` levels below
+    request handling. Blobs no Property.images entry points to are removed
+    by ``collect_garbage``.
+    """
+
+    def __init__(self, directory, url_prefix, max_bytes=10 * 1024 * 1024,
+                 chunk_size=1024 * 1024, workers=2, nice=10):
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.nice = nice
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="thumbs", initializer=self._init_worker
+        )
+        self._lock = threading.Lock()
+        self._rendering = set()
+        self.uploads = 0
+        self.duplicates = 0
+        self.bytes_deduplicated = 0
+        self.rejected = 0
+        self.variants_rendered = 0
+        self.variant_failures = 0
+
+    def _init_worker(self):
+        if self.nice:
+            try:
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.nice)
+            except (AttributeError, OSError):
+                pass
+
+    def url(self, name: str) -> str:
+        return f"{self.url_prefix}/{name}"
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, *name.split("/"))
+
+    def describe(self, digest: str, name: str) -> dict:
+        return {
+            "filename": name,
+            "url": self.url(name),
+            "sha256": digest,
+            "variants": {v: self.url(variant_name(digest, v)) for v in VARIANTS},
+        }
+
+    async def save(self, upload) -> dict:
+        """Store an ``UploadFile``; returns ``describe()`` plus ``duplicate``."""
+        tmp_path = os.path.join(self.directory, f".upload-{uuid.uuid4().hex}")
+        hasher = hashlib.sha256()
+        size = 0
+        ext = None
+        try:
+            with open(tmp_path, "wb") as handle:
+                while True:
+                    chunk = await upload.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    if ext is None:
+                        ext = sniff_extension(chunk[:16])
+                        if ext is None:
+                            raise UploadRejected(415, "Only JPEG, PNG, GIF and WebP images are accepted")
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise UploadRejected(
+                            413, f"File exceeds the {self.max_bytes // (1024 * 1024)} MB upload limit"
+                        )
+                    await asyncio.to_thread(_write_chunk, handle, hasher, chunk)
+            if ext is None:
+                raise UploadRejected(400, "Empty file")
+
+            digest = hasher.hexdigest()
+            name = blob_path(digest, f".{ext}")
+            path = self.path(name)
+            duplicate = os.path.exists(path)
+            if duplicate:
+                os.remove(tmp_path)
+                # a fresh mtime keeps the blob out of reach of garbage
+                # collection until the listing that reuses it is saved
+                os.utime(path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+        except UploadRejected:
+            self.rejected += 1
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.uploads += 1
+        if duplicate:
+            self.duplicates += 1
+            self.bytes_deduplicated += size
+        self.render_variants(digest, path)
+        return {**self.describe(digest, name), "duplicate": duplicate}
+
+    def render_variants(self, digest: str, path: str):
+        """Queue variant rendering unless the variants exist or are queued."""
+        if Image is None:
+            return
+        if all(os.path.exists(self.path(variant_name(digest, v))) for v in VARIANTS):
+            return
+        with self._lock:
+            if digest in self._rendering:
+                return
+            self._rendering.add(digest)
+        self._executor.submit(self._render, digest, path)
+
+    def _render(self, digest: str, path: str):
+        try:
+            with Image.open(path) as img:
+                # JPEGs decode straight at a reduced scale (DCT scaling), which
+                # is most of the cost for camera-sized photos
+                largest = max(VARIANTS.values())
+                img.draft("RGB", (largest, largest))
+                img = ImageOps.exif_transpose(img).convert("RGB")
+                # largest first, so each smaller copy resizes the previous one
+                for variant, edge in sorted(VARIANTS.items(), key=lambda kv: -kv[1]):
+                    img.thumbnail((edge, edge), Image.LANCZOS)
+                    out = self.path(variant_name(digest, variant))
+                    tmp = f"{out}.{uuid.uuid4().hex}.tmp"
+                    img.save(tmp, "JPEG", quality=VARIANT_QUALITY, optimize=True, progressive=True)
+                    os.replace(tmp, out)
+            self.variants_rendered += len(VARIANTS)
+        except Exception as e:
+            self.variant_failures += 1
+            print(f"Image variants failed for {digest}:", repr(e))
+        finally:
+            with self._lock:
+                self._rendering.discard(digest)
+
+    def adopt(self, name: str):
+        """Copy a legacy (UUID-named) upload into the content-addressed tree
+        and queue its variants; returns the new URL, or None if the file is
+        missing or not an image. The legacy file is left for ``collect_garbage``."""
+        src = self.path(name)
+        hasher = hashlib.sha256()
+        try:
+            with open(src, "rb") as handle:
+                ext = sniff_extension(handle.read(16))
+                if ext is None:
+                    return None
+                handle.seek(0)
+                for chunk in iter(lambda: handle.read(self.chunk_size), b""):
+                    hasher.update(chunk)
+        except FileNotFoundError:
+            return None
+        digest = hasher.hexdigest()
+        blob = blob_path(digest, f".{ext}")
+        dest = self.path(blob)
+        if not os.path.exists(dest):
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            tmp = f"{dest}.{uuid.uuid4().hex}.tmp"
+            try:
+                os.link(src, tmp)
+            except OSError:
+                shutil.copyfile(src, tmp)
+            os.replace(tmp, dest)
+        self.render_variants(digest, dest)
+        return self.url(blob)
+
+    def collect_garbage(self, referenced_urls, grace_seconds=86400, dry_run=False) -> dict:
+        """Delete stored files that no URL in ``referenced_urls`` points to.
+
+        A content-addressed original and its variants live and die together.
+        Anything modified within ``grace_seconds`` is kept: photos are
+        uploaded before the listing that references them is saved. Leftover
+        temporary files past the grace period are removed too.
+        """
+        prefix = self.url_prefix + "/"
+        digests, names = set(), set()
+        for url in referenced_urls:
+            if not url or not url.startswith(prefix):
+                continue
+            name = url[len(prefix):]
+            match = BLOB_PATH.match(name)
+            if match:
+                digests.add(match.group("digest"))
+            else:
+                names.add(name)
+
+        cutoff = time.time() - grace_seconds
+        blobs = {}  # digest -> [paths, newest mtime, bytes]
+        doomed = []
+        for root, dirs, files in os.walk(self.directory):
+            rel_root = os.path.relpath(root, self.directory).replace(os.sep, "/")
+            for filename in files:
+                path = os.path.join(root, filename)
+                rel = filename if rel_root == "." else f"{rel_root}/{filename}"
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                match = BLOB_PATH.match(rel)
+                if match:
+                    entry = blobs.setdefault(match.group("digest"), [[], 0.0, 0])
+                    entry[0].append(path)
+                    entry[1] = max(entry[1], st.st_mtime)
+                    entry[2] += st.st_size
+                elif rel not in names and st.st_mtime < cutoff:
+                    doomed.append((path, st.st_size))
+
+        kept = 0
+        for digest, (paths, mtime, size) in blobs.items():
+            if digest in digests or mtime >= cutoff:
+                kept += 1
+                continue
+            doomed.extend((path, size if i == 0 else 0) for i, path in enumerate(paths))
+
+        freed = 0
+        for path, size in doomed:
+            if not dry_run:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+            freed += size
+        return {
+            "referenced": len(digests) + len(names),
+            "blobs_kept": kept,
+            "files_removed": len(doomed),
+            "bytes_freed": freed,
+            "dry_run": dry_run,
+        }
+
+    def shutdown(self, wait=False):
+        """Stop the render pool; ``wait`` finishes the queued variants first."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def stats(self) -> dict:
+        return {
+            "uploads": self.uploads,
+            "duplicates": self.duplicates,
+            "bytes_deduplicated": self.bytes_deduplicated,
+            "rejected": self.rejected,
+            "rendering": len(self._rendering),
+            "variants_rendered": self.variants_rendered,
+            "variant_failures": self.variant_failures,
+            "max_bytes": self.max_bytes,
+        }
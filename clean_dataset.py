@@ -1,147 +1,447 @@
 import pandas as pd
 import numpy as np
+import argparse
 import os
+import pickle
 import sys
+import tempfile
+
+from backend.app.columnar import FrameWriter, bundle_path, file_sha256, read_manifest, save_frame
+from backend.app.parsing import parse_areas, parse_prices
+
+THRESHOLD = 0.25
+ESSENTIAL = ["Price", "Size", "City_name"]
+QUANTILES = [0.01, 0.99]
+
+# Repetitive Makaan text columns, held as categories in --stream mode (the
+# written text is the same, a chunk takes a fraction of the memory).
+CATEGORY_COLUMNS = [
+    "Property_type", "Property_status", "Property_building_status", "City_name",
+    "Locality_Name", "Sub_urban_name", "Builder_name", "No_of_BHK", "Posted_On",
+    "is_furnished", "Listing_Category",
+]
+
+# Bump when the cleaning rules change, so bundles cleaned by the old rules
+# are rebuilt even though the source file did not change.
+CLEANER_VERSION = 1
+
+
+def clean_in_memory(csv_file, output_file, bundle=None, meta=None):
+    # 1. Load dataset
+    if not os.path.exists(csv_file):
+        print(f"❌ Error: {csv_file} not found in current directory.")
+        print(f"   Current directory: {os.getcwd()}")
+        sys.exit(1)
 
-print("=" * 60)
-print("🏡 Real Estate Dataset Cleaning Pipeline")
-print("=" * 60)
-
-# 1. Load dataset
-csv_file = "Makaan_Properties_Buy.csv"
-if not os.path.exists(csv_file):
-    print(f"❌ Error: {csv_file} not found in current directory.")
-    print(f"   Current directory: {os.getcwd()}")
-    sys.exit(1)
-
-try:
-    df = pd.read_csv(csv_file, encoding='latin1')
-except Exception as e:
-    print(f"❌ Error reading {csv_file}: {e}")
-    sys.exit(1)
-
-# 2. Inspect
-print(f"\n📊 Initial dataset shape: {df.shape}")
-print(f"\nFirst 5 rows:")
-print(df.head())
-print(f"\nData types and missing values:")
-print(df.info())
-print(f"\nMissing value counts (top 15):")
-print(df.isnull().sum().sort_values(ascending=False).head(15))
-
-# 3. Drop columns with >25% missing
-print("\n🗑️  Step 3: Dropping columns with >25% missing values...")
-threshold = 0.25
-cols_to_drop = df.columns[df.isnull().mean() > threshold]
-if len(cols_to_drop) > 0:
-    print(f"   Dropped {len(cols_to_drop)} columns: {list(cols_to_drop)}")
-    df = df.drop(columns=cols_to_drop)
-else:
-    print("   No columns with >25% missing values found.")
-
-# 4. Drop rows with nulls in essential fields
-print("\n🔍 Step 4: Dropping rows with missing essential fields...")
-essential = ["Price", "Size", "City_name"]
-missing_essential = df[essential].isnull().sum()
-print(f"   Missing values before drop: {dict(missing_essential)}")
-df_before = len(df)
-df = df.dropna(subset=essential)
-print(f"   Dropped {df_before - len(df)} rows with missing essential fields.")
-print(f"   Shape after: {df.shape}")
-
-# 5. Convert price strings to numbers
-print("\n💰 Step 5: Converting price strings to numeric values...")
-
-def parse_price(x):
-    """Convert price strings (e.g., '50 Cr', '5 Lakh') to float."""
     try:
-        x = str(x).strip()
-        if not x or x.lower() == 'nan':
-            return np.nan
-        if 'Cr' in x:
-            return float(x.replace('Cr','').replace(',','').strip()) * 1e7
-        elif 'Lac' in x or 'Lakh' in x or 'Lacs' in x:
-            return float(x.replace('Lac','').replace('Lakh','').replace('Lacs','').replace(',','').strip()) * 1e5
-        else:
-            return float(x.replace(',','').strip())
+        df = pd.read_csv(csv_file, encoding='latin1')
     except Exception as e:
-        return np.nan
+        print(f"❌ Error reading {csv_file}: {e}")
+        sys.exit(1)
+
+    # 2. Inspect
+    print(f"\n📊 Initial dataset shape: {df.shape}")
+    print(f"\nFirst 5 rows:")
+    print(df.head())
+    print(f"\nData types and missing values:")
+    print(df.info())
+    print(f"\nMissing value counts (top 15):")
+    print(df.isnull().sum().sort_values(ascending=False).head(15))
+
+    # 3. Drop columns with >25% missing
+    print("\n🗑️  Step 3: Dropping columns with >25% missing values...")
+    threshold = 0.25
+    cols_to_drop = df.columns[df.isnull().mean() > threshold]
+    if len(cols_to_drop) > 0:
+        print(f"   Dropped {len(cols_to_drop)} columns: {list(cols_to_drop)}")
+        df = df.drop(columns=cols_to_drop)
+    else:
+        print("   No columns with >25% missing values found.")
+
+    # 4. Drop rows with nulls in essential fields
+    print("\n🔍 Step 4: Dropping rows with missing essential fields...")
+    essential = ["Price", "Size", "City_name"]
+    missing_essential = df[essential].isnull().sum()
+    print(f"   Missing values before drop: {dict(missing_essential)}")
+    df_before = len(df)
+    df = df.dropna(subset=essential)
+    print(f"   Dropped {df_before - len(df)} rows with missing essential fields.")
+    print(f"   Shape after: {df.shape}")
+
+    # 5. Convert price strings to numbers
+    print("\n💰 Step 5: Converting price strings to numeric values...")
+
+    df['price_num'] = parse_prices(df['Price'])
+    price_success = df['price_num'].notna().sum()
+    print(f"   Successfully converted {price_success}/{len(df)} prices.")
+    print(f"   Price range: ₹{df['price_num'].min():.0f} - ₹{df['price_num'].max():.0f}")
+
+    # 6. Convert area to numbers
+    print("\n📐 Step 6: Converting area strings to numeric values...")
+
+    df['area_num'] = parse_areas(df['Size'])
+    area_success = df['area_num'].notna().sum()
+    print(f"   Successfully converted {area_success}/{len(df)} areas.")
+    if area_success > 0:
+        print(f"   Area range: {df['area_num'].min():.0f} - {df['area_num'].max():.0f} sq.ft")
+
+    # 7. Drop rows where conversion failed
+    print("\n🧹 Step 7: Removing rows with invalid price or area...")
+    df_before = len(df)
+    df = df[df['price_num'].notna() & df['area_num'].notna()]
+    df = df[df['price_num'] > 0]  # Price must be positive
+    df = df[df['area_num'] > 0]   # Area must be positive
+    print(f"   Removed {df_before - len(df)} invalid rows.")
+    print(f"   Shape after: {df.shape}")
 
-df['price_num'] = df['Price'].apply(parse_price)
-price_success = df['price_num'].notna().sum()
-print(f"   Successfully converted {price_success}/{len(df)} prices.")
-print(f"   Price range: ₹{df['price_num'].min():.0f} - ₹{df['price_num'].max():.0f}")
+    # 8. Drop duplicates
+    print("\n🔄 Step 8: Removing duplicate rows...")
+    df_before = len(df)
+    df = df.drop_duplicates()
+    print(f"   Removed {df_before - len(df)} duplicate rows.")
+    print(f"   Shape after: {df.shape}")
+
+    # 9. Handle outliers (remove top & bottom 1%)
+    print("\n📊 Step 9: Handling outliers (removing bottom/top 1%)...")
+    for col in ['price_num', 'area_num']:
+        q_low, q_high = df[col].quantile([0.01, 0.99])
+        df_before = len(df)
+        df = df[(df[col] >= q_low) & (df[col] <= q_high)]
+        print(f"   {col}: removed {df_before - len(df)} outliers (1%-99% range)")
+    print(f"   Shape after outlier removal: {df.shape}")
 
-# 6. Convert area to numbers
-print("\n📐 Step 6: Converting area strings to numeric values...")
+    # 10. Feature engineering
+    print("\n⚙️  Step 10: Engineering features...")
+    df['price_per_sqft'] = df['price_num'] / df['area_num']
+    print(f"   Created 'price_per_sqft' feature")
+    print(f"   Price/sqft range: ₹{df['price_per_sqft'].min():.0f} - ₹{df['price_per_sqft'].max():.0f}/sqft")
+
+    # 11. Final validation and save
+    print("\n✅ Step 11: Final validation and saving...")
+    print(f"   Final dataset shape: {df.shape}")
+    print(f"   Columns: {list(df.columns)}")
+    print(f"\n   Sample statistics:")
+    print(df[['price_num', 'area_num', 'price_per_sqft']].describe().round(2))
 
-def parse_area(x):
-    """Extract numeric value from area strings (e.g., '1,200 sq.ft')."""
     try:
-        s = str(x).strip()
-        if not s or s.lower() == 'nan':
-            return np.nan
-        num = ''.join(ch for ch in s if ch.isdigit() or ch in ['.', ','])
-        if not num:
-            return np.nan
-        return float(num.replace(',',''))
+        df.to_csv(output_file, index=False)
+        print(f"\n✓ Cleaned dataset saved to: {output_file}")
+        print(f"   Rows: {len(df)}, Columns: {len(df.columns)}")
+        if bundle:
+            save_frame(df, bundle, dictionary=CATEGORY_COLUMNS,
+                       meta={**(meta or {}), "output": file_fingerprint(output_file)})
+            print(f"✓ Column bundle saved to: {bundle}")
     except Exception as e:
-        return np.nan
-
-df['area_num'] = df['Size'].apply(parse_area)
-area_success = df['area_num'].notna().sum()
-print(f"   Successfully converted {area_success}/{len(df)} areas.")
-if area_success > 0:
-    print(f"   Area range: {df['area_num'].min():.0f} - {df['area_num'].max():.0f} sq.ft")
-
-# 7. Drop rows where conversion failed
-print("\n🧹 Step 7: Removing rows with invalid price or area...")
-df_before = len(df)
-df = df[df['price_num'].notna() & df['area_num'].notna()]
-df = df[df['price_num'] > 0]  # Price must be positive
-df = df[df['area_num'] > 0]   # Area must be positive
-print(f"   Removed {df_before - len(df)} invalid rows.")
-print(f"   Shape after: {df.shape}")
-
-# 8. Drop duplicates
-print("\n🔄 Step 8: Removing duplicate rows...")
-df_before = len(df)
-df = df.drop_duplicates()
-print(f"   Removed {df_before - len(df)} duplicate rows.")
-print(f"   Shape after: {df.shape}")
-
-# 9. Handle outliers (remove top & bottom 1%)
-print("\n📊 Step 9: Handling outliers (removing bottom/top 1%)...")
-for col in ['price_num', 'area_num']:
-    q_low, q_high = df[col].quantile([0.01, 0.99])
-    df_before = len(df)
-    df = df[(df[col] >= q_low) & (df[col] <= q_high)]
-    print(f"   {col}: removed {df_before - len(df)} outliers (1%-99% range)")
-print(f"   Shape after outlier removal: {df.shape}")
-
-# 10. Feature engineering
-print("\n⚙️  Step 10: Engineering features...")
-df['price_per_sqft'] = df['price_num'] / df['area_num']
-print(f"   Created 'price_per_sqft' feature")
-print(f"   Price/sqft range: ₹{df['price_per_sqft'].min():.0f} - ₹{df['price_per_sqft'].max():.0f}/sqft")
-
-# 11. Final validation and save
-print("\n✅ Step 11: Final validation and saving...")
-print(f"   Final dataset shape: {df.shape}")
-print(f"   Columns: {list(df.columns)}")
-print(f"\n   Sample statistics:")
-print(df[['price_num', 'area_num', 'price_per_sqft']].describe().round(2))
-
-output_file = "cleaned_indian_property.csv"
-try:
-    df.to_csv(output_file, index=False)
+        print(f"\n❌ Error saving file: {e}")
+        sys.exit(1)
+
+
+class ReservoirSample:
+    """Uniform sample of at most ``size`` rows (Algorithm R, vectorized per
+    chunk). Holds every row while the input fits, so quantiles are exact;
+    beyond that they are estimated from the sample (rank error around
+    1/sqrt(size))."""
+
+    def __init__(self, size, width, seed=0):
+        self.size = size
+        self.data = np.empty((size, width))
+        self.filled = 0
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def add(self, rows):
+        take = min(len(rows), self.size - self.filled)
+        self.data[self.filled:self.filled + take] = rows[:take]
+        self.filled += take
+        self.seen += take
+        rows = rows[take:]
+        if len(rows):
+            # row i (0-based, over the whole input) replaces slot j ~ U[0, i]
+            # when j < size; later rows win ties, as in the sequential algorithm
+            slots = self.rng.integers(0, self.seen + np.arange(len(rows)) + 1)
+            hit = slots < self.size
+            self.data[slots[hit]] = rows[hit]
+            self.seen += len(rows)
+
+    def values(self):
+        return self.data[:self.filled]
+
+
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def add(self, values):
+        if len(values):
+            self.count += len(values)
+            self.total += float(values.sum())
+            self.minimum = min(self.minimum, float(values.min()))
+            self.maximum = max(self.maximum, float(values.max()))
+
+    def row(self):
+        return {"count": self.count, "mean": self.total / self.count if self.count else np.nan,
+                "min": self.minimum, "max": self.maximum}
+
+
+def chunk_dtypes(dtypes):
+    """One dtype per column that every chunk agrees on: what reading the whole
+    file at once would have inferred (int and float give float, anything
+    mixed with text gives object), with CATEGORY_COLUMNS as categories."""
+    merged = {}
+    for col, seen in dtypes.items():
+        common = seen[0]
+        for dtype in seen[1:]:
+            if dtype == common:
+                continue
+            numeric = all(d.kind in "iuf" for d in (common, dtype))
+            common = np.result_type(common, dtype) if numeric else np.dtype(object)
+        if col in CATEGORY_COLUMNS and common == object:
+            common = "category"
+        merged[col] = common
+    return merged
+
+
+def iter_pickles(handle):
+    while True:
+        try:
+            yield pickle.load(handle)
+        except EOFError:
+            return
+
+
+def clean_streaming(csv_file, output_file, chunksize=50_000, sketch_size=1_000_000, bundle=None, meta=None):
+    """Same steps as clean_in_memory, in bounded memory.
+
+    Pass 1 reads the file once for per-column missing counts and the dtype
+    every chunk should use. Pass 2 reads only the kept columns, drops
+    incomplete and unparseable rows, drops duplicates by a 64-bit hash of
+    each row (a sorted array of 8 bytes per distinct row), samples
+    (price, area) pairs for the 1%/99% quantiles and spills the survivors
+    to a temporary file. Pass 3 filters the spill by the quantiles and
+    appends to the output and to the column bundle, if given. Memory is
+    one chunk, the hashes and the sample.
+    """
+    if not os.path.exists(csv_file):
+        print(f"❌ Error: {csv_file} not found in current directory.")
+        print(f"   Current directory: {os.getcwd()}")
+        sys.exit(1)
+
+    def read(**kwargs):
+        return pd.read_csv(csv_file, encoding='latin1', chunksize=chunksize, **kwargs)
+
+    # Pass 1: missing values and dtypes
+    print(f"\n📊 Pass 1: scanning {csv_file} in chunks of {chunksize} rows...")
+    total_rows = 0
+    nulls = None
+    dtypes = {}
+    try:
+        for chunk in read():
+            total_rows += len(chunk)
+            counts = chunk.isnull().sum()
+            nulls = counts if nulls is None else nulls.add(counts, fill_value=0)
+            for col, dtype in chunk.dtypes.items():
+                dtypes.setdefault(col, []).append(dtype)
+    except Exception as e:
+        print(f"❌ Error reading {csv_file}: {e}")
+        sys.exit(1)
+    if nulls is None:
+        print(f"❌ Error: {csv_file} has no rows.")
+        sys.exit(1)
+    nulls = nulls.astype(int)
+    print(f"   Initial dataset shape: ({total_rows}, {len(nulls)})")
+    print(f"\nMissing value counts (top 15):")
+    print(nulls.sort_values(ascending=False).head(15))
+
+    print(f"\n🗑️  Step 3: Dropping columns with >{THRESHOLD:.0%} missing values...")
+    cols_to_drop = [c for c in nulls.index if nulls[c] / total_rows > THRESHOLD]
+    keep = [c for c in nulls.index if c not in cols_to_drop]
+    if cols_to_drop:
+        print(f"   Dropped {len(cols_to_drop)} columns: {cols_to_drop}")
+    else:
+        print(f"   No columns with >{THRESHOLD:.0%} missing values found.")
+    dtype = chunk_dtypes({c: dtypes[c] for c in keep})
+
+    # Pass 2: row filters, dedup, quantile sample, spill
+    print("\n🔍 Pass 2: dropping incomplete, invalid and duplicate rows...")
+    missing_essential = pd.Series(0, index=ESSENTIAL)
+    dropped_essential = invalid = duplicates = spilled = 0
+    price_success = area_success = parsed_rows = 0
+    seen = np.empty(0, dtype=np.uint64)
+    sample = ReservoirSample(sketch_size, 2)
+    out_dir = os.path.dirname(os.path.abspath(output_file))
+    frames = None
+    # surviving chunks are pickled one after another: no CSV formatting and
+    # parsing on the way through, and dtypes and floats come back exactly
+    spill = tempfile.NamedTemporaryFile(suffix=".spill", dir=out_dir, delete=False)
+    try:
+        with spill:
+            for chunk in read(usecols=keep, dtype=dtype):
+                chunk = chunk[keep]
+                missing_essential += chunk[ESSENTIAL].isnull().sum()
+                before = len(chunk)
+                chunk = chunk.dropna(subset=ESSENTIAL)
+                dropped_essential += before - len(chunk)
+
+                chunk['price_num'] = parse_prices(chunk['Price'])
+                chunk['area_num'] = parse_areas(chunk['Size'])
+                parsed_rows += len(chunk)
+                price_success += int(chunk['price_num'].notna().sum())
+                area_success += int(chunk['area_num'].notna().sum())
+
+                before = len(chunk)
+                chunk = chunk[(chunk['price_num'] > 0) & (chunk['area_num'] > 0)]
+                invalid += before - len(chunk)
+
+                hashes = pd.util.hash_pandas_object(chunk[keep], index=False).to_numpy()
+                fresh = ~pd.Series(hashes).duplicated().to_numpy()
+                if len(seen):
+                    at = np.minimum(np.searchsorted(seen, hashes), len(seen) - 1)
+                    fresh &= seen[at] != hashes
+                duplicates += len(chunk) - int(fresh.sum())
+                chunk = chunk[fresh]
+                seen = np.union1d(seen, hashes[fresh])
+
+                sample.add(chunk[['price_num', 'area_num']].to_numpy())
+                pickle.dump(chunk, spill, protocol=pickle.HIGHEST_PROTOCOL)
+                spilled += len(chunk)
+
+        print(f"   Missing values in essential fields: {dict(missing_essential.astype(int))}")
+        print(f"   Dropped {dropped_essential} rows with missing essential fields.")
+        print(f"   Converted {price_success}/{parsed_rows} prices and {area_success}/{parsed_rows} areas.")
+        print(f"   Removed {invalid} invalid rows and {duplicates} duplicate rows ({len(seen)} row hashes held).")
+
+        print(f"\n📊 Step 9: Handling outliers (removing bottom/top 1%)...")
+        pairs = sample.values()
+        exact = "exact" if sample.seen <= sample.size else f"estimated from {sample.size} sampled rows"
+        price_low, price_high = np.quantile(pairs[:, 0], QUANTILES) if len(pairs) else (np.nan, np.nan)
+        in_price = (pairs[:, 0] >= price_low) & (pairs[:, 0] <= price_high)
+        area_low, area_high = np.quantile(pairs[in_price, 1], QUANTILES) if in_price.any() else (np.nan, np.nan)
+        print(f"   price_num: keeping {price_low:.0f} - {price_high:.0f} ({exact})")
+        print(f"   area_num: keeping {area_low:.0f} - {area_high:.0f}")
+
+        # Pass 3: outlier filter, features, incremental output
+        print("\n⚙️  Pass 3: filtering outliers and writing output...")
+        stats = {col: RunningStats() for col in ['price_num', 'area_num', 'price_per_sqft']}
+        written = 0
+        columns = None
+        tmp_output = f"{output_file}.tmp"
+        frames = FrameWriter(bundle, dictionary=CATEGORY_COLUMNS, meta=meta) if bundle else None
+        with open(tmp_output, "w", encoding="utf-8", newline="") as out, open(spill.name, "rb") as spilled_chunks:
+            for chunk in iter_pickles(spilled_chunks):
+                chunk = chunk[(chunk['price_num'] >= price_low) & (chunk['price_num'] <= price_high)]
+                chunk = chunk[(chunk['area_num'] >= area_low) & (chunk['area_num'] <= area_high)]
+                chunk['price_per_sqft'] = chunk['price_num'] / chunk['area_num']
+                for col, col_stats in stats.items():
+                    col_stats.add(chunk[col])
+                chunk.to_csv(out, header=written == 0, index=False)
+                if frames:
+                    frames.append(chunk)
+                written += len(chunk)
+                columns = list(chunk.columns)
+        os.replace(tmp_output, output_file)
+        if frames:
+            frames.meta["output"] = file_fingerprint(output_file)
+            frames.close()
+            frames = None
+    except Exception as e:
+        print(f"\n❌ Error cleaning {csv_file}: {e}")
+        sys.exit(1)
+    finally:
+        if os.path.exists(spill.name):
+            os.remove(spill.name)
+        if frames:
+            frames.abort()
+
+    print(f"   Removed {spilled - written} outliers (1%-99% range)")
+    print("\n✅ Step 11: Final validation and saving...")
+    print(f"   Final dataset shape: ({written}, {len(columns or [])})")
+    print(f"   Columns: {columns}")
+    print(f"\n   Sample statistics:")
+    print(pd.DataFrame({col: s.row() for col, s in stats.items()}).round(2))
     print(f"\n✓ Cleaned dataset saved to: {output_file}")
-    print(f"   Rows: {len(df)}, Columns: {len(df.columns)}")
-except Exception as e:
-    print(f"\n❌ Error saving file: {e}")
-    sys.exit(1)
+    print(f"   Rows: {written}, Columns: {len(columns or [])}")
+    if bundle:
+        print(f"✓ Column bundle saved to: {bundle}")
+
+
+def file_fingerprint(path):
+    stat = os.stat(path)
+    return {"file": os.path.basename(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def cleaner_settings():
+    # Both modes give the same output (--stream estimates the quantiles only
+    # past --sketch-size rows), so the mode is recorded but not compared.
+    return {"version": CLEANER_VERSION, "threshold": THRESHOLD, "quantiles": QUANTILES}
+
+
+def current_bundle(output_file, source_sha256=None):
+    """The column bundle written with ``output_file``, or None when there is
+    none, it was written by other cleaner settings, the CSV was replaced
+    since, or (given ``source_sha256``) it was cleaned from another source."""
+    bundle = bundle_path(output_file)
+    manifest = read_manifest(bundle)
+    if manifest is None or not os.path.exists(output_file):
+        return None
+    if manifest.get("cleaner", {}).get("settings") != cleaner_settings():
+        return None
+    if manifest.get("output") != file_fingerprint(output_file):
+        return None
+    if source_sha256 is not None and manifest.get("source", {}).get("sha256") != source_sha256:
+        return None
+    return bundle
+
+
+def clean(csv_file, output_file, stream=False, chunksize=50_000, sketch_size=1_000_000,
+          force=False, write_bundle=True):
+    """Clean ``csv_file`` into ``output_file`` and its column bundle, unless
+    the bundle already holds this exact source (same SHA-256) cleaned by
+    the current settings. Returns the bundle path (the CSV path without
+    ``write_bundle``)."""
+    bundle = bundle_path(output_file) if write_bundle else None
+    meta = None
+    if os.path.exists(csv_file):
+        source = {"file": os.path.basename(csv_file), "size": os.path.getsize(csv_file),
+                  "sha256": file_sha256(csv_file)}
+        if write_bundle and not force and current_bundle(output_file, source["sha256"]):
+            print(f"\n✓ {csv_file} is unchanged (sha256 {source['sha256'][:12]}); "
+                  f"reusing {output_file} and {bundle}")
+            return bundle
+        mode = {"stream": stream, "sketch_size": sketch_size} if stream else {"stream": False}
+        meta = {"source": source, "cleaner": {"settings": cleaner_settings(), **mode}}
+
+    if stream:
+        clean_streaming(csv_file, output_file, chunksize, sketch_size, bundle, meta)
+    else:
+        clean_in_memory(csv_file, output_file, bundle, meta)
+    return bundle or output_file
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean the Makaan property dump for training.")
+    parser.add_argument("--input", default="Makaan_Properties_Buy.csv")
+    parser.add_argument("--output", default="cleaned_indian_property.csv")
+    parser.add_argument("--stream", action="store_true",
+                        help="process the file in chunks, in bounded memory")
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--sketch-size", type=int, default=1_000_000,
+                        help="rows sampled for the outlier quantiles in --stream mode")
+    parser.add_argument("--force", action="store_true",
+                        help="clean even when the source is unchanged since the last run")
+    parser.add_argument("--no-bundle", action="store_true",
+                        help="write only the CSV, not the column bundle train_model.py loads")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🏡 Real Estate Dataset Cleaning Pipeline")
+    print("=" * 60)
 
-print("\n" + "=" * 60)
-print("✓ Data cleaning pipeline completed successfully!")
-print("=" * 60)
+    clean(args.input, args.output, args.stream, args.chunksize, args.sketch_size,
+          force=args.force, write_bundle=not args.no_bundle)
 
+    print("\n" + "=" * 60)
+    print("✓ Data cleaning pipeline completed successfully!")
+    print("=" * 60)
@@ -0,0 +1,84 @@
+# scripts/bench_auth.py
+"""
+Per-request cost of the auth dependency.
+
+Calls get_current_user_from_token the way FastAPI does (one Authorization
+header string per request) with the previous implementation, a full
+jwt.decode every time, and with the cached TokenVerifier, for one browser
+reusing its token (--tokens 1) and for a pool of users cycling through
+their tokens. Also checks that a revoked token is rejected.
+
+Usage: python scripts/bench_auth.py [--requests 20000] [--tokens 1 1000]
+"""
+import sys, os, time, argparse
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from jose import JWTError, jwt
+
+from backend.app.auth_tokens import TokenVerifier
+from backend.app.main import ALGORITHM, SECRET_KEY, get_current_user_from_token, get_token_from_header
+
+
+def legacy_current_user(authorization):
+    """The pre-cache dependency, kept verbatim as the reference."""
+    token = get_token_from_header(authorization)
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return payload
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+
+def make_headers(n):
+    exp = datetime.utcnow() + timedelta(hours=24)
+    return [
+        "Bearer " + jwt.encode(
+            {"id": i, "email": f"user{i}@example.com", "user_type": "buyer", "exp": exp},
+            SECRET_KEY, algorithm=ALGORITHM,
+        )
+        for i in range(n)
+    ]
+
+
+def per_request_us(fn, headers, requests):
+    start = time.perf_counter()
+    for i in range(requests):
+        fn(headers[i % len(headers)])
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main(requests, token_counts):
+    from backend.app import main as app_main
+
+    print(f"{'tokens':>7} {'jwt.decode us':>14} {'cached us':>10} {'speedup':>8}")
+    for n in token_counts:
+        headers = make_headers(n)
+        app_main.token_verifier = TokenVerifier(SECRET_KEY, [ALGORITHM])
+        for h in headers:
+            legacy = legacy_current_user(h)
+            user = get_current_user_from_token(h)
+            assert (user.id, user.user_type) == (legacy["id"], legacy["user_type"])
+        before = per_request_us(legacy_current_user, headers, requests)
+        after = per_request_us(get_current_user_from_token, headers, requests)
+        print(f"{n:>7} {before:>14.1f} {after:>10.2f} {before / after:>7.1f}x")
+
+    app_main.token_verifier.revoke(get_token_from_header(headers[0]))
+    try:
+        get_current_user_from_token(headers[0])
+        raise AssertionError("revoked token was accepted")
+    except HTTPException as e:
+        print(f"\nrevoked token -> {e.status_code} {e.detail}")
+    print(f"verifier: {app_main.token_verifier.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1, 1000])
+    args = parser.parse_args()
+    main(args.requests, args.tokens)
@@ -0,0 +1,90 @@
+# scripts/bench_chat_ttft.py
+"""
+Time to first token of /chatbot/stream as a conversation grows.
+
+Starts scripts/stub_llm_server.py, whose first token waits in proportion to
+the prompt size like a real model's prompt processing, and runs one
+--turns long conversation through a server-side chat session twice: with an
+effectively unlimited history budget (every earlier turn is resent, as the
+client-side history did) and with the default window. Reports TTFT and
+prompt size at a few conversation lengths.
+
+Usage: python scripts/bench_chat_ttft.py [--turns 200] [--budget 1024]
+"""
+import sys, os, json, time, argparse
+sys.path.insert(0, os.path.dirname(__file__))
+
+import httpx
+
+from load_test_chat import free_port, start, stop
+
+CHECKPOINTS = (1, 10, 25, 50, 100, 200, 500)
+
+
+def converse(base, turns):
+    ttft = {}
+    session_id = None
+    with httpx.Client(base_url=base, timeout=120) as client:
+        for turn in range(1, turns + 1):
+            # distinct text per turn so neither the response cache nor the
+            # FAQ router answers it
+            body = {"message": f"Question {turn}: tell me about flat {turn} near block {turn * 7}"}
+            if session_id:
+                body["session_id"] = session_id
+            start_at = time.perf_counter()
+            first = None
+            with client.stream("POST", "/chatbot/stream", json=body) as resp:
+                session_id = resp.headers.get("X-Chat-Session", session_id)
+                for line in resp.iter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[5:])
+                    if first is None and "delta" in event:
+                        first = time.perf_counter() - start_at
+            if turn in CHECKPOINTS or turn == turns:
+                ttft[turn] = first
+    return ttft
+
+
+def run(mode_env, turns, stub_port):
+    api_port = free_port()
+    env = {"OLLAMA_HOST": f"http://127.0.0.1:{stub_port}", **mode_env}
+    api = start(["backend.app.main:app", "--port", str(api_port)], env, f"http://127.0.0.1:{api_port}/healthz")
+    try:
+        before = len(httpx.get(f"http://127.0.0.1:{stub_port}/stats").json()["prompt_chars"])
+        ttft = converse(f"http://127.0.0.1:{api_port}", turns)
+        prompt_chars = httpx.get(f"http://127.0.0.1:{stub_port}/stats").json()["prompt_chars"][before:]
+    finally:
+        stop(api)
+    return ttft, prompt_chars
+
+
+def main(turns, budget):
+    stub_port = free_port()
+    stub = start(
+        ["--app-dir", "scripts", "stub_llm_server:app", "--port", str(stub_port)],
+        {"STUB_TOKENS": "40", "STUB_TOKEN_MS": "1", "STUB_PREFILL_MS": "20", "STUB_PREFILL_MS_PER_KCHAR": "20"},
+        f"http://127.0.0.1:{stub_port}/stats",
+    )
+    unlimited = {"CHAT_TOKEN_BUDGET": str(10 ** 9), "CHAT_MAX_HISTORY_MESSAGES": str(10 ** 9)}
+    windowed = {"CHAT_TOKEN_BUDGET": str(budget)}
+    try:
+        results = {name: run(env, turns, stub_port) for name, env in (("full", unlimited), ("window", windowed))}
+    finally:
+        stop(stub)
+
+    print(f"{'turn':>6} {'full TTFT ms':>13} {'prompt chars':>13} {'window TTFT ms':>15} {'prompt chars':>13}")
+    for turn in sorted(results["full"][0]):
+        row = [f"{turn:>6}"]
+        for name in ("full", "window"):
+            ttft, prompt_chars = results[name]
+            row.append(f"{ttft[turn] * 1000:>13.1f} {prompt_chars[turn - 1]:>13}")
+        print(" ".join(row))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=1024)
+    args = parser.parse_args()
+    main(args.turns, args.budget)
@@ -0,0 +1,171 @@
+# scripts/bench_clean_dataset.py
+"""
+Peak memory and time of clean_dataset.py, in memory vs --stream.
+
+The Makaan dump is not in the repository (Git LFS), so by default a
+synthetic file with the same columns and value formats is generated:
+Indian-grouped prices plus "Cr"/"Lac"/"Lakh" forms, "sq ft" sizes, gaps,
+a builder column that is mostly empty, duplicated rows and outliers. Pass
+--input to use the real file instead. Each mode runs in its own process
+(peak RSS from /proc/self/status), and the two outputs are compared.
+
+Usage: python scripts/bench_clean_dataset.py [--rows 330000] [--input Makaan_Properties_Buy.csv]
+           [--chunksize 50000] [--keep]
+"""
+import sys, os, time, argparse, shutil, subprocess, tempfile
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pandas as pd
+
+CITIES = ["Ahmedabad", "Bangalore", "Chennai", "Delhi", "Hyderabad", "Kolkata", "Lucknow", "Mumbai"]
+WORDS = ("spacious well ventilated apartment close to metro station school hospital market park "
+         "gated community power backup lift security covered parking vastu compliant east facing").split()
+
+
+def indian_grouping(values):
+    """12500000 -> '1,25,00,000'."""
+    out = []
+    for v in values:
+        s = str(v)
+        head, tail = s[:-3], s[-3:]
+        groups = []
+        while len(head) > 2:
+            groups.insert(0, head[-2:])
+            head = head[:-2]
+        if head:
+            groups.insert(0, head)
+        out.append(",".join(groups + [tail]) if groups else tail)
+    return np.array(out, dtype=object)
+
+
+def synthetic_makaan(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    area = np.round(rng.lognormal(7.0, 0.45, rows)).astype(np.int64)
+    rate = rng.lognormal(8.6, 0.5, rows)
+    price = np.round(area * rate / 1000).astype(np.int64) * 1000
+
+    # mostly grouped digits, some "1.25 Cr" / "85 Lac" / "85 Lakh", a few gaps or text
+    price_text = indian_grouping(price)
+    form = rng.random(rows)
+    crore = form < 0.05
+    price_text[crore] = [f"{p / 1e7:.2f} Cr" for p in price[crore]]
+    lac = (form >= 0.05) & (form < 0.08)
+    price_text[lac] = [f"{p / 1e5:.1f} Lac" for p in price[lac]]
+    lakh = (form >= 0.08) & (form < 0.10)
+    price_text[lakh] = [f"{p / 1e5:.0f} Lakh" for p in price[lakh]]
+    price_text[form > 0.998] = "Price on Request"
+    price_text[form > 0.999] = None
+
+    size_text = indian_grouping(area).astype(object) + " sq ft"
+    size_text[rng.random(rows) < 0.002] = None
+
+    city = rng.integers(0, len(CITIES), rows)
+    locality = rng.integers(0, 600, rows)
+    frame = pd.DataFrame({
+        "Property_Name": [f"Project {i}" for i in rng.integers(0, 20000, rows)],
+        "Property_id": rng.integers(1_000_000, 20_000_000, rows),
+        "Property_type": rng.choice(["Apartment", "Independent House", "Villa", "Independent Floor", "Residential Plot"],
+                                    rows, p=[0.7, 0.1, 0.05, 0.1, 0.05]),
+        "Property_status": rng.choice(["Ready to move", "Under Construction"], rows),
+        "Price_per_unit_area": indian_grouping(np.round(rate).astype(np.int64)),
+        "Posted_On": [f"{d} days ago" for d in rng.integers(1, 60, rows)],
+        "Project_URL": [f"https://www.makaan.com/project-{i}" for i in rng.integers(0, 20000, rows)],
+        "builder_id": np.where(rng.random(rows) < 0.6, np.nan, rng.integers(1, 5000, rows)),
+        "Builder_name": np.where(rng.random(rows) < 0.6, None, np.array([f"Builder {i}" for i in rng.integers(1, 5000, rows)])),
+        "Property_building_status": "ACTIVE",
+        "City_id": city + 1,
+        "City_name": np.array(CITIES)[city],
+        "No_of_BHK": [f"{b} BHK" for b in rng.integers(1, 6, rows)],
+        "Locality_ID": locality,
+        "Locality_Name": [f"Locality {i}" for i in locality],
+        "Longitude": np.round(rng.uniform(72.0, 89.0, rows), 6),
+        "Latitude": np.round(rng.uniform(12.0, 29.0, rows), 6),
+        "Price": price_text,
+        "Size": size_text,
+        "Sub_urban_ID": rng.integers(0, 60, rows),
+        "Sub_urban_name": np.where(rng.random(rows) < 0.1, None, np.array([f"Suburb {i}" for i in rng.integers(0, 60, rows)])),
+        "description": [" ".join(rng.choice(WORDS, n)) for n in rng.integers(30, 60, rows)],
+        "is_furnished": rng.choice(["Furnished", "Unfurnished", "Semi-Furnished"], rows),
+        "listing_domain_score": rng.integers(1, 5, rows).astype(float),
+        "is_plot": rng.random(rows) < 0.05,
+        "is_RERA_registered": rng.random(rows) < 0.4,
+        "is_Apartment": rng.random(rows) < 0.7,
+        "is_ready_to_move": rng.random(rows) < 0.5,
+        "is_commercial_Listing": False,
+        "is_PentHouse": rng.random(rows) < 0.01,
+        "is_studio": rng.random(rows) < 0.01,
+        "Listing_Category": "sell",
+    })
+    # reposted listings: exact copies of earlier rows
+    dupes = frame.sample(frac=0.03, random_state=seed)
+    return pd.concat([frame, dupes]).sample(frac=1.0, random_state=seed + 1).reset_index(drop=True)
+
+
+# Runs a script and reports its VmHWM (peak RSS of this process image only;
+# getrusage would also count the parent's pages the child had before exec).
+PEAK_WRAPPER = """
+import atexit, os, runpy, sys
+def report():
+    for line in open('/proc/self/status'):
+        if line.startswith('VmHWM:'):
+            sys.stderr.write('PEAK_KB ' + line.split()[1] + '\\n')
+atexit.register(report)
+sys.argv = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(sys.argv[0]))
+runpy.run_path(sys.argv[0], run_name='__main__')
+"""
+
+
+def run(args, cwd):
+    """Run a script with arguments; returns (seconds, peak RSS MB)."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", PEAK_WRAPPER, *args], cwd=cwd,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode:
+        raise SystemExit(proc.stderr)
+    peak = [int(line.split()[1]) for line in proc.stderr.splitlines() if line.startswith("PEAK_KB ")]
+    return elapsed, peak[-1] / 1024
+
+
+def main(rows, input_file, chunksize, keep):
+    workdir = tempfile.mkdtemp(prefix="clean-bench-")
+    if input_file is None:
+        input_file = os.path.join(workdir, "makaan_synthetic.csv")
+        start = time.perf_counter()
+        synthetic_makaan(rows).to_csv(input_file, index=False, encoding="latin1")
+        print(f"Generated {rows} rows ({os.path.getsize(input_file) / 1e6:.0f} MB) in {time.perf_counter() - start:.1f}s")
+    script = os.path.join(PROJECT_ROOT, "clean_dataset.py")
+    streamed = os.path.join(workdir, "cleaned_stream.csv")
+    in_memory = os.path.join(workdir, "cleaned_memory.csv")
+
+    results = {}
+    results["stream"] = run([script, "--input", input_file, "--output", streamed,
+                             "--stream", "--chunksize", str(chunksize)], workdir)
+    results["in memory"] = run([script, "--input", input_file, "--output", in_memory], workdir)
+
+    print(f"{'mode':<10} {'seconds':>8} {'peak RSS MB':>12}")
+    for mode, (seconds, peak) in results.items():
+        print(f"{mode:<10} {seconds:>8.1f} {peak:>12.0f}")
+
+    a = pd.read_csv(in_memory)
+    b = pd.read_csv(streamed)
+    same_rows = len(a) == len(b)
+    identical = same_rows and open(in_memory, "rb").read() == open(streamed, "rb").read()
+    print(f"\nrows: in memory {len(a)}, stream {len(b)}; byte-identical output: {identical}")
+    if not keep:
+        # also removes the .frame bundles the cleaner writes beside its CSVs
+        shutil.rmtree(workdir)
+    else:
+        print(f"files kept in {workdir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=330_000)
+    parser.add_argument("--input")
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+    main(args.rows, args.input, args.chunksize, args.keep)
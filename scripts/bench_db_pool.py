@@ -0,0 +1,118 @@
+# scripts/bench_db_pool.py
+"""
+GET /api/properties throughput as concurrency grows, per pool configuration.
+
+For each configuration the API is started under uvicorn (one worker) and
+--concurrency levels of closed-loop clients fetch card pages with random
+city filters and cursors for --seconds each. Reports req/s, p50/p99 and
+the db_pool checkout metrics from /api/metrics (checkouts that had to wait,
+average and max wait). The database must be reachable (see db.py).
+
+  defaults  the previous engine: pool 5 + overflow 10, ping every checkout
+  sync      DB_POOL_SIZE/DB_MAX_OVERFLOW from the environment (defaults
+            10 + 20), ping only idle connections
+  async     the same pool on the asyncpg engine (DB_ASYNC=1)
+
+Usage: python scripts/bench_db_pool.py [--concurrency 1,8,32,64,128] [--seconds 10]
+           [--configs defaults,sync,async]
+"""
+import sys, os, time, argparse, asyncio
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import httpx
+import numpy as np
+
+from load_test_chat import free_port, start, stop
+
+CONFIGS = {
+    "defaults": {"DB_POOL_SIZE": "5", "DB_MAX_OVERFLOW": "10", "DB_POOL_PRE_PING": "always", "DB_ASYNC": "0"},
+    "sync": {"DB_ASYNC": "0"},
+    "async": {"DB_ASYNC": "1"},
+}
+
+
+async def fetch(reader, writer, path):
+    """One keep-alive GET; returns the status code. A bare HTTP/1.1 client:
+    httpx costs more CPU per request than the endpoint, which on a small
+    machine would measure the client instead of the server."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def client_loop(port, k, stop_at, latencies, failures):
+    rng = np.random.default_rng(k)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < stop_at:
+            path = (f"/api/properties?limit=20&fields=card&city_id={rng.integers(1, 8)}"
+                    f"&cursor={rng.integers(0, 100_000)}")
+            start_at = time.perf_counter()
+            try:
+                ok = await fetch(reader, writer, path) == 200
+            except (OSError, asyncio.IncompleteReadError):
+                ok = False
+                writer.close()
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            latencies.append(time.perf_counter() - start_at)
+            failures[0] += not ok
+    finally:
+        writer.close()
+
+
+async def measure(port, concurrency, seconds):
+    latencies, failures = [], [0]
+    stop_at = time.perf_counter() + seconds
+    start_at = time.perf_counter()
+    await asyncio.gather(*(client_loop(port, k, stop_at, latencies, failures) for k in range(concurrency)))
+    elapsed = time.perf_counter() - start_at
+    pools = httpx.get(f"http://127.0.0.1:{port}/api/metrics").json().get("db_pool", {})
+    return np.array(latencies) * 1000, failures[0], elapsed, pools
+
+
+def run_config(name, levels, seconds):
+    port = free_port()
+    api = start(["backend.app.main:app", "--port", str(port)], CONFIGS[name], f"http://127.0.0.1:{port}/healthz")
+    rows = []
+    try:
+        asyncio.run(measure(port, 4, 1))  # warm up connections and caches
+        for concurrency in levels:
+            lat, failed, elapsed, pools = asyncio.run(measure(port, concurrency, seconds))
+            rows.append((concurrency, lat, failed, elapsed, pools.get("async" if name == "async" else "sync", {})))
+    finally:
+        stop(api)
+    return rows
+
+
+def main(levels, seconds, configs):
+    print(f"{'config':<9} {'clients':>7} {'req/s':>8} {'failed':>6} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'checkouts':>9} {'waited':>7} {'avg wait':>9} {'max wait':>9}")
+    for name in configs:
+        seen = {"checkouts": 0, "waited": 0, "wait_ms": 0.0}
+        for concurrency, lat, failed, elapsed, pool in run_config(name, levels, seconds):
+            # pool counters are cumulative; show this level's share (max wait
+            # stays the running maximum)
+            total = {"checkouts": pool.get("checkouts", 0), "waited": pool.get("waited", 0),
+                     "wait_ms": pool.get("avg_wait_ms", 0) * pool.get("checkouts", 0)}
+            level = {k: total[k] - seen[k] for k in total}
+            seen = total
+            avg_wait = level["wait_ms"] / level["checkouts"] if level["checkouts"] else 0.0
+            print(f"{name:<9} {concurrency:>7} {len(lat) / elapsed:>8.1f} {failed:>6} "
+                  f"{np.percentile(lat, 50):>8.1f} {np.percentile(lat, 99):>8.1f} {level['checkouts']:>9} "
+                  f"{level['waited']:>7} {avg_wait:>7.2f}ms {pool.get('max_wait_ms', 0):>7.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", default="1,8,32,64,128")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--configs", default="defaults,sync,async")
+    args = parser.parse_args()
+    main([int(c) for c in args.concurrency.split(",")], args.seconds, args.configs.split(","))
@@ -0,0 +1,117 @@
+# scripts/bench_distances.py
+"""
+dist_city_center: the vectorized computation (backend.app.features
+city_centers + haversine_km, as FeatureTransformer applies it) vs the
+row-wise DataFrame.apply train_model.py used (kept below as the reference).
+
+Builds listings with city names in the forms the dump has ("Mumbai",
+"Navi Mumbai", "New Delhi", cities without a center, gaps) and coordinates
+with some gaps, checks both give the same distances (to --rtol) and reports
+time and rows/sec at each size. Exits non-zero on a mismatch.
+
+Usage: python scripts/bench_distances.py [--sizes 10000 100000 1000000] [--rtol 1e-12]
+"""
+import sys, os, io, time, argparse, contextlib
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from backend.app.features import city_centers, haversine_km
+
+CITIES = ["Mumbai", "Navi Mumbai", "Delhi", "New Delhi", "Bangalore", "Chennai", "Hyderabad",
+          "Kolkata", "Lucknow", "Ahmedabad", "Pune", "MUMBAI", None]
+
+
+def legacy_distances(df):
+    """The per-row implementation train_model.py used before."""
+    def haversine_km(lat1, lon1, lat2, lon2):
+        R = 6371.0
+        phi1, phi2 = np.radians(lat1), np.radians(lat2)
+        dphi = np.radians(lat2 - lat1)
+        dlambda = np.radians(lon2 - lon1)
+        a = np.sin(dphi / 2.0) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2.0) ** 2
+        return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    city_centers = {
+        "bangalore": (12.9716, 77.5946),
+        "mumbai": (19.0760, 72.8777),
+        "delhi": (28.6139, 77.2090),
+        "chennai": (13.0827, 80.2707),
+        "hyderabad": (17.3850, 78.4867),
+        "kolkata": (22.5726, 88.3639),
+        "lucknow": (26.8467, 80.9462)
+    }
+    df["latitude"] = pd.to_numeric(df["latitude"], errors="coerce")
+    df["longitude"] = pd.to_numeric(df["longitude"], errors="coerce")
+
+    def compute_dist(row):
+        city = str(row.get("city_name", "")).lower()
+        lat = row["latitude"]
+        lon = row["longitude"]
+        for k, (clat, clon) in city_centers.items():
+            if k in city:
+                return haversine_km(lat, lon, clat, clon)
+        return np.nan
+
+    distances = df.apply(
+        lambda r: compute_dist(r) if pd.notna(r.get("latitude")) and pd.notna(r.get("longitude")) else np.nan,
+        axis=1
+    )
+    return distances.fillna(distances.median() if not pd.Series(distances).isna().all() else 0)
+
+
+def listings(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    latitude = np.round(rng.uniform(12.0, 29.0, rows), 6)
+    longitude = np.round(rng.uniform(72.0, 89.0, rows), 6)
+    latitude[rng.random(rows) < 0.01] = np.nan
+    longitude[rng.random(rows) < 0.01] = np.nan
+    return pd.DataFrame({
+        "city_name": np.array(CITIES, dtype=object)[rng.integers(0, len(CITIES), rows)],
+        "latitude": latitude,
+        "longitude": longitude,
+        "price_num": rng.lognormal(15, 1, rows),
+    })
+
+
+def vectorized_distances(df):
+    distances = pd.Series(haversine_km(pd.to_numeric(df["latitude"], errors="coerce").to_numpy(),
+                                       pd.to_numeric(df["longitude"], errors="coerce").to_numpy(),
+                                       *city_centers(df["city_name"])), index=df.index)
+    return distances.fillna(distances.median() if not distances.isna().all() else 0)
+
+
+def timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df.copy())
+    return result, time.perf_counter() - start
+
+
+def main(sizes, rtol):
+    ok = True
+    print(f"{'rows':>9} {'apply s':>9} {'vectorized s':>13} {'apply rows/s':>13} {'vectorized rows/s':>18} "
+          f"{'speedup':>8} {'max rel diff':>13}")
+    for size in sizes:
+        df = listings(size)
+        with contextlib.redirect_stdout(io.StringIO()):
+            old, old_s = timed(legacy_distances, df)
+            new, new_s = min((timed(vectorized_distances, df) for _ in range(3)), key=lambda r: r[1])
+        diff = np.abs(new.to_numpy() - old.to_numpy()) / np.maximum(np.abs(old.to_numpy()), 1e-300)
+        worst = float(np.nanmax(diff, initial=0.0))
+        same = new.index.equals(old.index) and (new.isna() == old.isna()).all() and worst <= rtol
+        ok &= bool(same)
+        print(f"{size:>9} {old_s:>9.2f} {new_s:>13.4f} {size / old_s:>13,.0f} {size / new_s:>18,.0f} "
+              f"{old_s / new_s:>7.0f}x {worst:>13.1e}{'' if same else '  MISMATCH'}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--rtol", type=float, default=1e-12)
+    args = parser.parse_args()
+    main(args.sizes, args.rtol)
@@ -0,0 +1,114 @@
+# scripts/bench_feature_matrix.py
+"""
+Benchmark the FEATURES_42 encoder used by /api/predict_bulk.
+
+Compares the original per-item dict + DataFrame construction against
+backend.app.features.encode_batch, checks that both produce the same matrix
+(and the same predictions when the pipeline is available) and prints rows/sec.
+
+Usage: python scripts/bench_feature_matrix.py [--sizes 1 100 10000 100000]
+"""
+import sys, os, time, random, argparse
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from backend.app.features import FEATURES_42, encode_batch, to_frame
+from backend.app.main import PredictShort, model_store
+from backend.app.model_store import load_model
+
+
+def legacy_frame(items):
+    """The pre-vectorization predict_bulk encoding, kept verbatim as the reference."""
+    rows = []
+    for it in items:
+        row = {f: 0 for f in FEATURES_42}
+        row["area_num"] = float(it.area_sqft or 0)
+        row["bhk"] = int(it.bhk or 0)
+        row["listing_domain_score"] = float(it.listing_score or 5)
+        row["is_furnished"] = int(bool(it.is_furnished))
+        row["area_per_bhk"] = (float(it.area_sqft) / it.bhk) if it.area_sqft and it.bhk else 0.0
+
+        city_map = {
+            1: "city_Bangalore", 2: "city_Chennai", 3: "city_Delhi", 4: "city_Hyderabad",
+            5: "city_Kolkata", 6: "city_Lucknow", 7: "city_Mumbai"
+        }
+
+        if it.city_id in city_map:
+            row[city_map[it.city_id]] = 1
+
+        rows.append(row)
+    return pd.DataFrame(rows, columns=FEATURES_42)
+
+
+def random_items(n, seed=0):
+    rng = random.Random(seed)
+
+    def maybe(value):
+        return None if rng.random() < 0.1 else value
+
+    return [
+        PredictShort(
+            id=i,
+            area_sqft=maybe(round(rng.uniform(300, 5000), rng.choice([0, 1, 2]))),
+            bhk=maybe(rng.choice([0, 1, 2, 3, 4, 5])),
+            listing_score=maybe(round(rng.uniform(0, 10), 1)),
+            is_furnished=maybe(rng.choice([True, False])),
+            city_id=maybe(rng.choice([0, 1, 2, 3, 4, 5, 6, 7, 8, 99])),
+        )
+        for i in range(n)
+    ]
+
+
+def rows_per_sec(fn, items, min_time=0.5):
+    runs, start = 0, time.perf_counter()
+    while True:
+        fn(items)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return runs * len(items) / elapsed
+
+
+def check_parity(items, pipeline):
+    ref = legacy_frame(items).to_numpy(dtype=np.float32)
+    new = encode_batch(items)
+    if ref.tobytes() != new.tobytes():
+        raise SystemExit("❌ encoded matrix differs from legacy path")
+    if pipeline is not None:
+        old_preds = pipeline.predict(legacy_frame(items))
+        new_preds = pipeline.predict(to_frame(new, list(pipeline.feature_names_in_)))
+        if old_preds.tobytes() != new_preds.tobytes():
+            raise SystemExit("❌ predictions differ from legacy path")
+
+
+def reference_pipeline():
+    """The pickled sklearn pipeline, or None when it is missing. Loaded with
+    use_compiled=False: the server prefers the compiled .npz, and checking
+    that against itself would prove nothing."""
+    try:
+        return load_model(model_store.pipeline_path, use_compiled=False)[0]
+    except FileNotFoundError:
+        return None
+
+
+def main(sizes):
+    pipeline = reference_pipeline()
+    check_parity(random_items(5000, seed=1), pipeline)
+    print("✓ Parity: encoded matrix" + (" and predictions" if pipeline is not None else "") + " bit-identical")
+
+    print(f"\n{'rows':>8} {'legacy rows/s':>15} {'encoder rows/s':>15} {'speedup':>8}")
+    for n in sizes:
+        items = random_items(n)
+        old = rows_per_sec(legacy_frame, items)
+        new = rows_per_sec(lambda b: to_frame(encode_batch(b)), items)
+        print(f"{n:>8} {old:>15,.0f} {new:>15,.0f} {new / old:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000, 100_000])
+    main(parser.parse_args().sizes)
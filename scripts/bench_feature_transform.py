@@ -0,0 +1,152 @@
+# scripts/bench_feature_transform.py
+"""
+Parity and throughput of backend.app.features.FeatureTransformer.
+
+Fits the transformer the way train_model.py does, on synthetic Makaan
+listings (scripts/bench_clean_dataset.py) with gaps in locality, city and
+bath, and checks its matrix against the pandas feature code train_model.py
+ran before (kept below as the reference), bit for bit, also after a
+save/load round trip. Then reports rows/sec:
+
+  frame    transform over a training-style DataFrame, at --sizes rows
+  serving  request_columns + transform for PredictShort batches, next to the
+           fixed FEATURES_42 encoder (encode_batch) it replaces
+
+Exits non-zero on a mismatch.
+
+Usage: python scripts/bench_feature_transform.py [--rows 200000] [--sizes 1000 100000 1000000]
+           [--batches 1 100 4096]
+"""
+import sys, os, io, time, random, argparse, contextlib, tempfile
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+
+from backend.app.features import CITY_NAMES, FeatureTransformer, city_centers, encode_batch, haversine_km, request_columns
+from backend.app.main import PredictShort
+from backend.app.parsing import parse_areas, parse_prices
+from bench_clean_dataset import synthetic_makaan
+from train_model import RealEstatePipeline
+
+
+def training_frame(rows, seed=0):
+    """Validated, engineered training frame as train_model.py builds it."""
+    df = synthetic_makaan(rows, seed)
+    df["price_num"] = parse_prices(df["Price"])
+    df["area_num"] = parse_areas(df["Size"])
+    df = df[(df["price_num"] > 0) & (df["area_num"] > 0)].copy()
+    df["price_per_sqft"] = df["price_num"] / df["area_num"]
+    rng = np.random.default_rng(seed)
+    df["bath"] = np.where(rng.random(len(df)) < 0.3, np.nan, rng.integers(1, 4, len(df)))
+    df.loc[rng.random(len(df)) < 0.02, "Locality_Name"] = np.nan
+    df.loc[rng.random(len(df)) < 0.02, "City_name"] = "Navi Mumbai"
+    df.loc[rng.random(len(df)) < 0.01, "City_name"] = np.nan
+    df.columns = df.columns.str.strip().str.lower()
+
+    pipeline = object.__new__(RealEstatePipeline)  # no chdir / banner
+    pipeline.df = df
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline.validate_data().engineer_features()
+    return pipeline.df, pipeline.transformer
+
+
+def reference_matrix(df):
+    """The on-the-fly pandas features train_model.py computed before the
+    transformer (engineer_features + prepare_features + split_data's fillna)."""
+    df = df.copy()
+    df["price_per_bhk"] = df["price_num"] / df["bhk"]
+    df["area_per_bhk"] = df["area_num"] / df["bhk"]
+    df["bath"] = pd.to_numeric(df["bath"], errors="coerce").fillna(df["bhk"])
+    df["price_per_bath"] = df["price_num"] / (df["bath"] + 1)
+    df["demand_density"] = df["locality_name"].map(df["locality_name"].value_counts().to_dict()).fillna(0).astype(int)
+    df["price_dev_locality"] = df["price_per_sqft"] - df.groupby("locality_name")["price_per_sqft"].transform("mean")
+    df["luxury_index"] = (df["bath"] / df["bhk"]).fillna(0) + df["is_furnished"] + df["listing_domain_score"]
+    df["area_cat"] = pd.cut(df["area_num"], bins=[0, 1000, 2000, 1e9], labels=["small", "medium", "large"])
+    distances = pd.Series(haversine_km(df["latitude"].to_numpy(), df["longitude"].to_numpy(),
+                                       *city_centers(df["city_name"])), index=df.index)
+    df["dist_city_center"] = distances.fillna(distances.median() if not distances.isna().all() else 0)
+
+    features = ["area_num", "bhk", "listing_domain_score", "is_furnished", "is_rera_registered", "is_apartment",
+                "price_per_bhk", "area_per_bhk", "price_per_bath", "demand_density", "price_dev_locality",
+                "luxury_index", "dist_city_center"]
+    top = df["locality_name"].value_counts().nlargest(20).index
+    loc = pd.get_dummies(df["locality_name"].where(df["locality_name"].isin(top), "other"), prefix="loc", drop_first=True)
+    area_cat = pd.get_dummies(df["area_cat"], prefix="area_cat", drop_first=True)
+    top = df["city_name"].value_counts().nlargest(10).index
+    city = pd.get_dummies(df["city_name"].where(df["city_name"].isin(top), "other"), prefix="city", drop_first=True)
+    df = pd.concat([df, loc, area_cat, city], axis=1)
+    features += loc.columns.tolist() + city.columns.tolist() + area_cat.columns.tolist()
+    return features, df[features].fillna(0).astype(float).to_numpy()
+
+
+def random_items(n, transformer, seed=0):
+    rng = random.Random(seed)
+    localities = transformer.localities[:200] + ["Somewhere New"]
+
+    def maybe(value):
+        return None if rng.random() < 0.1 else value
+
+    return [
+        PredictShort(
+            id=i,
+            area_sqft=maybe(round(rng.uniform(300, 5000), 1)),
+            bhk=maybe(rng.choice([1, 2, 3, 4, 5])),
+            listing_score=maybe(round(rng.uniform(0, 10), 1)),
+            is_furnished=maybe(rng.choice([True, False])),
+            city_id=maybe(rng.choice(list(CITY_NAMES) + [99])),
+            locality=maybe(rng.choice(localities)),
+            property_type=maybe(rng.choice(["Apartment", "Villa"])),
+        )
+        for i in range(n)
+    ]
+
+
+def rows_per_sec(fn, arg, rows, min_time=0.5):
+    runs, start = 0, time.perf_counter()
+    while True:
+        fn(arg)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return runs * rows / elapsed
+
+
+def main(rows, sizes, batches):
+    df, transformer = training_frame(rows)
+    features, expected = reference_matrix(df)
+    got = transformer.transform(df)
+    ok = features == transformer.features and got.tobytes() == expected.tobytes()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "feature_transformer.json")
+        transformer.save(path)
+        ok &= FeatureTransformer.load(path).transform(df).tobytes() == expected.tobytes()
+        size_kb = os.path.getsize(path) / 1024
+    print(f"{'✓' if ok else '❌'} transform vs pandas features on {len(df)} rows x {len(features)} columns: "
+          f"{'bit-identical' if ok else 'MISMATCH'} (saved transformer {size_kb:.0f} KB)")
+
+    print(f"\n{'frame rows':>10} {'transform rows/s':>17}")
+    for size in sizes:
+        frame = df.sample(size, replace=True, random_state=0).reset_index(drop=True)
+        print(f"{size:>10} {rows_per_sec(transformer.transform, frame, size):>17,.0f}")
+
+    print(f"\n{'batch':>10} {'encode_batch rows/s':>20} {'transformer rows/s':>19}")
+    for size in batches:
+        items = random_items(size, transformer)
+        old = rows_per_sec(encode_batch, items, size)
+        new = rows_per_sec(lambda b: transformer.transform(request_columns(b), dtype=np.float32), items, size)
+        print(f"{size:>10} {old:>20,.0f} {new:>19,.0f}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 100, 4096])
+    args = parser.parse_args()
+    main(args.rows, args.sizes, args.batches)
@@ -0,0 +1,102 @@
+# scripts/bench_ingest.py
+"""
+Listing ingest throughput: the per-row create_property path (PropertyIn,
+ORM add/commit/refresh for every listing) against batched ingest with
+multi-row INSERT ... RETURNING and with COPY.
+
+Generates an NDJSON feed of --rows synthetic listings for one seller, loads
+it each way into the configured database, reports rows/s and the projected
+time for a 100k-listing feed, and deletes the inserted rows afterwards. The
+per-row path only loads --legacy-rows (it is slow).
+
+Usage: python scripts/bench_ingest.py [--rows 50000] [--legacy-rows 5000]
+"""
+import sys, os, io, json, time, random, argparse
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import delete, func, select
+
+from backend.app import db, ingest, models
+from backend.app.main import PropertyIn
+
+AMENITIES = ["Gym", "Pool", "Parking", "Lift", "Security", "Garden", "Clubhouse", "Power Backup"]
+TYPES = ["Apartment", "Villa", "Independent House", "Studio"]
+
+
+def make_feed(n, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    for i in range(n):
+        lines.append(json.dumps({
+            "property_name": f"Feed listing {i}",
+            "city_id": rng.randint(1, 7),
+            "area_sqft": rng.randint(400, 3000),
+            "bhk": rng.randint(1, 4),
+            "is_furnished": rng.random() < 0.5,
+            "listing_score": round(rng.uniform(5, 9), 1),
+            "property_type": rng.choice(TYPES),
+            "amenities": rng.sample(AMENITIES, 3),
+            "location": f"Sector {rng.randint(1, 120)}",
+            "seller_phone": "9876543210",
+            "seller_email": "partner@example.com",
+            "images": [],
+        }))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def per_row(feed, seller_id):
+    """create_property, once per listing."""
+    for line in io.BytesIO(feed):
+        payload = PropertyIn(**json.loads(line))
+        session = db.SessionLocal()
+        try:
+            property_data = payload.dict()  # as in create_property
+            property_data["seller_id"] = seller_id
+            prop = models.Property(**property_data)
+            session.add(prop)
+            session.commit()
+            session.refresh(prop)
+        finally:
+            session.close()
+
+
+def bulk(feed, seller_id, method, batch_size):
+    report = ingest.ingest(ingest.read_ndjson(io.BytesIO(feed)), PropertyIn, db.SessionLocal,
+                           seller_id=seller_id, batch_size=batch_size, method=method)
+    assert report["inserted"] == report["rows"], report
+
+
+def main(rows, legacy_rows, batch_size):
+    with db.SessionLocal() as session:
+        seller_id = session.execute(select(models.User.id).where(models.User.user_type == "seller")).scalar()
+        max_id = session.execute(select(func.max(models.Property.id))).scalar() or 0
+
+    feed = make_feed(rows)
+    runs = (
+        ("per-row ORM", legacy_rows, lambda: per_row(make_feed(legacy_rows), seller_id)),
+        (f"INSERT x{batch_size}", rows, lambda: bulk(feed, seller_id, "insert", batch_size)),
+        (f"COPY x{batch_size}", rows, lambda: bulk(feed, seller_id, "copy", batch_size)),
+    )
+    print(f"{'path':<16} {'rows':>7} {'seconds':>8} {'rows/s':>9} {'100k feed':>10}")
+    try:
+        for label, n, fn in runs:
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            rate = n / elapsed
+            print(f"{label:<16} {n:>7} {elapsed:>8.2f} {rate:>9,.0f} {100000 / rate:>9.1f}s")
+    finally:
+        with db.SessionLocal() as session:
+            session.execute(delete(models.Property).where(models.Property.id > max_id))
+            session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--legacy-rows", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.rows, args.legacy_rows, args.batch_size)
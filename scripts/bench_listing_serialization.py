@@ -0,0 +1,100 @@
+# scripts/bench_listing_serialization.py
+"""
+Throughput of listing pages: ORM objects + property_to_dict + response_model
+validation (the previous /api/properties path) against the column projection
+and direct JSON encoding the endpoint uses now.
+
+Reads the first N properties of the configured database (seed it with
+scripts/insert_batch_data.py or scripts/bench_property_pages.py), checks that
+both paths return the same rows, then prints rows/sec for the full projection
+and the "card" preset.
+
+Usage: python scripts/bench_listing_serialization.py [--sizes 50 500 5000]
+"""
+import sys, os, time, json, argparse
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from backend.app import db, models
+from backend.app.main import FIELD_PRESETS, json_response, listing_rows, property_select
+
+response_adapter = TypeAdapter(List[dict])
+
+
+def property_to_dict(p):
+    """The pre-projection serializer, kept verbatim as the reference."""
+    return {
+        "id": p.id,
+        "property_name": p.property_name,
+        "city_id": p.city_id,
+        "area_sqft": p.area_sqft,
+        "bhk": p.bhk,
+        "is_furnished": p.is_furnished,
+        "listing_score": p.listing_score,
+        "property_type": p.property_type,
+        "amenities": p.amenities,
+        "location": p.location,
+        "seller_phone": p.seller_phone,
+        "seller_email": p.seller_email,
+        "seller_whatsapp": p.seller_whatsapp,
+        "images": p.images,
+        "seller_id": p.seller_id,
+    }
+
+
+def legacy_page(session, limit):
+    props = session.query(models.Property).order_by(models.Property.id).limit(limit).all()
+    content = response_adapter.validate_python([property_to_dict(p) for p in props])
+    body = json.dumps(jsonable_encoder(content)).encode()
+    session.expunge_all()
+    return body
+
+
+def lean_page(session, limit, fields):
+    stmt = property_select(fields).limit(limit)
+    return json_response(listing_rows(session, stmt, fields)).body
+
+
+def rows_per_sec(fn, limit, min_time=1.0):
+    runs, start = 0, time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return runs * limit / elapsed, elapsed / runs
+
+
+def main(sizes):
+    session = db.SessionLocal()
+    have = session.query(models.Property).count()
+    if have < max(sizes):
+        raise SystemExit(f"❌ Need at least {max(sizes)} properties, found {have}")
+
+    limit = max(sizes)
+    if json.loads(legacy_page(session, limit)) != json.loads(lean_page(session, limit, FIELD_PRESETS["full"])):
+        raise SystemExit("❌ projected rows differ from property_to_dict")
+    print(f"✓ Parity: {limit} rows identical to property_to_dict")
+
+    print(f"\n{'rows':>6} {'path':>8} {'rows/s':>12} {'ms/page':>9} {'bytes':>9} {'speedup':>8}")
+    for n in sizes:
+        base, _ = rows_per_sec(lambda: legacy_page(session, n), n)
+        print(f"{n:>6} {'legacy':>8} {base:>12,.0f} {n / base * 1000:>9.2f} {len(legacy_page(session, n)):>9}")
+        for preset in ("full", "card"):
+            fields = FIELD_PRESETS[preset]
+            rps, _ = rows_per_sec(lambda: lean_page(session, n, fields), n)
+            size = len(lean_page(session, n, fields))
+            print(f"{n:>6} {preset:>8} {rps:>12,.0f} {n / rps * 1000:>9.2f} {size:>9} {rps / base:>7.1f}x")
+    session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    main(parser.parse_args().sizes)
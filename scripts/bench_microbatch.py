@@ -0,0 +1,92 @@
+# scripts/bench_microbatch.py
+"""
+Compare per-request pipeline.predict calls with the MicroBatcher used by the
+prediction endpoints.
+
+Each of --concurrency clients sends single-listing predictions back to back
+for --seconds. "direct" runs every request through the default threadpool
+(what a sync endpoint does); "batched" goes through MicroBatcher.
+
+Usage: python scripts/bench_microbatch.py [--concurrency 64] [--seconds 5] [--max-wait-ms 2]
+"""
+import sys, os, time, asyncio, argparse
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+
+from backend.app.batcher import MicroBatcher
+from backend.app.features import encode_batch
+from backend.app.main import PredictShort, run_pipeline, model_store
+
+
+def sample_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    items = [
+        PredictShort(
+            id=i,
+            area_sqft=float(rng.integers(400, 3000)),
+            bhk=int(rng.integers(1, 5)),
+            listing_score=float(rng.integers(50, 90)) / 10,
+            is_furnished=bool(rng.integers(0, 2)),
+            city_id=int(rng.integers(1, 8)),
+        )
+        for i in range(n)
+    ]
+    X = encode_batch(items)
+    return [X[i:i + 1] for i in range(n)]
+
+
+async def drive(call, rows, concurrency, seconds):
+    latencies = []
+    stop_at = time.perf_counter() + seconds
+
+    async def client(k):
+        i = k
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            await call(rows[i % len(rows)])
+            latencies.append(time.perf_counter() - start)
+            i += concurrency
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(k) for k in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    lat = np.array(latencies) * 1000
+    return len(latencies) / elapsed, np.percentile(lat, 50), np.percentile(lat, 99)
+
+
+async def main(concurrency, seconds, max_wait_ms, max_batch):
+    rows = sample_rows(1000)
+    serving = model_store.serving
+
+    async def direct(X):
+        return await asyncio.get_running_loop().run_in_executor(None, run_pipeline, X, serving)
+
+    batcher = MicroBatcher(run_pipeline, max_wait=max_wait_ms / 1000, max_batch=max_batch)
+
+    async def batched(X):
+        return await batcher.submit(X, serving)
+
+    print(f"concurrency={concurrency} max_wait={max_wait_ms}ms max_batch={max_batch}\n")
+    print(f"{'mode':>8} {'preds/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, call in (("direct", direct), ("batched", batched)):
+        rps, p50, p99 = await drive(call, rows, concurrency, seconds)
+        print(f"{name:>8} {rps:>10,.0f} {p50:>8.2f} {p99:>8.2f}")
+
+    stats = batcher.stats()
+    print(f"\navg requests per batch: {stats['avg_requests_per_batch']:.1f} (largest {stats['largest_batch']} rows)")
+    await batcher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--max-wait-ms", type=float, default=2)
+    parser.add_argument("--max-batch", type=int, default=4096)
+    args = parser.parse_args()
+    if model_store.load() is None:
+        raise SystemExit("❌ Pipeline not loaded; set PIPELINE_PATH")
+    asyncio.run(main(args.concurrency, args.seconds, args.max_wait_ms, args.max_batch))
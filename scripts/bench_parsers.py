@@ -0,0 +1,92 @@
+# scripts/bench_parsers.py
+"""
+Parity and throughput of the vectorized price/area parsers.
+
+Checks backend.app.parsing.parse_prices / parse_areas against the per-value
+parse_price / parse_area (the rules clean_dataset.py applied row by row) on
+a corpus of hand-picked edge cases plus a sample of Price/Size values, then
+reports rows/sec for both at several sizes. The sample comes from --input
+(the Makaan CSV) when given, otherwise from the synthetic generator in
+scripts/bench_clean_dataset.py. Exits non-zero on any mismatch.
+
+Usage: python scripts/bench_parsers.py [--input Makaan_Properties_Buy.csv] [--sample 200000]
+           [--sizes 1000 100000 1000000]
+"""
+import sys, os, time, argparse
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+
+from backend.app.parsing import parse_area, parse_areas, parse_price, parse_prices
+
+PRICE_CASES = [
+    "", " ", "nan", "NaN", None, np.nan, "1,25,00,000", " 42 ", "1.2 Cr", "1.2Cr", ".5 Cr", "12 Cr.",
+    "Cr 12", "cr 12", "1.2 cr", "5 Lacs", "5 Lakhs", "85 Lakh", "85 Lac", "85Lac", "1 Cr 20 Lac",
+    "Price on Request", "1e5", "1_000", "5.", "1,2,3", "12,", "+5", "-5", "inf", "1.2.3",
+    "١٢٣", "12 Cr", 5000, 5000.0, "Lakh", "Cr",
+]
+AREA_CASES = [
+    "", "nan", None, np.nan, "1,200 sq ft", "1,200 sq.ft", "850", "sq ft", "12² sq m", "1.2.3 sq",
+    "١٢٣ sq ft", "1,200.50 sqft", "..", ".", "1.", "Plot 120", "120 sq yd - 1080 sq ft",
+    1200, 1200.5, "  900  ",
+]
+
+
+def sample_corpus(input_file, n):
+    if input_file:
+        frame = pd.read_csv(input_file, encoding="latin1", usecols=["Price", "Size"])
+        frame = frame.sample(min(n, len(frame)), random_state=0)
+    else:
+        from bench_clean_dataset import synthetic_makaan
+        frame = synthetic_makaan(n)
+    return frame["Price"].tolist(), frame["Size"].tolist()
+
+
+def check(name, legacy, vectorized, values):
+    expected = np.array([legacy(v) for v in values], dtype=float)
+    got = vectorized(values)
+    same = (expected == got) | (np.isnan(expected) & np.isnan(got))
+    for i in np.flatnonzero(~same)[:10]:
+        print(f"   MISMATCH {name}({values[i]!r}): legacy {expected[i]!r}, vectorized {got[i]!r}")
+    print(f"{name:<6} {len(values):>8} values, {int((~same).sum())} mismatches")
+    return bool(same.all())
+
+
+def rate(fn, values, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(values)
+        best = min(best, time.perf_counter() - start)
+    return len(values) / best
+
+
+def main(input_file, sample, sizes):
+    prices, areas = sample_corpus(input_file, sample)
+    ok = check("price", parse_price, parse_prices, PRICE_CASES + prices)
+    ok &= check("area", parse_area, parse_areas, AREA_CASES + areas)
+
+    print(f"\n{'column':<6} {'rows':>9} {'apply rows/s':>14} {'vectorized rows/s':>18} {'speedup':>8}")
+    for size in sizes:
+        reps = -(-size // len(prices))
+        for name, legacy, vectorized, values in (("price", parse_price, parse_prices, prices),
+                                                 ("area", parse_area, parse_areas, areas)):
+            series = pd.Series((values * reps)[:size])
+            old = rate(lambda s: s.apply(legacy), series, repeat=1 if size > 100_000 else 3)
+            new = rate(vectorized, series)
+            print(f"{name:<6} {size:>9} {old:>14,.0f} {new:>18,.0f} {new / old:>7.1f}x")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input")
+    parser.add_argument("--sample", type=int, default=200_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    main(args.input, args.sample, args.sizes)
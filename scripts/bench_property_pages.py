@@ -0,0 +1,115 @@
+# scripts/bench_property_pages.py
+"""
+Page latency of GET /api/properties with keyset (cursor) pagination.
+
+Tops the database up to --listings properties with the seeder from
+scripts/insert_batch_data.py, then for several filter combinations walks
+--pages pages by following X-Next-Cursor through the FastAPI app, reporting
+p50/p99 page latency, the cost of reaching the same depth with OFFSET, and
+the EXPLAIN ANALYZE plan of a page query.
+
+Usage: python scripts/bench_property_pages.py [--listings 100000] [--pages 50] [--page-size 50]
+"""
+import sys, os, time, random, uuid, argparse
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from backend.app import db, models
+from backend.app.main import app, property_select
+import insert_batch_data
+
+PROPS_PER_SELLER = 1000
+
+
+def seed(target):
+    session = db.SessionLocal()
+    try:
+        have = session.query(models.Property).count()
+        missing = target - have
+        if missing <= 0:
+            return have
+        print(f"Seeding {missing} listings (have {have})...")
+        sellers = -(-missing // PROPS_PER_SELLER)
+        insert_batch_data.seed(
+            session, sellers=sellers, props_per_seller=PROPS_PER_SELLER, buyers=0, favs_per_buyer=0,
+            seed=random.randrange(2**32), prefix=f"bench-{uuid.uuid4().hex[:10]}-",
+        )
+        session.commit()
+    finally:
+        session.close()
+    with db.engine.begin() as conn:
+        conn.execute(text("ANALYZE properties"))
+    return have + sellers * PROPS_PER_SELLER
+
+
+def explain(session, filters, cursor, limit):
+    stmt = property_select(cursor=cursor, **filters).limit(limit)
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    rows = session.execute(text("EXPLAIN ANALYZE " + sql)).fetchall()
+    return "\n".join("      " + r[0] for r in rows)
+
+
+def walk(client, filters, pages, limit):
+    latencies, cursor = [], None
+    for _ in range(pages):
+        params = dict(filters, limit=limit)
+        if cursor:
+            params["cursor"] = cursor
+        start = time.perf_counter()
+        resp = client.get("/api/properties", params=params)
+        latencies.append(time.perf_counter() - start)
+        resp.raise_for_status()
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    return latencies, cursor
+
+
+def offset_page(session, filters, depth, limit):
+    stmt = property_select(**filters).offset(depth * limit).limit(limit)
+    start = time.perf_counter()
+    session.execute(stmt).all()
+    return time.perf_counter() - start
+
+
+def main(listings, pages, limit):
+    seed(listings)
+    session = db.SessionLocal()
+    seller_id = session.query(models.Property.seller_id).order_by(models.Property.id.desc()).limit(1).scalar()
+    combos = [
+        {},
+        {"city_id": 3},
+        {"city_id": 3, "bhk": 2},
+        {"bhk": 4},
+        {"seller_id": seller_id},
+        {"area_sqft": 800},
+        {"city_id": 7, "area_sqft": 1200},
+    ]
+
+    print(f"\n{'filters':<32} {'pages':>5} {'p50 ms':>8} {'p99 ms':>8} {'OFFSET same depth ms':>21}")
+    with TestClient(app) as client:
+        for filters in combos:
+            latencies, cursor = walk(client, filters, pages, limit)
+            lat = np.array(latencies) * 1000
+            depth = len(latencies) - 1
+            offset_ms = offset_page(session, filters, depth, limit) * 1000
+            label = ",".join(f"{k}={v}" for k, v in filters.items()) or "(none)"
+            print(f"{label:<32} {len(lat):>5} {np.percentile(lat, 50):>8.2f} {np.percentile(lat, 99):>8.2f} {offset_ms:>21.2f}")
+            print(explain(session, filters, int(cursor) if cursor else None, limit))
+    session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", type=int, default=100_000)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+    main(args.listings, args.pages, args.page_size)
@@ -0,0 +1,137 @@
+# scripts/bench_seller_analytics.py
+"""
+Latency of GET /api/seller/analytics for one large seller.
+
+Creates (once) a seller with --listings properties, --buyers buyers holding
+--favourites favourites on them and --reviews reviews, using bulk inserts.
+Then checks the endpoint (served from the analytics rollups) against the previous Python
+implementation and times both (the legacy path is O(listings x
+favourites) and takes minutes at the default sizes, so it runs once).
+
+Usage: python scripts/bench_seller_analytics.py [--listings 5000] [--buyers 20000]
+                                                [--favourites 100000] [--reviews 5000]
+"""
+import sys, os, time, random, argparse
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select, text
+
+from backend.app import db, models, rollups
+from backend.app.main import app, get_current_user_from_token
+
+
+def legacy_analytics(session, seller_id):
+    """The pre-aggregation endpoint body, kept as the reference."""
+    properties = session.query(models.Property).filter(models.Property.seller_id == seller_id).all()
+    property_ids = [p.id for p in properties]
+    favourites = session.query(models.Favourite).filter(models.Favourite.property_id.in_(property_ids)).all()
+    buyer_ids = list(set([f.user_id for f in favourites]))
+    buyers = session.query(models.User).filter(models.User.id.in_(buyer_ids)).all()
+    property_favs = {}
+    for p in properties:
+        property_favs[p.id] = len([f for f in favourites if f.property_id == p.id])
+    reviews = session.query(models.Review).filter(models.Review.property_id.in_(property_ids)).all()
+    return {
+        "total_properties": len(properties),
+        "total_unique_buyers": len(buyer_ids),
+        "buyers": buyers,
+        "property_favourites": property_favs,
+        "reviews": reviews,
+    }
+
+
+def seed(session, listings, buyers, favourites, reviews):
+    email = f"analytics-seller-{listings}-{favourites}@example.com"
+    seller_id = session.execute(select(models.User.id).where(models.User.email == email)).scalar()
+    if seller_id:
+        return seller_id
+
+    print(f"Seeding seller with {listings} listings, {favourites} favourites, {reviews} reviews...")
+    rng = random.Random(0)
+    seller_id = session.execute(
+        insert(models.User).values(email=email, password_hash="x", user_type="seller", full_name="Analytics Seller")
+        .returning(models.User.id)
+    ).scalar()
+    prop_ids = session.execute(
+        insert(models.Property).returning(models.Property.id),
+        [{"seller_id": seller_id, "property_name": f"Analytics {i}", "city_id": rng.randint(1, 7),
+          "area_sqft": rng.randint(400, 3000), "bhk": rng.randint(1, 4)} for i in range(listings)],
+    ).scalars().all()
+    buyer_ids = session.execute(
+        insert(models.User).returning(models.User.id),
+        [{"email": f"analytics-buyer-{seller_id}-{i}@example.com", "password_hash": "x",
+          "user_type": "buyer", "full_name": f"Buyer {i}"} for i in range(buyers)],
+    ).scalars().all()
+    for start in range(0, favourites, 50_000):
+        session.execute(insert(models.Favourite), [
+            {"user_id": rng.choice(buyer_ids), "property_id": rng.choice(prop_ids)}
+            for _ in range(start, min(start + 50_000, favourites))
+        ])
+    session.execute(insert(models.Review), [
+        {"user_id": rng.choice(buyer_ids), "property_id": rng.choice(prop_ids),
+         "rating": rng.randint(1, 5), "comment": "Bench review"} for _ in range(reviews)
+    ])
+    # bulk inserts bypass the API, so bring the analytics rollups up to date
+    rollups.reconcile(session, seller_id)
+    session.commit()
+    with db.engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    return seller_id
+
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    lat = np.array(times) * 1000
+    return result, np.percentile(lat, 50), lat.max()
+
+
+def main(listings, buyers, favourites, reviews, runs):
+    session = db.SessionLocal()
+    seller_id = seed(session, listings, buyers, favourites, reviews)
+    app.dependency_overrides[get_current_user_from_token] = lambda: {"id": seller_id, "user_type": "seller"}
+
+    with TestClient(app) as client:
+        def endpoint():
+            resp = client.get("/api/seller/analytics")
+            resp.raise_for_status()
+            return resp.json()
+
+        def legacy():
+            result = legacy_analytics(session, seller_id)
+            session.expunge_all()
+            return result
+
+        new, new_p50, new_max = timed(endpoint, runs)
+        old, old_p50, old_max = timed(legacy, 1)
+
+    assert new["total_properties"] == old["total_properties"]
+    assert new["total_unique_buyers"] == old["total_unique_buyers"]
+    assert {int(k): v for k, v in new["property_favourites"].items()} == old["property_favourites"]
+    assert new["total_reviews"] == len(old["reviews"])
+    assert new["total_favourites"] == sum(old["property_favourites"].values())
+    print(f"✓ Parity: counts match ({new['total_favourites']} favourites, "
+          f"{new['total_unique_buyers']} buyers, {new['total_reviews']} reviews)")
+
+    print(f"\n{'path':>10} {'p50 ms':>10} {'max ms':>10}")
+    print(f"{'legacy':>10} {old_p50:>10.1f} {old_max:>10.1f}")
+    print(f"{'endpoint':>10} {new_p50:>10.1f} {new_max:>10.1f}")
+    session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", type=int, default=5000)
+    parser.add_argument("--buyers", type=int, default=20_000)
+    parser.add_argument("--favourites", type=int, default=100_000)
+    parser.add_argument("--reviews", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    main(args.listings, args.buyers, args.favourites, args.reviews, args.runs)
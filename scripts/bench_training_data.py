@@ -0,0 +1,123 @@
+# scripts/bench_training_data.py
+"""
+Training data load: cleaned CSV vs the column bundle (cleaned_*.frame).
+
+Generates a synthetic Makaan file (scripts/bench_clean_dataset.py) unless
+--input is given, cleans it once with clean_dataset.py (CSV + bundle), then
+runs it again to time the unchanged-source check. Each load runs in its own
+process through RealEstatePipeline.load_data + validate_data:
+
+  csv     the CSV alone (a copy with no bundle beside it): read_csv as before
+  bundle  the bundle train_model.py now picks up next to the CSV
+
+and reports seconds and peak RSS (VmHWM, with the RSS after imports for
+reference). Finally both paths run through feature engineering in this
+process and the feature matrices are compared. Exits non-zero if they differ.
+
+Usage: python scripts/bench_training_data.py [--rows 330000] [--input Makaan_Properties_Buy.csv] [--keep]
+"""
+import sys, os, io, time, argparse, contextlib, shutil, subprocess, tempfile
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+
+from backend.app.columnar import bundle_path
+from bench_clean_dataset import PEAK_WRAPPER, synthetic_makaan
+
+LOADER = """
+import os, sys, time
+sys.path.insert(0, {root!r})
+from train_model import RealEstatePipeline
+def rss_kb():
+    for line in open('/proc/self/status'):
+        if line.startswith('VmRSS:'):
+            return int(line.split()[1])
+before = rss_kb()
+pipeline = RealEstatePipeline({root!r})
+start = time.perf_counter()
+pipeline.load_data(sys.argv[1]).validate_data()
+sys.stderr.write(f"LOAD {{time.perf_counter() - start}} {{before}}\\n")
+"""
+
+
+def run(args, cwd):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", PEAK_WRAPPER, *args], cwd=cwd,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if proc.returncode:
+        raise SystemExit(proc.stderr)
+    fields = {}
+    for line in proc.stderr.splitlines():
+        key, _, rest = line.partition(" ")
+        fields[key] = rest.split()
+    return time.perf_counter() - start, fields
+
+
+def features(path):
+    from train_model import RealEstatePipeline
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline = RealEstatePipeline(PROJECT_ROOT)
+        pipeline.load_data(path).validate_data().engineer_features().prepare_features()
+    return pipeline.X.astype(float).reset_index(drop=True)
+
+
+def main(rows, input_file, keep):
+    workdir = tempfile.mkdtemp(prefix="train-data-bench-")
+    if input_file is None:
+        input_file = os.path.join(workdir, "makaan_synthetic.csv")
+        synthetic_makaan(rows).to_csv(input_file, index=False, encoding="latin1")
+        print(f"Generated {rows} rows ({os.path.getsize(input_file) / 1e6:.0f} MB)")
+    script = os.path.join(PROJECT_ROOT, "clean_dataset.py")
+    cleaned = os.path.join(workdir, "cleaned.csv")
+    clean = [script, "--input", input_file, "--output", cleaned, "--stream"]
+    first, _ = run(clean, workdir)
+    again, _ = run(clean, workdir)
+    print(f"clean_dataset.py --stream: {first:.1f}s; unchanged source, skipped: {again:.1f}s")
+
+    legacy = os.path.join(workdir, "legacy")
+    os.makedirs(legacy)
+    legacy_csv = os.path.join(legacy, "cleaned.csv")
+    shutil.copyfile(cleaned, legacy_csv)
+    bundle = bundle_path(cleaned)
+    bundle_mb = sum(os.path.getsize(os.path.join(bundle, f)) for f in os.listdir(bundle)) / 1e6
+    print(f"cleaned CSV {os.path.getsize(cleaned) / 1e6:.0f} MB, bundle {bundle_mb:.0f} MB\n")
+
+    loader = os.path.join(workdir, "load.py")
+    with open(loader, "w") as fh:
+        fh.write(LOADER.format(root=PROJECT_ROOT))
+    print(f"{'path':<7} {'load+validate s':>16} {'RSS after imports MB':>21} {'peak RSS MB':>12}")
+    for name, path in (("csv", legacy_csv), ("bundle", cleaned)):
+        best = None
+        for _ in range(3):
+            _, fields = run([loader, path], workdir)
+            seconds, before = float(fields["LOAD"][0]), int(fields["LOAD"][1]) / 1024
+            peak = int(fields["PEAK_KB"][0]) / 1024
+            if best is None or seconds < best[0]:
+                best = (seconds, before, peak)
+        print(f"{name:<7} {best[0]:>16.2f} {best[1]:>21.0f} {best[2]:>12.0f}")
+
+    a, b = features(legacy_csv), features(cleaned)
+    same = a.shape == b.shape and list(a.columns) == list(b.columns)
+    if same:
+        diff = np.abs(a.to_numpy() - b.to_numpy()) / np.maximum(np.abs(a.to_numpy()), 1.0)
+        same = bool(np.nanmax(diff, initial=0.0) < 1e-9) and (a.isna().to_numpy() == b.isna().to_numpy()).all()
+        print(f"\nfeature matrix {a.shape}: max relative difference {np.nanmax(diff, initial=0.0):.2e}")
+    print(f"feature matrices match: {same}")
+    if keep:
+        print(f"files kept in {workdir}")
+    else:
+        shutil.rmtree(workdir)
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=330_000)
+    parser.add_argument("--input")
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+    main(args.rows, args.input, args.keep)
@@ -0,0 +1,122 @@
+# scripts/bench_upload_serving.py
+"""
+Serving uploaded images: StaticFiles (the previous /uploads mount) against
+BlobFiles over the same content-addressed files.
+
+Writes --images blobs of --size-kb into a temporary directory, serves it
+both ways from one uvicorn process and measures full downloads (requests/s
+and MB/s at --concurrency), what a browser re-rendering a listing grid
+sends on a repeat view (conditional requests vs none for immutable blobs),
+and whether a Range request is honoured.
+
+Usage: python scripts/bench_upload_serving.py [--images 200] [--size-kb 300]
+"""
+import sys, os, time, argparse, asyncio, hashlib, tempfile
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import httpx
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+
+from backend.app.blob_files import BlobFiles
+from backend.app.uploads import BLOB_PATH, blob_path
+
+# uvicorn imports this module as the app; the parent passes the directory
+BLOB_DIR = os.getenv("BENCH_BLOB_DIR")
+app = Starlette(routes=[
+    Mount("/static", StaticFiles(directory=BLOB_DIR)),
+    Mount("/blobs", BlobFiles(BLOB_DIR, immutable=BLOB_PATH)),
+]) if BLOB_DIR else None
+
+
+def make_blobs(directory, n, size_kb):
+    names = []
+    for i in range(n):
+        data = os.urandom(size_kb * 1024)
+        name = blob_path(hashlib.sha256(data).hexdigest(), ".jpg")
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        names.append(name)
+    return names
+
+
+async def download_all(client, urls, concurrency, rounds):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(url):
+        async with sem:
+            (await client.get(url)).raise_for_status()
+
+    start_at = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(one(u) for u in urls))
+    return len(urls) * rounds / (time.perf_counter() - start_at)
+
+
+async def repeat_view(client, urls, cache):
+    """A browser cache: immutable entries are reused without a request,
+    others are revalidated with If-None-Match. Returns (requests, bytes)."""
+    requests = transferred = 0
+    for url in urls:
+        headers = {}
+        entry = cache.get(url)
+        if entry:
+            if "immutable" in entry.get("cache-control", ""):
+                continue
+            headers["If-None-Match"] = entry["etag"]
+        resp = await client.get(url, headers=headers)
+        requests += 1
+        transferred += len(resp.content)
+        if resp.status_code == 200:
+            cache[url] = resp.headers
+    return requests, transferred
+
+
+async def run(base, names, concurrency, rounds):
+    results = {}
+    async with httpx.AsyncClient(base_url=base, timeout=60, limits=httpx.Limits(max_connections=concurrency)) as client:
+        for label, prefix in (("StaticFiles", "/static/"), ("BlobFiles", "/blobs/")):
+            urls = [prefix + n for n in names]
+            rps = await download_all(client, urls, concurrency, rounds)
+            cache = {}
+            await repeat_view(client, urls, cache)
+            again = await repeat_view(client, urls, cache)
+            ranged = await client.get(urls[0], headers={"Range": "bytes=0-1023"})
+            results[label] = (rps, again, ranged.status_code, len(ranged.content))
+    return results
+
+
+def main(n, size_kb, concurrency, rounds):
+    from load_test_chat import free_port, start, stop
+
+    with tempfile.TemporaryDirectory() as directory:
+        names = make_blobs(directory, n, size_kb)
+        port = free_port()
+        server = start(["--app-dir", "scripts", "bench_upload_serving:app", "--port", str(port)],
+                       {"BENCH_BLOB_DIR": directory}, f"http://127.0.0.1:{port}/blobs/{names[0]}")
+        try:
+            results = asyncio.run(run(f"http://127.0.0.1:{port}", names, concurrency, rounds))
+        finally:
+            stop(server)
+
+    print(f"{n} images x {size_kb} KiB, {concurrency} concurrent\n")
+    print(f"{'':<12} {'req/s':>8} {'MB/s':>7} {'repeat view requests':>21} {'bytes':>7} {'Range 0-1023':>14}")
+    for label, (rps, (requests, transferred), status, length) in results.items():
+        print(f"{label:<12} {rps:>8.0f} {rps * size_kb / 1024:>7.1f} {requests:>21} {transferred:>7} "
+              f"{f'{status} {length} B':>14}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=200)
+    parser.add_argument("--size-kb", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    main(args.images, args.size_kb, args.concurrency, args.rounds)
@@ -0,0 +1,120 @@
+# scripts/bench_uploads.py
+"""
+Image upload throughput, event-loop stalls and listing-card bytes.
+
+Generates --photos camera-sized JPEGs (--width x --height), starts the API
+under uvicorn and uploads them --concurrency at a time while probing
+/healthz to see how long the event loop is blocked. Then uploads the same
+photos again (duplicates), waits for the background variant workers and
+compares what a listing card downloads: the original file vs the "card"
+variant. The uploaded files are deleted afterwards.
+
+Usage: python scripts/bench_uploads.py [--photos 40] [--concurrency 8]
+"""
+import sys, os, io, time, argparse, asyncio
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import httpx
+import numpy as np
+from PIL import Image
+
+from load_test_chat import free_port, start, stop
+
+
+def make_photos(n, width, height):
+    rng = np.random.default_rng()
+    photos = []
+    for i in range(n):
+        # smooth gradient plus sensor-like noise: compresses like a photo
+        y, x = np.mgrid[0:height, 0:width]
+        base = np.stack([(x * 255 // width + i * 13) % 256, (y * 255 // height) % 256,
+                         np.full_like(x, (i * 37) % 256)], axis=-1)
+        pixels = np.clip(base + rng.normal(0, 12, base.shape), 0, 255).astype(np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(pixels).save(buf, "JPEG", quality=90)
+        photos.append(buf.getvalue())
+    return photos
+
+
+async def probe(client, stop_event, samples):
+    while not stop_event.is_set():
+        start_at = time.perf_counter()
+        await client.get("/healthz")
+        samples.append((time.perf_counter() - start_at) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def upload_all(client, photos, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+    results = []
+
+    async def one(i, data):
+        async with sem:
+            resp = await client.post("/api/upload-image", files={"file": (f"photo{i}.jpg", data, "image/jpeg")})
+            resp.raise_for_status()
+            results.append(resp.json())
+
+    stop_event, samples = asyncio.Event(), []
+    prober = asyncio.create_task(probe(client, stop_event, samples))
+    start_at = time.perf_counter()
+    await asyncio.gather(*(one(i, d) for i, d in enumerate(photos)))
+    elapsed = time.perf_counter() - start_at
+    stop_event.set()
+    await prober
+    return results, elapsed, np.array(samples)
+
+
+async def run(base, photos, concurrency):
+    async with httpx.AsyncClient(base_url=base, timeout=120) as client:
+        first = await upload_all(client, photos, concurrency)
+        second = await upload_all(client, photos, concurrency)
+        deadline = time.time() + 120
+        while time.time() < deadline:
+            stats = (await client.get("/api/metrics")).json().get("uploads")
+            if not stats or stats["rendering"] == 0:
+                break
+            await asyncio.sleep(0.2)
+
+        card_bytes = []
+        for item in first[0]:
+            url = item.get("variants", {}).get("card", item["url"])
+            card_bytes.append(len((await client.get(url)).content))
+    return first, second, card_bytes, stats
+
+
+def main(n, width, height, concurrency):
+    photos = make_photos(n, width, height)
+    total_mb = sum(map(len, photos)) / 1e6
+    port = free_port()
+    api = start(["backend.app.main:app", "--port", str(port)], {}, f"http://127.0.0.1:{port}/healthz")
+    try:
+        first, second, card_bytes, stats = asyncio.run(run(f"http://127.0.0.1:{port}", photos, concurrency))
+    finally:
+        stop(api)
+    upload_dir = os.path.join(PROJECT_ROOT, "uploads", "properties")
+    for name in os.listdir(upload_dir):
+        if any(name.startswith(item.get("sha256", item["filename"])) for item in first[0]):
+            os.remove(os.path.join(upload_dir, name))
+
+    print(f"{n} photos {width}x{height}, {total_mb:.1f} MB, {concurrency} concurrent uploads\n")
+    print(f"{'pass':<12} {'seconds':>8} {'MB/s':>7} {'/healthz p50 ms':>16} {'p99 ms':>8} {'max ms':>8}")
+    for label, (_, elapsed, lat) in (("new", first), ("duplicate", second)):
+        print(f"{label:<12} {elapsed:>8.2f} {total_mb / elapsed:>7.1f} {np.percentile(lat, 50):>16.2f} "
+              f"{np.percentile(lat, 99):>8.2f} {lat.max():>8.2f}")
+    print(f"\nlisting card image: original {np.mean(list(map(len, photos))) / 1024:.0f} KiB"
+          f" -> served {np.mean(card_bytes) / 1024:.0f} KiB")
+    if stats:
+        print(f"uploads: {stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--photos", type=int, default=40)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    main(args.photos, args.width, args.height, args.concurrency)
@@ -0,0 +1,130 @@
+# scripts/bench_worker_memory.py
+"""
+Per-worker memory of the prediction API under uvicorn --workers N.
+
+For each serving mode and worker count, starts uvicorn on a free port, waits
+until every worker has loaded the model, runs a few predict_bulk calls and
+reads RSS and PSS (proportional set size: shared pages are split between the
+processes mapping them) of each worker from /proc. Linux only.
+
+Modes:
+  pickle    - USE_COMPILED_PIPELINE=0, each worker unpickles the StackingRegressor
+  compiled  - each worker loads its own copy of pipeline_v1.npz
+  shared    - MODEL_SHARED_MEMORY=1, workers map one read-only pipeline_v1.bin
+  routed    - compiled plus the pickle for batches over COMPILED_MAX_BATCH_ROWS
+              (the compiled/shared modes set it to 0 to measure the artifact alone)
+
+Usage: python scripts/bench_worker_memory.py [--workers 1 4 8] [--modes pickle compiled shared]
+"""
+import sys, os, time, json, socket, signal, argparse, subprocess, urllib.request
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+MODES = {
+    "pickle": {"USE_COMPILED_PIPELINE": "0"},
+    "compiled": {"USE_COMPILED_PIPELINE": "1", "MODEL_SHARED_MEMORY": "0", "COMPILED_MAX_BATCH_ROWS": "0"},
+    "shared": {"USE_COMPILED_PIPELINE": "1", "MODEL_SHARED_MEMORY": "1", "COMPILED_MAX_BATCH_ROWS": "0"},
+    "routed": {"USE_COMPILED_PIPELINE": "1", "MODEL_SHARED_MEMORY": "0", "COMPILED_MAX_BATCH_ROWS": "2048"},
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def proc_kb(pid, path, key):
+    with open(f"/proc/{pid}/{path}") as fh:
+        for line in fh:
+            if line.startswith(key + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def worker_pids(master_pid):
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            ppid = proc_kb(entry, "status", "PPid")
+            with open(f"/proc/{entry}/cmdline", "rb") as fh:
+                cmdline = fh.read()
+        except OSError:
+            continue
+        if ppid == master_pid and b"spawn_main" in cmdline:
+            pids.append(int(entry))
+    return pids
+
+
+def post(url, payload):
+    req = urllib.request.Request(url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return resp.status
+
+
+def measure(mode, workers, timeout=120):
+    port = free_port()
+    env = dict(os.environ, **MODES[mode])
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.time() + timeout
+        pids = []
+        while time.time() < deadline:
+            # uvicorn serves from the master process itself when workers == 1
+            pids = worker_pids(server.pid) if workers > 1 else [server.pid]
+            try:
+                with urllib.request.urlopen(base + "/readyz", timeout=2) as resp:
+                    ready = resp.status == 200
+            except Exception:
+                ready = False
+            if ready and len(pids) == workers:
+                break
+            time.sleep(0.5)
+        else:
+            raise RuntimeError(f"{mode} x{workers} did not become ready")
+        if MODES[mode].get("COMPILED_MAX_BATCH_ROWS", "0") != "0":
+            time.sleep(3 + workers)  # the pickle loads in the background after /readyz
+
+        # Hit every worker (connections are spread by the kernel) so each has
+        # loaded the model and run a prediction before sampling.
+        items = [{"id": i, "area_sqft": 800 + i, "bhk": 1 + i % 4, "city_id": 1 + i % 7} for i in range(200)]
+        for _ in range(workers * 10):
+            while True:
+                try:
+                    post(base + "/api/predict_bulk", items)
+                    break
+                except Exception:
+                    time.sleep(0.2)
+        time.sleep(1.0)
+
+        rss = [proc_kb(pid, "status", "VmRSS") / 1024 for pid in pids]
+        pss = [proc_kb(pid, "smaps_rollup", "Pss") / 1024 for pid in pids]
+        return sum(rss) / len(rss), sum(pss) / len(pss), sum(pss)
+    finally:
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main(worker_counts, modes):
+    print(f"{'mode':>9} {'workers':>8} {'RSS/worker MB':>14} {'PSS/worker MB':>14} {'total PSS MB':>13}")
+    for mode in modes:
+        for n in worker_counts:
+            rss, pss, total = measure(mode, n)
+            print(f"{mode:>9} {n:>8} {rss:>14.1f} {pss:>14.1f} {total:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    args = parser.parse_args()
+    main(args.workers, args.modes)
@@ -0,0 +1,149 @@
+# scripts/check_compiled_model.py
+"""
+Parity and cold-start check for the compiled inference artifact.
+
+Compares backend/models/pipeline_v1.npz against the pickled StackingRegressor
+on the held-out split from train_model.py (when cleaned_indian_property.csv is
+available), otherwise on synthetic FEATURES_42 rows. Then times predict for
+both at each of --sizes rows (best of 5; where the compiled walker stops
+winning sets COMPILED_MAX_BATCH_ROWS), loads each artifact in a fresh
+interpreter and reports load time and peak RSS.
+
+Usage: python scripts/check_compiled_model.py [--pipeline backend/models/pipeline_v1.pkl]
+           [--sizes 1 100 1000 2000 4000 20000 100000]
+"""
+import sys, os, time, argparse, subprocess, json
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import joblib
+
+from backend.app.compiled_model import CompiledEnsemble
+
+CLEANED_FILE = os.path.join(PROJECT_ROOT, "cleaned_indian_property.csv")
+
+# Runs in a fresh interpreter so imports and unpickling are part of the cost.
+LOAD_SNIPPET = """
+import time, resource, json, sys
+start = time.perf_counter()
+if sys.argv[1] == "compiled":
+    from backend.app.compiled_model import CompiledEnsemble
+    model = CompiledEnsemble.load(sys.argv[2])
+else:
+    import joblib
+    model = joblib.load(sys.argv[2])
+elapsed = time.perf_counter() - start
+# VmHWM resets on exec; ru_maxrss can carry over the parent's high-water mark.
+try:
+    with open("/proc/self/status") as fh:
+        peak_kb = next(int(line.split()[1]) for line in fh if line.startswith("VmHWM:"))
+except OSError:
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "max_rss_mb": peak_kb / 1024}))
+"""
+
+
+def held_out_split(feature_names):
+    """X_test from the training pipeline, or None when the cleaned CSV is missing."""
+    with open(CLEANED_FILE, "rb") as fh:
+        if fh.read(40).startswith(b"version https://git-lfs"):
+            return None
+    from train_model import RealEstatePipeline
+    cwd = os.getcwd()
+    try:
+        p = RealEstatePipeline(PROJECT_ROOT)
+        p.load_data(CLEANED_FILE).validate_data().engineer_features().prepare_features().split_data()
+    finally:
+        os.chdir(cwd)
+    return p.X_test.reindex(columns=feature_names, fill_value=0)
+
+
+def synthetic_rows(feature_names, n=20000, seed=0):
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    X = np.zeros((n, len(feature_names)))
+    col = {name: i for i, name in enumerate(feature_names)}
+    X[:, col["area_num"]] = rng.uniform(200, 5000, n)
+    X[:, col["bhk"]] = rng.integers(1, 6, n)
+    X[:, col["listing_domain_score"]] = rng.uniform(0, 10, n)
+    for name in ("is_furnished", "is_rera_registered", "is_apartment", "area_cat_medium"):
+        X[:, col[name]] = rng.integers(0, 2, n)
+    X[:, col["price_per_bhk"]] = rng.uniform(1e5, 5e7, n)
+    X[:, col["area_per_bhk"]] = X[:, col["area_num"]] / X[:, col["bhk"]]
+    X[:, col["price_per_bath"]] = rng.uniform(1e5, 3e7, n)
+    X[:, col["demand_density"]] = rng.integers(0, 3000, n)
+    X[:, col["price_dev_locality"]] = rng.normal(0, 3000, n)
+    X[:, col["luxury_index"]] = rng.uniform(0, 4, n)
+    X[:, col["dist_city_center"]] = rng.uniform(0, 40, n)
+    one_hot = [i for i, name in enumerate(feature_names) if name.startswith(("loc_", "city_"))]
+    X[np.arange(n), rng.choice(one_hot, n)] = 1
+    return pd.DataFrame(X, columns=feature_names)
+
+
+def cold_load(kind, path):
+    out = subprocess.run(
+        [sys.executable, "-c", LOAD_SNIPPET, kind, path],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def best_of(fn, runs=5):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(pipeline_path, sizes):
+    compiled_path = os.path.splitext(pipeline_path)[0] + ".npz"
+    original = joblib.load(pipeline_path)
+    compiled = CompiledEnsemble.load(compiled_path)
+    feature_names = list(compiled.feature_names_in_)
+
+    X = held_out_split(feature_names)
+    source = "held-out split"
+    if X is None:
+        X = synthetic_rows(feature_names)
+        source = "synthetic rows (cleaned CSV not available)"
+
+    t = time.perf_counter()
+    expected = original.predict(X)
+    t_orig = time.perf_counter() - t
+    t = time.perf_counter()
+    got = compiled.predict(X.to_numpy())
+    t_comp = time.perf_counter() - t
+
+    diff = np.abs(expected - got)
+    print(f"Parity on {len(X)} {source}:")
+    print(f"   max abs diff {diff.max():.6g}, max rel diff {(diff / np.abs(expected)).max():.3g}, "
+          f"identical {np.mean(expected == got):.2%}")
+    print(f"   predict time: pickle {t_orig * 1000:.1f} ms, compiled {t_comp * 1000:.1f} ms")
+    if not np.allclose(expected, got, rtol=1e-9, atol=1e-6):
+        raise SystemExit("❌ compiled artifact does not match the pickled pipeline")
+
+    print(f"\n{'rows':>8} {'pickle ms':>10} {'compiled ms':>12} {'compiled/pickle':>16}")
+    for size in sizes:
+        batch = synthetic_rows(feature_names, n=size, seed=1)
+        values = batch.to_numpy()
+        t_orig = best_of(lambda: original.predict(batch))
+        t_comp = best_of(lambda: compiled.predict(values))
+        print(f"{size:>8} {t_orig * 1000:>10.1f} {t_comp * 1000:>12.1f} {t_comp / t_orig:>15.2f}x")
+
+    print("\nCold start (fresh interpreter):")
+    for kind, path in (("pickle", pipeline_path), ("compiled", compiled_path)):
+        stats = cold_load(kind, path)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"   {kind:>8}: {size_mb:.1f} MB on disk, load {stats['seconds']:.2f}s, peak RSS {stats['max_rss_mb']:.0f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pipeline", default=os.path.join(PROJECT_ROOT, "backend", "models", "pipeline_v1.pkl"))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000, 2000, 4000, 20_000, 100_000])
+    args = parser.parse_args()
+    main(args.pipeline, args.sizes)
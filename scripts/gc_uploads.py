@@ -0,0 +1,84 @@
+# scripts/gc_uploads.py
+"""
+Garbage-collect uploaded images: delete blobs (and their thumb/card/full
+variants) that no properties.images entry references any more, plus
+abandoned temporary files. Files younger than --grace-hours are kept, since
+photos are uploaded before the listing that uses them is saved. Run it
+periodically (cron).
+
+--adopt-legacy first moves UUID-named uploads from before content
+addressing into the hash-sharded tree and rewrites properties.images to
+the new URLs, so they get immutable caching and variants too.
+
+Usage: python scripts/gc_uploads.py [--grace-hours 24] [--dry-run] [--adopt-legacy]
+"""
+import sys, os, time, argparse
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import func, select
+
+from backend.app import db, models
+from backend.app.uploads import BLOB_PATH, UploadStore
+
+UPLOAD_DIR = os.path.join(PROJECT_ROOT, 'uploads', 'properties')
+URL_PREFIX = "/uploads/properties"
+
+
+def adopt_legacy(session, store, batch_size=1000):
+    prefix = URL_PREFIX + "/"
+    adopted, rows = {}, 0
+    stmt = (
+        select(models.Property.id, models.Property.images)
+        .where(func.cardinality(models.Property.images) > 0)
+        .execution_options(yield_per=batch_size)
+    )
+    updates = []
+    for prop_id, images in session.execute(stmt):
+        new_images = list(images)
+        for i, url in enumerate(images):
+            if not url or not url.startswith(prefix) or BLOB_PATH.match(url[len(prefix):]):
+                continue
+            if url not in adopted:
+                adopted[url] = store.adopt(url[len(prefix):])
+            if adopted[url]:
+                new_images[i] = adopted[url]
+        if new_images != images:
+            updates.append({"id": prop_id, "images": new_images})
+    for start in range(0, len(updates), batch_size):
+        session.bulk_update_mappings(models.Property, updates[start:start + batch_size])
+        rows += len(updates[start:start + batch_size])
+    session.commit()
+    return sum(1 for v in adopted.values() if v), rows
+
+
+def referenced_urls(session):
+    stmt = select(func.unnest(models.Property.images)).distinct()
+    return session.execute(stmt.execution_options(yield_per=10000)).scalars()
+
+
+def main(grace_hours, dry_run, adopt):
+    store = UploadStore(UPLOAD_DIR, URL_PREFIX, workers=1)
+    session = db.SessionLocal()
+    start = time.perf_counter()
+    if adopt and not dry_run:
+        files, rows = adopt_legacy(session, store)
+        print(f"✅ Adopted {files} legacy uploads, rewrote images on {rows} properties")
+    # let the adopted images' variants finish before sweeping
+    store.shutdown(wait=True)
+    result = store.collect_garbage(referenced_urls(session), grace_hours * 3600, dry_run=dry_run)
+    session.close()
+    elapsed = time.perf_counter() - start
+    verb = "Would remove" if dry_run else "Removed"
+    print(f"✅ {verb} {result['files_removed']} files ({result['bytes_freed'] / 1e6:.1f} MB) in {elapsed:.2f}s")
+    print(f"   {result['blobs_kept']} blobs kept, {result['referenced']} distinct image URLs referenced")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grace-hours", type=float, default=24)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--adopt-legacy", action="store_true")
+    args = parser.parse_args()
+    main(args.grace_hours, args.dry_run, args.adopt_legacy)
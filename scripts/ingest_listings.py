@@ -0,0 +1,119 @@
+# scripts/ingest_listings.py
+"""
+Bulk-load a partner listing feed (NDJSON or CSV) for one seller.
+
+By default writes straight to the configured database through
+backend/app/ingest.py: rows are validated against PropertyIn in batches and
+written with COPY (or --method insert), printing progress and any invalid
+rows per batch. With --api the file is streamed to POST /api/properties/bulk
+instead, authenticated with the seller's --token.
+
+CSV feeds need a header row with PropertyIn field names; amenities/images
+cells hold a JSON array or "|"-separated values.
+
+Usage: python scripts/ingest_listings.py feed.ndjson --seller-email s@x.com
+       python scripts/ingest_listings.py feed.csv --api http://127.0.0.1:8000 --token ...
+"""
+import sys, os, argparse
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import select
+
+from backend.app import db, ingest, models
+
+
+def detect_format(path, given):
+    if given:
+        return given
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def print_batch(entry):
+    status = f"{entry['inserted']} inserted"
+    if entry["invalid"]:
+        status += f", {entry['invalid']} invalid"
+    if entry.get("failed"):
+        status += f", {entry['failed']} failed: {entry['error']}"
+    print(f"  batch {entry['batch']:>5} rows {entry['first_row']}-{entry['last_row']}: {status}")
+    for err in entry["errors"]:
+        print(f"      row {err['row']}: {err['error']}")
+
+
+def ingest_direct(path, fmt, seller_id, seller_email, batch_size, method, quiet):
+    from backend.app.main import PropertyIn
+
+    if seller_email:
+        with db.SessionLocal() as session:
+            seller_id = session.execute(
+                select(models.User.id).where(models.User.email == seller_email, models.User.user_type == "seller")
+            ).scalar()
+        if seller_id is None:
+            sys.exit(f"No seller account with email {seller_email}")
+
+    stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        return ingest.ingest(
+            ingest.READERS[fmt](stream), PropertyIn, db.SessionLocal,
+            seller_id=seller_id, batch_size=batch_size, method=method,
+            on_batch=None if quiet else print_batch,
+        )
+    finally:
+        stream.close()
+
+
+def ingest_api(path, fmt, api, token, batch_size, method):
+    import httpx
+
+    def chunks():
+        stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+        with stream:
+            yield from iter(lambda: stream.read(1024 * 1024), b"")
+
+    resp = httpx.post(
+        f"{api.rstrip('/')}/api/properties/bulk",
+        params={"format": fmt, "batch_size": batch_size, "method": method},
+        headers={"Authorization": f"Bearer {token}",
+                 "Content-Type": "text/csv" if fmt == "csv" else "application/x-ndjson"},
+        content=chunks(),
+        timeout=None,
+    )
+    if resp.status_code != 200:
+        sys.exit(f"HTTP {resp.status_code}: {resp.text}")
+    report = resp.json()
+    for entry in report["batches"]:
+        print_batch(entry)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", help="feed file, or - for stdin")
+    parser.add_argument("--format", choices=sorted(ingest.READERS))
+    parser.add_argument("--seller-id", type=int)
+    parser.add_argument("--seller-email")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--method", choices=sorted(ingest.WRITERS), default="copy")
+    parser.add_argument("--api", help="stream to this API instead of writing to the database")
+    parser.add_argument("--token", help="seller bearer token for --api")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+
+    fmt = detect_format(args.path, args.format)
+    if args.api:
+        if not args.token:
+            sys.exit("--api needs --token")
+        report = ingest_api(args.path, fmt, args.api, args.token, args.batch_size, args.method)
+    else:
+        report = ingest_direct(args.path, fmt, args.seller_id, args.seller_email,
+                               args.batch_size, args.method, args.quiet)
+
+    rate = report["rows"] / report["seconds"] if report["seconds"] else 0
+    print(f"✅ {report['inserted']} listings inserted from {report['rows']} rows "
+          f"({report['invalid']} invalid, {report['failed']} in failed batches) "
+          f"in {report['seconds']:.2f}s ({rate:,.0f} rows/s, {report['method']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,84 +1,247 @@
 # scripts/insert_batch_data.py
-import sys, os, random, uuid
+"""
+Seed synthetic sellers, listings, buyers, favourites and reviews.
+
+Scales to millions of rows: the shared password is bcrypt-hashed once,
+columns are generated with NumPy in chunks of --chunk-rows, ids are
+reserved from each table's sequence up front, and every chunk is written
+with COPY. The same --seed and arguments produce the same data. Rollups
+(property_stats, seller_buyers) are rebuilt at the end.
+
+Accounts are <prefix>seller<N>@example.com / <prefix>buyer<N>@example.com
+with password Test1234; use --prefix to seed another batch next to an
+existing one.
+
+Usage: python scripts/insert_batch_data.py [--sellers 20] [--props-per-seller 5]
+           [--buyers 200] [--favs-per-buyer 3] [--reviews-per-buyer 0] [--seed 42]
+"""
+import sys, os, io, time, argparse
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from backend.app import db, models
-from passlib.context import CryptContext
-
-pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-session = db.SessionLocal()
-
-def create_user(email, password, user_type, full_name):
-    hashed = pwd_ctx.hash(password)
-    u = models.User(email=email, password_hash=hashed, user_type=user_type, full_name=full_name)
-    session.add(u)
-    session.flush()  # get id
-    return u
-
-def create_property_for_seller(seller_id, name, city_id, area_sqft, bhk, listing_score, is_furnished):
-    prop = models.Property(
-        seller_id=seller_id,
-        property_name=name,
-        city_id=city_id,
-        area_sqft=area_sqft,
-        bhk=bhk,
-        listing_score=listing_score,
-        is_furnished=is_furnished
-    )
-    session.add(prop)
-    session.flush()
-    return prop
-
-def create_favourite(user_id, property_id):
-    fav = models.Favourite(user_id=user_id, property_id=property_id)
-    session.add(fav)
-
-def random_city():
-    return random.choice([1,2,3,4,5,6,7])
-
-def main(num_sellers=20, props_per_seller=5, num_buyers=200, favs_per_buyer=3):
-    try:
-        created_sellers = []
-        for i in range(num_sellers):
-            email = f"seller{i+1}@example.com"
-            u = create_user(email, "Test1234", "seller", f"Seller {i+1}")
-            created_sellers.append(u.id)
-
-        created_props = []
-        for sid in created_sellers:
-            for j in range(props_per_seller):
-                name = f"Sample {uuid.uuid4().hex[:6]} by seller {sid}"
-                city = random_city()
-                area = random.randint(400, 3000)
-                bhk = random.choice([1,2,3,4])
-                score = round(random.uniform(5.0, 9.0), 1)
-                is_f = random.choice([True, False])
-                p = create_property_for_seller(sid, name, city, area, bhk, score, is_f)
-                created_props.append(p.id)
-
-        created_buyers = []
-        for b in range(num_buyers):
-            email = f"buyer{b+1}@example.com"
-            u = create_user(email, "Test1234", "buyer", f"Buyer {b+1}")
-            created_buyers.append(u.id)
-
-        # favourites
-        for buyer_id in created_buyers:
-            favs = random.sample(created_props, min(favs_per_buyer, len(created_props)))
-            for pid in favs:
-                create_favourite(buyer_id, pid)
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, text
+
+from backend.app import db, models, rollups
+from backend.app.passwords import make_context
+
+PASSWORD = "Test1234"
+CITIES = np.arange(1, 8)
+PROPERTY_TYPES = np.array(["Apartment", "Villa", "Independent House", "Studio", "Penthouse"])
+AMENITIES = ["Gym", "Pool", "Parking", "Lift", "Security", "Garden", "Clubhouse", "Power Backup"]
+# every 3-amenity combination as a PostgreSQL array literal, picked by index
+AMENITY_SETS = np.array([
+    "{" + ",".join(f'"{a}"' for a in (AMENITIES[i], AMENITIES[j], AMENITIES[k])) + "}"
+    for i in range(len(AMENITIES)) for j in range(i + 1, len(AMENITIES)) for k in range(j + 1, len(AMENITIES))
+])
+RATINGS = np.arange(1, 6)
+RATING_WEIGHTS = np.array([0.05, 0.1, 0.2, 0.35, 0.3])
+COMMENTS = np.array([
+    "Great location and well maintained.",
+    "Spacious rooms, a bit pricey.",
+    "Good value for the area.",
+    "Needs some repairs but decent.",
+    "Excellent amenities, would recommend.",
+    "Noisy street, otherwise fine.",
+])
+
+TABLE_CODES = {"users": 1, "properties": 2, "favourites": 3, "reviews": 4}
+
+
+def chunk_rng(seed, table, chunk):
+    # one independent stream per (table, chunk): output does not depend on
+    # the order chunks are written in
+    return np.random.default_rng([seed, TABLE_CODES[table], chunk])
+
+
+def reserve_ids(session, table, n):
+    """First id of a block of ``n`` consecutive ids taken from the table's sequence."""
+    seq = session.execute(text("SELECT pg_get_serial_sequence(:t, 'id')"), {"t": table}).scalar()
+    last = session.execute(text("SELECT setval(:s, nextval(:s) + :n - 1)"), {"s": seq, "n": n}).scalar()
+    return last - n + 1
+
+
+def copy_frame(session, table, frame):
+    buf = io.StringIO()
+    frame.to_csv(buf, index=False, header=False)
+    buf.seek(0)
+    cursor = session.connection().connection.cursor()
+    cursor.copy_expert(f"COPY {table} ({', '.join(frame.columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+def phones(rng, n):
+    return pd.Series(rng.integers(6_000_000_000, 9_999_999_999, n, endpoint=True)).astype(str)
+
+
+def user_frame(ids, numbers, user_type, prefix, password_hash, rng):
+    numbers = pd.Series(numbers).astype(str)
+    label = user_type.capitalize()
+    phone = phones(rng, len(ids))
+    return pd.DataFrame({
+        "id": ids,
+        "email": prefix + user_type + numbers + "@example.com",
+        "password_hash": password_hash,
+        "user_type": user_type,
+        "full_name": label + " " + numbers,
+        "phone": phone,
+        "whatsapp": phone,
+    })
+
+
+def property_frame(ids, seller_ids, seller_emails, rng):
+    n = len(ids)
+    phone = phones(rng, n)
+    return pd.DataFrame({
+        "id": ids,
+        "seller_id": seller_ids,
+        "property_name": "Listing " + pd.Series(ids).astype(str),
+        "city_id": rng.choice(CITIES, n),
+        "location": "Sector " + pd.Series(rng.integers(1, 121, n)).astype(str),
+        "area_sqft": rng.integers(400, 3001, n).astype(float),
+        "bhk": rng.integers(1, 5, n),
+        "is_furnished": np.where(rng.random(n) < 0.5, "t", "f"),
+        "listing_score": np.round(rng.uniform(5.0, 9.0, n), 1),
+        "property_type": rng.choice(PROPERTY_TYPES, n),
+        "amenities": rng.choice(AMENITY_SETS, n),
+        "seller_phone": phone,
+        "seller_email": seller_emails,
+        "seller_whatsapp": phone,
+        "images": "{}",
+        "status": "active",
+    })
+
 
+def pick_per_user(rng, users, k, first_property, num_properties):
+    """``(user_ids, property_ids)``: up to ``k`` distinct random listings per user."""
+    if k <= 0 or num_properties <= 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    k = min(k, num_properties)
+    picks = np.sort(rng.integers(0, num_properties, (len(users), k)), axis=1)
+    # drop repeats within a row (rare unless k is close to num_properties)
+    keep = np.ones_like(picks, dtype=bool)
+    keep[:, 1:] = picks[:, 1:] != picks[:, :-1]
+    user_ids = np.repeat(users, k).reshape(len(users), k)[keep]
+    return user_ids, picks[keep] + first_property
+
+
+def seed(session, sellers=20, props_per_seller=5, buyers=200, favs_per_buyer=3,
+         reviews_per_buyer=0, seed=42, prefix="", rounds=None, chunk_rows=200_000, log=print):
+    """Seed everything in one transaction; returns row counts per table."""
+    first_email = f"{prefix}seller1@example.com" if sellers else f"{prefix}buyer1@example.com"
+    if session.execute(select(models.User.id).where(models.User.email == first_email)).first():
+        raise SystemExit(f"{first_email} already exists; pass a different --prefix")
+
+    rounds = rounds or int(os.getenv('BCRYPT_ROUNDS', '12'))
+    password_hash = make_context(rounds).hash(PASSWORD)  # shared by every synthetic account
+    counts = {}
+
+    def timed(label, total, write_chunk, step=chunk_rows):
+        start = time.perf_counter()
+        written = 0
+        for chunk, lo in enumerate(range(0, total, step)):
+            written += write_chunk(chunk, lo, min(lo + step, total))
+        counts[label] = written
+        elapsed = time.perf_counter() - start
+        log(f"   {label:<11} {written:>10,} rows in {elapsed:6.2f}s ({written / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    # users: sellers first, then buyers, in one id block
+    first_user = reserve_ids(session, "users", sellers + buyers) if sellers + buyers else 0
+
+    def write_users(user_type, offset, count):
+        def chunk_writer(chunk, lo, hi):
+            rng = chunk_rng(seed, "users", chunk * 2 + (user_type == "buyer"))
+            ids = np.arange(first_user + offset + lo, first_user + offset + hi)
+            copy_frame(session, "users", user_frame(ids, np.arange(lo + 1, hi + 1), user_type, prefix, password_hash, rng))
+            return hi - lo
+        timed(f"{user_type}s", count, chunk_writer)
+
+    write_users("seller", 0, sellers)
+    write_users("buyer", sellers, buyers)
+
+    num_properties = sellers * props_per_seller
+    first_property = reserve_ids(session, "properties", num_properties) if num_properties else 0
+
+    def write_properties(chunk, lo, hi):
+        rng = chunk_rng(seed, "properties", chunk)
+        index = np.arange(lo, hi)
+        seller_numbers = index // props_per_seller + 1
+        frame = property_frame(
+            first_property + index, first_user + seller_numbers - 1,
+            prefix + "seller" + pd.Series(seller_numbers).astype(str) + "@example.com", rng,
+        )
+        copy_frame(session, "properties", frame)
+        return hi - lo
+
+    timed("properties", num_properties, write_properties)
+
+    buyer_rows = max(1, chunk_rows // max(favs_per_buyer, reviews_per_buyer, 1))
+    first_buyer = first_user + sellers
+
+    def interactions(table, per_buyer, build):
+        def chunk_writer(chunk, lo, hi):
+            rng = chunk_rng(seed, table, chunk)
+            users, props = pick_per_user(rng, np.arange(first_buyer + lo, first_buyer + hi),
+                                         per_buyer, first_property, num_properties)
+            if len(users):
+                first_id = reserve_ids(session, table, len(users))
+                frame = pd.DataFrame({"id": np.arange(first_id, first_id + len(users)),
+                                      "user_id": users, "property_id": props})
+                copy_frame(session, table, build(frame, rng))
+            return len(users)
+        return chunk_writer
+
+    def with_review(frame, rng):
+        frame["rating"] = rng.choice(RATINGS, len(frame), p=RATING_WEIGHTS)
+        frame["comment"] = rng.choice(COMMENTS, len(frame))
+        return frame
+
+    # chunk by buyers so each chunk holds about chunk_rows interactions
+    if favs_per_buyer:
+        timed("favourites", buyers, interactions("favourites", favs_per_buyer, lambda f, rng: f), buyer_rows)
+    if reviews_per_buyer:
+        timed("reviews", buyers, interactions("reviews", reviews_per_buyer, with_review), buyer_rows)
+
+    start = time.perf_counter()
+    property_rows, buyer_rows = rollups.reconcile(session)
+    log(f"   rollups     {property_rows:>10,} properties, {buyer_rows:,} seller buyers in "
+        f"{time.perf_counter() - start:6.2f}s")
+    return counts
+
+
+def main(num_sellers=20, props_per_seller=5, num_buyers=200, favs_per_buyer=3,
+         reviews_per_buyer=0, seed_value=42, prefix="", chunk_rows=200_000):
+    session = db.SessionLocal()
+    start = time.perf_counter()
+    try:
+        counts = seed(session, num_sellers, props_per_seller, num_buyers, favs_per_buyer,
+                      reviews_per_buyer, seed_value, prefix, chunk_rows=chunk_rows)
         session.commit()
-        print(f"Inserted: sellers={len(created_sellers)}, properties={len(created_props)}, buyers={len(created_buyers)}")
     except Exception as e:
         session.rollback()
         print("Error:", e)
+        return
     finally:
         session.close()
+    with db.engine.begin() as conn:
+        conn.execute(text("ANALYZE users, properties, favourites, reviews"))
+    print(f"Inserted: sellers={num_sellers}, properties={counts.get('properties', 0)}, buyers={num_buyers}, "
+          f"favourites={counts.get('favourites', 0)}, reviews={counts.get('reviews', 0)} "
+          f"in {time.perf_counter() - start:.1f}s")
+
 
 if __name__ == "__main__":
     # Defaults match recommended medium test
-    main(num_sellers=20, props_per_seller=5, num_buyers=200, favs_per_buyer=3)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sellers", type=int, default=20)
+    parser.add_argument("--props-per-seller", type=int, default=5)
+    parser.add_argument("--buyers", type=int, default=200)
+    parser.add_argument("--favs-per-buyer", type=int, default=3)
+    parser.add_argument("--reviews-per-buyer", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--prefix", default="")
+    parser.add_argument("--chunk-rows", type=int, default=200_000)
+    args = parser.parse_args()
+    main(args.sellers, args.props_per_seller, args.buyers, args.favs_per_buyer,
+         args.reviews_per_buyer, args.seed, args.prefix, args.chunk_rows)
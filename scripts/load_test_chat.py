@@ -0,0 +1,130 @@
+# scripts/load_test_chat.py
+"""
+Listing latency while chatbot streams are in flight.
+
+Starts scripts/stub_llm_server.py and the API (uvicorn, one worker) pointed
+at it, measures GET /api/properties latency on its own, then again while
+--streams clients hold /chatbot/stream open, and reports both along with
+how the chat streams fared. The database must be reachable (see db.py).
+
+Usage: python scripts/load_test_chat.py [--streams 50] [--seconds 10]
+"""
+import sys, os, time, socket, signal, argparse, asyncio, subprocess
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+import httpx
+import numpy as np
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start(args, env, health_url, timeout=60):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", *args, "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=dict(os.environ, **env),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(health_url, timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"{args[-3] if len(args) > 2 else args} did not start")
+
+
+def stop(proc):
+    proc.send_signal(signal.SIGINT)
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+async def sample_listings(client, seconds):
+    latencies = []
+    stop_at = time.perf_counter() + seconds
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        resp = await client.get("/api/properties", params={"limit": 20})
+        resp.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+    return np.array(latencies) * 1000
+
+
+async def chat_stream(client, i, result):
+    start = time.perf_counter()
+    first = None
+    chunks = 0
+    async with client.stream("POST", "/chatbot/stream", json={"message": f"question {i}"}) as resp:
+        async for line in resp.aiter_lines():
+            if line.startswith("data:"):
+                chunks += 1
+                if first is None:
+                    first = time.perf_counter() - start
+    result.append((first, time.perf_counter() - start, chunks))
+
+
+async def run(base, streams, seconds):
+    limits = httpx.Limits(max_connections=streams + 10)
+    async with httpx.AsyncClient(base_url=base, timeout=120, limits=limits) as client:
+        await sample_listings(client, 1)  # warm up
+        idle = await sample_listings(client, seconds)
+
+        results = []
+        chats = [asyncio.create_task(chat_stream(client, i, results)) for i in range(streams)]
+        await asyncio.sleep(0.2)
+        busy = await sample_listings(client, seconds)
+        await asyncio.gather(*chats)
+        metrics = (await client.get("/api/metrics")).json()["chat"]
+    return idle, busy, results, metrics
+
+
+def main(streams, seconds, tokens, token_ms):
+    stub_port, api_port = free_port(), free_port()
+    stub = start(
+        ["--app-dir", "scripts", "stub_llm_server:app", "--port", str(stub_port)],
+        {"STUB_TOKENS": str(tokens), "STUB_TOKEN_MS": str(token_ms)},
+        f"http://127.0.0.1:{stub_port}/stats",
+    )
+    api = None
+    try:
+        api = start(
+            ["backend.app.main:app", "--port", str(api_port)],
+            {"OLLAMA_HOST": f"http://127.0.0.1:{stub_port}", "CHAT_MAX_CONCURRENCY": str(streams)},
+            f"http://127.0.0.1:{api_port}/healthz",
+        )
+        idle, busy, results, metrics = asyncio.run(run(f"http://127.0.0.1:{api_port}", streams, seconds))
+    finally:
+        if api is not None:
+            stop(api)
+        stop(stub)
+
+    print(f"{'GET /api/properties':<24} {'requests':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, lat in (("idle", idle), (f"{streams} chat streams", busy)):
+        print(f"{label:<24} {len(lat):>9} {np.percentile(lat, 50):>8.2f} {np.percentile(lat, 99):>8.2f} {lat.max():>8.2f}")
+
+    first = np.array([r[0] for r in results if r[0] is not None]) * 1000
+    total = np.array([r[1] for r in results])
+    print(f"\nchat streams: {len(results)} finished, first chunk p50 {np.percentile(first, 50):.0f} ms, "
+          f"full response p50 {np.percentile(total, 50):.2f} s, chunks/stream {np.mean([r[2] for r in results]):.0f}")
+    print(f"chat client: completed={metrics['completed']} failed={metrics['failed']} "
+          f"rejected={metrics['rejected']} timeouts={metrics['timeouts']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--streams", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--tokens", type=int, default=400)
+    parser.add_argument("--token-ms", type=float, default=30)
+    args = parser.parse_args()
+    main(args.streams, args.seconds, args.tokens, args.token_ms)
@@ -0,0 +1,115 @@
+# scripts/load_test_logins.py
+"""
+Listing latency during a login storm.
+
+Creates --users buyer accounts (bulk insert, one shared bcrypt hash), starts
+the API under uvicorn, measures GET /api/properties latency on its own and
+then while --concurrency clients POST /api/login back to back. Reports
+listing p50/p99 for both phases, login outcomes (200 / 503 shed by
+admission control) and the password_hasher metrics.
+
+Usage: python scripts/load_test_logins.py [--concurrency 200] [--seconds 10]
+"""
+import sys, os, time, argparse, asyncio
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import httpx
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert
+
+from backend.app import db, models
+from backend.app.passwords import make_context
+from load_test_chat import free_port, start, stop
+
+PASSWORD = "LoadTest123"
+
+
+def ensure_users(n, rounds):
+    emails = [f"login-load-{i}@example.com" for i in range(n)]
+    session = db.SessionLocal()
+    password_hash = make_context(rounds).hash(PASSWORD)
+    session.execute(
+        insert(models.User)
+        .values([{"email": e, "password_hash": password_hash, "user_type": "buyer", "full_name": "Load Test"}
+                 for e in emails])
+        .on_conflict_do_update(index_elements=[models.User.email], set_={"password_hash": password_hash})
+    )
+    session.commit()
+    session.close()
+    return emails
+
+
+async def sample_listings(client, seconds):
+    latencies, failures = [], 0
+    stop_at = time.perf_counter() + seconds
+    while time.perf_counter() < stop_at:
+        start_at = time.perf_counter()
+        resp = await client.get("/api/properties", params={"limit": 20})
+        failures += resp.status_code != 200
+        latencies.append(time.perf_counter() - start_at)
+        await asyncio.sleep(0.02)
+    return np.array(latencies) * 1000, failures
+
+
+async def login_storm(client, emails, concurrency, stop_event, outcomes):
+    async def worker(k):
+        i = k
+        while not stop_event.is_set():
+            try:
+                resp = await client.post("/api/login", json={"email": emails[i % len(emails)], "password": PASSWORD})
+                outcomes[resp.status_code] = outcomes.get(resp.status_code, 0) + 1
+                if resp.status_code == 503:
+                    await asyncio.sleep(float(resp.headers.get("Retry-After", "1")))
+            except httpx.HTTPError:
+                outcomes["error"] = outcomes.get("error", 0) + 1
+            i += concurrency
+
+    await asyncio.gather(*(worker(k) for k in range(concurrency)))
+
+
+async def run(base, emails, concurrency, seconds):
+    limits = httpx.Limits(max_connections=concurrency + 10)
+    async with httpx.AsyncClient(base_url=base, timeout=120, limits=limits) as client:
+        await sample_listings(client, 1)
+        idle = await sample_listings(client, seconds)
+
+        stop_event, outcomes = asyncio.Event(), {}
+        storm = asyncio.create_task(login_storm(client, emails, concurrency, stop_event, outcomes))
+        await asyncio.sleep(1)
+        busy = await sample_listings(client, seconds)
+        stop_event.set()
+        await storm
+        metrics = (await client.get("/api/metrics")).json().get("password_hasher")
+    return idle, busy, outcomes, metrics
+
+
+def main(users, concurrency, seconds, rounds):
+    emails = ensure_users(users, rounds)
+    port = free_port()
+    api = start(["backend.app.main:app", "--port", str(port)], {"BCRYPT_ROUNDS": str(rounds)},
+                f"http://127.0.0.1:{port}/healthz")
+    try:
+        idle, busy, outcomes, metrics = asyncio.run(run(f"http://127.0.0.1:{port}", emails, concurrency, seconds))
+    finally:
+        stop(api)
+
+    print(f"{'GET /api/properties':<24} {'requests':>9} {'failed':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, (lat, failed) in (("idle", idle), (f"{concurrency} logging in", busy)):
+        print(f"{label:<24} {len(lat):>9} {failed:>7} {np.percentile(lat, 50):>8.2f} "
+              f"{np.percentile(lat, 99):>8.2f} {lat.max():>8.2f}")
+    print(f"\nlogins: {outcomes}")
+    if metrics:
+        print(f"password_hasher: {metrics}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--rounds", type=int, default=12)
+    args = parser.parse_args()
+    main(args.users, args.concurrency, args.seconds, args.rounds)
@@ -0,0 +1,237 @@
+# scripts/load_test_mix.py
+"""
+Mixed-traffic load test: browse, favourite, predict and login together.
+
+--users virtual users each log in as one of the buyers seeded by
+scripts/insert_batch_data.py (<prefix>buyer<N>@example.com) before the
+clock starts, then loop for
+--duration seconds picking an action by the --mix weights:
+
+  browse     GET /api/properties (card fields, random city/bhk filter) and
+             follow X-Next-Cursor for up to --max-pages pages
+  favourite  POST /api/favourites for a listing seen while browsing, then
+             DELETE it again half of the time (reported as "unfavourite")
+  predict    POST /api/predict42 with random features
+  login      POST /api/login (503s shed by admission control count as errors)
+
+Reports requests, throughput, errors and p50/p95/p99 latency per request
+type. Without --url the API is started under uvicorn (one worker); if the
+prefix has no seeded buyers yet, a small batch is seeded first. Either way
+the clock only starts once /readyz reports the model loaded. The
+--seed makes the sequence of actions each user picks repeatable.
+
+Usage: python scripts/load_test_mix.py [--users 50] [--duration 20]
+           [--mix browse=70,favourite=15,predict=10,login=5] [--url http://host:8000]
+"""
+import sys, os, time, argparse, asyncio
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import httpx
+import numpy as np
+
+import insert_batch_data
+from load_test_chat import free_port, start, stop
+
+OPS = ("browse", "favourite", "predict", "login")
+
+
+def parse_mix(text):
+    weights = dict.fromkeys(OPS, 0.0)
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in weights:
+            raise SystemExit(f"unknown action {name!r} in --mix (choose from {', '.join(OPS)})")
+        weights[name.strip()] = float(weight)
+    total = sum(weights.values())
+    if total <= 0:
+        raise SystemExit("--mix weights must add up to more than 0")
+    return np.array([weights[op] / total for op in OPS])
+
+
+def ensure_buyers(prefix, users, seed):
+    from sqlalchemy import select
+    from backend.app import db, models
+
+    session = db.SessionLocal()
+    try:
+        have = session.execute(
+            select(models.User.id).where(models.User.email == f"{prefix}buyer1@example.com")
+        ).first()
+        if have:
+            return
+        print(f"Seeding {users} buyers with prefix {prefix!r}...")
+        insert_batch_data.seed(session, sellers=20, props_per_seller=50, buyers=users,
+                               favs_per_buyer=3, seed=seed, prefix=prefix)
+        session.commit()
+    finally:
+        session.close()
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def add(self, op, seconds, ok):
+        self.latencies.setdefault(op, []).append(seconds)
+        if not ok:
+            self.errors[op] = self.errors.get(op, 0) + 1
+
+    async def timed(self, op, request):
+        start_at = time.perf_counter()
+        try:
+            resp = await request
+        except httpx.HTTPError:
+            self.add(op, time.perf_counter() - start_at, False)
+            return None
+        self.add(op, time.perf_counter() - start_at, resp.status_code < 400)
+        return resp
+
+
+def credentials(args, k):
+    return {"email": f"{args.prefix}buyer{k % args.buyers + 1}@example.com",
+            "password": insert_batch_data.PASSWORD}
+
+
+async def sign_in(client, args, k):
+    """Bearer headers for user ``k``; waits out 503s (admission control)."""
+    while True:
+        resp = await client.post("/api/login", json=credentials(args, k))
+        if resp.status_code == 503:
+            await asyncio.sleep(float(resp.headers.get("Retry-After", "1")))
+            continue
+        resp.raise_for_status()
+        return {"Authorization": f"Bearer {resp.json()['token']}"}
+
+
+async def virtual_user(client, k, args, weights, stop_at, recorder, seen, headers):
+    rng = np.random.default_rng([args.seed, k])
+    while time.perf_counter() < stop_at:
+        op = OPS[rng.choice(len(OPS), p=weights)]
+        if op == "browse":
+            params = {"limit": 20, "fields": "card"}
+            if rng.random() < 0.5:
+                params["city_id"] = int(rng.integers(1, 8))
+            if rng.random() < 0.3:
+                params["bhk"] = int(rng.integers(1, 5))
+            for _ in range(int(rng.integers(1, args.max_pages + 1))):
+                resp = await recorder.timed("browse", client.get("/api/properties", params=params))
+                if resp is None or resp.status_code != 200:
+                    break
+                seen.extend(row["id"] for row in resp.json()[:5])
+                cursor = resp.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+                params["cursor"] = cursor
+        elif op == "favourite" and seen:
+            property_id = seen[int(rng.integers(len(seen)))]
+            await recorder.timed("favourite", client.post(
+                "/api/favourites", json={"property_id": property_id}, headers=headers))
+            if rng.random() < 0.5:
+                await recorder.timed("unfavourite", client.delete(
+                    f"/api/favourites/{property_id}", headers=headers))
+        elif op == "predict":
+            body = {
+                "area_sqft": float(rng.integers(400, 3001)),
+                "bhk": int(rng.integers(1, 5)),
+                "listing_score": round(float(rng.uniform(5.0, 9.0)), 1),
+                "is_furnished": bool(rng.random() < 0.5),
+                "city_id": int(rng.integers(1, 8)),
+            }
+            await recorder.timed("predict", client.post("/api/predict42", json=body))
+        elif op == "login":
+            resp = await recorder.timed("login", client.post("/api/login", json=credentials(args, k)))
+            if resp is not None and resp.status_code == 503:
+                await asyncio.sleep(float(resp.headers.get("Retry-After", "1")))
+        if args.think_ms:
+            await asyncio.sleep(rng.exponential(args.think_ms / 1000))
+
+
+async def run(base, args, weights):
+    limits = httpx.Limits(max_connections=args.users + 10)
+    recorder = Recorder()
+    async with httpx.AsyncClient(base_url=base, timeout=120, limits=limits) as client:
+        # listings to favourite before anyone has browsed
+        resp = await client.get("/api/properties", params={"limit": 200, "fields": "card"})
+        resp.raise_for_status()
+        seen = [row["id"] for row in resp.json()]
+        # sessions are set up before the clock starts
+        headers = await asyncio.gather(*(sign_in(client, args, k) for k in range(args.users)))
+        start_at = time.perf_counter()
+        stop_at = start_at + args.duration
+        await asyncio.gather(*(
+            virtual_user(client, k, args, weights, stop_at, recorder, seen, headers[k])
+            for k in range(args.users)
+        ))
+        elapsed = time.perf_counter() - start_at
+    return recorder, elapsed
+
+
+def report(recorder, elapsed):
+    print(f"{'request':<12} {'count':>8} {'req/s':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    everything = []
+    for op in (*OPS, "unfavourite"):
+        if op not in recorder.latencies:
+            continue
+        lat = np.array(recorder.latencies[op]) * 1000
+        everything.append(lat)
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+        print(f"{op:<12} {len(lat):>8} {len(lat) / elapsed:>8.1f} {recorder.errors.get(op, 0):>7} "
+              f"{p50:>8.1f} {p95:>8.1f} {p99:>8.1f}")
+    if everything:
+        lat = np.concatenate(everything)
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+        print(f"{'total':<12} {len(lat):>8} {len(lat) / elapsed:>8.1f} {sum(recorder.errors.values()):>7} "
+              f"{p50:>8.1f} {p95:>8.1f} {p99:>8.1f}")
+
+
+def wait_ready(base, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(base + "/readyz", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{base} did not become ready")
+
+
+def main(args):
+    weights = parse_mix(args.mix)
+    api = None
+    base = args.url
+    if base is None:
+        ensure_buyers(args.prefix, args.buyers, args.seed)
+        port = free_port()
+        # /readyz only answers 200 once the model is loaded, so predict calls
+        # inside the timed window never hit a 503 from a cold server.
+        api = start(["backend.app.main:app", "--port", str(port)], {}, f"http://127.0.0.1:{port}/readyz")
+        base = f"http://127.0.0.1:{port}"
+    else:
+        wait_ready(base)
+    try:
+        recorder, elapsed = asyncio.run(run(base, args, weights))
+    finally:
+        if api is not None:
+            stop(api)
+    print(f"{args.users} users, {elapsed:.1f}s, mix {args.mix}")
+    report(recorder, elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="running API to test; default starts one locally")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--mix", default="browse=70,favourite=15,predict=10,login=5")
+    parser.add_argument("--prefix", default="", help="email prefix the buyers were seeded with")
+    parser.add_argument("--buyers", type=int, default=200, help="seeded buyers to spread the users over")
+    parser.add_argument("--max-pages", type=int, default=3)
+    parser.add_argument("--think-ms", type=float, default=0, help="mean pause between actions")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,45 @@
+# scripts/reconcile_rollups.py
+"""
+Rebuild the seller analytics rollups (property_stats, seller_buyers) from the
+favourites and reviews tables and report how far the incremental counters had
+drifted. Run after bulk imports that bypass the API, or periodically (cron).
+
+Usage: python scripts/reconcile_rollups.py [--seller-id 12]
+"""
+import sys, os, time, argparse
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import select
+
+from backend.app import db, models, rollups
+
+COUNTERS = ("favourite_count", "unique_buyer_count", "review_count", "rating_sum")
+
+
+def snapshot(session, seller_id):
+    stmt = select(models.PropertyStats.property_id, *(getattr(models.PropertyStats, c) for c in COUNTERS))
+    if seller_id is not None:
+        stmt = stmt.where(models.PropertyStats.seller_id == seller_id)
+    return {row[0]: tuple(row[1:]) for row in session.execute(stmt)}
+
+
+def main(seller_id):
+    session = db.SessionLocal()
+    before = snapshot(session, seller_id)
+    start = time.perf_counter()
+    property_rows, buyer_rows = rollups.reconcile(session, seller_id)
+    session.commit()
+    elapsed = time.perf_counter() - start
+    after = snapshot(session, seller_id)
+    drifted = sum(1 for pid, counts in after.items() if before.get(pid, (0,) * len(COUNTERS)) != counts)
+    session.close()
+    print(f"✅ Reconciled {property_rows} properties and {buyer_rows} seller buyers in {elapsed:.2f}s")
+    print(f"   {drifted} property rows had drifted from the event tables")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seller-id", type=int, default=None)
+    main(parser.parse_args().seller_id)
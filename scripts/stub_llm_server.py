@@ -0,0 +1,62 @@
+# scripts/stub_llm_server.py
+"""
+Minimal stand-in for the Ollama HTTP API (POST /api/chat) for load tests.
+
+Streams STUB_TOKENS tokens as NDJSON, one every STUB_TOKEN_MS milliseconds.
+The first token additionally waits STUB_PREFILL_MS plus
+STUB_PREFILL_MS_PER_KCHAR per 1000 prompt characters, to mimic prompt
+processing that grows with the conversation. Every call is counted and the
+prompt size recorded; GET /stats returns them.
+
+Usage: uvicorn --app-dir scripts stub_llm_server:app --port 11500
+"""
+import os, json, time, asyncio
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+TOKENS = int(os.getenv("STUB_TOKENS", "40"))
+TOKEN_MS = float(os.getenv("STUB_TOKEN_MS", "25"))
+PREFILL_MS = float(os.getenv("STUB_PREFILL_MS", "50"))
+PREFILL_MS_PER_KCHAR = float(os.getenv("STUB_PREFILL_MS_PER_KCHAR", "20"))
+
+app = FastAPI()
+stats = {"calls": 0, "prompt_chars": []}
+
+
+def message(model, content, done):
+    return {
+        "model": model,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "message": {"role": "assistant", "content": content},
+        "done": done,
+    }
+
+
+@app.post("/api/chat")
+async def chat(request: Request):
+    body = await request.json()
+    model = body.get("model", "stub")
+    prompt_chars = sum(len(m.get("content", "")) for m in body.get("messages", []))
+    stats["calls"] += 1
+    stats["prompt_chars"].append(prompt_chars)
+    prefill = (PREFILL_MS + PREFILL_MS_PER_KCHAR * prompt_chars / 1000) / 1000
+    words = [f"token{i} " for i in range(TOKENS)]
+
+    if not body.get("stream", True):
+        await asyncio.sleep(prefill + TOKENS * TOKEN_MS / 1000)
+        return JSONResponse(message(model, "".join(words), True))
+
+    async def generate():
+        await asyncio.sleep(prefill)
+        for word in words:
+            yield json.dumps(message(model, word, False)) + "\n"
+            await asyncio.sleep(TOKEN_MS / 1000)
+        yield json.dumps(message(model, "", True)) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@app.get("/stats")
+def get_stats():
+    return stats
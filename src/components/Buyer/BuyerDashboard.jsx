@@ -1,7 +1,7 @@
 // src/components/Buyer/BuyerDashboard.js - FIXED WITH REVIEWS AND CHARTS
 import React, { useState, useEffect, useCallback } from 'react';
 import { useNavigate, Link } from 'react-router-dom';
-import { getProperties, predictBulk, addFavourite, removeFavourite, getFavourites, submitReview } from '../../services/api';
+import { getProperties, predictBulk, addFavourite, removeFavourite, getFavourites, submitReview, logout } from '../../services/api';
 import { getAuthData, clearAuthData } from '../../utils/auth';
 import { Home, LogOut, Heart, Calculator, MessageCircle, X, Search, BarChart as BarChartIcon, MoreVertical} from 'lucide-react';
 import PropertyCard from '../shared/PropertyCard';
@@ -85,7 +85,9 @@ const BuyerDashboard = () => {
         bhk: p.bhk,
         listing_score: p.listing_score || 5,
         is_furnished: p.is_furnished,
-        city_id: p.city_id
+        city_id: p.city_id,
+        locality: p.location,
+        property_type: p.property_type
       }));
 
       // Check if there are properties to predict
@@ -181,6 +183,8 @@ const BuyerDashboard = () => {
   };
 
   const handleLogout = () => {
+    const { token } = getAuthData();
+    if (token) logout(token).catch(() => {});
     clearAuthData();
     navigate('/login');
   };
@@ -5,6 +5,7 @@ import {
   getFavourites,
   removeFavourite,
   predictBulk,
+  logout,
 } from "../../services/api";
 import { getAuthData, clearAuthData } from "../../utils/auth";
 import { Home, LogOut, Heart, ArrowLeft, MoreVertical } from "lucide-react";
@@ -36,6 +37,8 @@ const Favourites = () => {
         listing_score: p.listing_score || 5,
         is_furnished: p.is_furnished,
         city_id: p.city_id,
+        locality: p.location,
+        property_type: p.property_type,
       }));
 
       const predictions = await predictBulk(predictionPayload);
@@ -63,6 +66,8 @@ const Favourites = () => {
   };
 
   const handleLogout = () => {
+    const { token } = getAuthData();
+    if (token) logout(token).catch(() => {});
     clearAuthData();
     navigate("/login");
   };
@@ -2,8 +2,9 @@
 import React, { useState, useEffect, useCallback } from "react";
 import { useNavigate, Link } from "react-router-dom";
 // Import predictBulk API service
-import { getProperties, createProperty, uploadImage, predictBulk } from "../../services/api"; 
+import { getProperties, createProperty, uploadImage, predictBulk, logout } from "../../services/api"; 
 import { getAuthData, clearAuthData } from "../../utils/auth";
+import { imageUrl, imageVariantUrl } from "../../utils/images";
 import {
   Home,
   Plus,
@@ -73,7 +74,9 @@ const SellerDashboard = () => {
               bhk: p.bhk,
               listing_score: p.listing_score || 5,
               is_furnished: p.is_furnished,
-              city_id: p.city_id
+              city_id: p.city_id,
+              locality: p.location,
+              property_type: p.property_type
           }));
 
           // 3. Get predictions
@@ -209,6 +212,8 @@ const SellerDashboard = () => {
   };
 
   const handleLogout = () => {
+    const { token } = getAuthData();
+    if (token) logout(token).catch(() => {});
     clearAuthData();
     navigate("/login");
   };
@@ -478,7 +483,10 @@ const SellerDashboard = () => {
                     {formData.images.map((img, idx) => (
                       <div key={idx} className="image-preview">
                         <img
-                          src={`http://127.0.0.1:8000${img}`} 
+                          src={imageVariantUrl(img, "thumb")}
+                          onError={(e) => {
+                            if (e.target.src !== imageUrl(img)) e.target.src = imageUrl(img);
+                          }}
                           alt={`Preview ${idx + 1}`}
                         />
                         <button
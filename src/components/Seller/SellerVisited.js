@@ -1,7 +1,7 @@
 // src/components/Seller/SellerVisited.js - Layout Refined with Separate Boxes
 import React, { useState, useEffect, useCallback } from "react";
 import { useNavigate, Link } from "react-router-dom";
-import { getSellerAnalytics } from "../../services/api";
+import { getSellerAnalytics, logout } from "../../services/api";
 import { getAuthData, clearAuthData } from "../../utils/auth";
 import {
     Home,
@@ -23,18 +23,11 @@ const SellerVisited = () => {
     const [analytics, setAnalytics] = useState(null);
     const [loading, setLoading] = useState(true);
 
-    // Helper to calculate total favourites
-    const totalFavourites = analytics
-        ? Object.values(analytics.property_favourites).reduce((a, b) => a + b, 0)
-        : 0;
-
-    // Helper to calculate total reviews
-    const totalReviews = analytics ? analytics.reviews.length : 0;
-
-    // Helper to calculate average rating
-    const averageRating = totalReviews > 0
-        ? (analytics.reviews.reduce((sum, review) => sum + review.rating, 0) / totalReviews).toFixed(1)
-        : 0;
+    // Totals are aggregated by the backend; reviews arrive one page at a time
+    const totalFavourites = analytics ? analytics.total_favourites : 0;
+    const totalReviews = analytics ? analytics.total_reviews : 0;
+    const averageRating = analytics ? analytics.average_rating : 0;
+    const [loadingMore, setLoadingMore] = useState(false);
         
     // FIXED: Wrap fetchAnalytics in useCallback to satisfy ESLint
     const fetchAnalytics = useCallback(async () => {
@@ -49,11 +42,29 @@ const SellerVisited = () => {
         }
     }, []); 
 
+    const loadMoreReviews = async () => {
+        try {
+            setLoadingMore(true);
+            const response = await getSellerAnalytics({ review_cursor: analytics.next_review_cursor });
+            setAnalytics((prev) => ({
+                ...prev,
+                reviews: [...prev.reviews, ...response.data.reviews],
+                next_review_cursor: response.data.next_review_cursor,
+            }));
+        } catch (error) {
+            console.error("Error fetching reviews:", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         fetchAnalytics();
     }, [fetchAnalytics]); 
 
     const handleLogout = () => {
+        const { token } = getAuthData();
+        if (token) logout(token).catch(() => {});
         clearAuthData();
         navigate("/login");
     };
@@ -227,6 +238,15 @@ const SellerVisited = () => {
                                             </span>
                                         </div>
                                     ))}
+                                    {analytics.next_review_cursor && (
+                                        <button
+                                            onClick={loadMoreReviews}
+                                            className="btn-secondary"
+                                            disabled={loadingMore}
+                                        >
+                                            {loadingMore ? "Loading..." : "Load more reviews"}
+                                        </button>
+                                    )}
                                 </div>
                             )}
                         </div>
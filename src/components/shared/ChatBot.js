@@ -4,6 +4,11 @@ import { Send, Bot } from "lucide-react";
 import axios from "axios";
 import "./ChatBot.css";
 
+const newSessionId = () =>
+  window.crypto && window.crypto.randomUUID
+    ? window.crypto.randomUUID()
+    : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+
 const ChatBot = ({ onClose }) => {
   const [messages, setMessages] = useState([
     {
@@ -13,6 +18,9 @@ const ChatBot = ({ onClose }) => {
   ]);
   const [input, setInput] = useState("");
   const [loading, setLoading] = useState(false);
+  // The server keeps the conversation under a random id we pick once per
+  // chat and send with each message
+  const [sessionId] = useState(newSessionId);
 
   const handleSend = async () => {
     if (!input.trim()) return;
@@ -25,6 +33,7 @@ const ChatBot = ({ onClose }) => {
     try {
       const response = await axios.post("http://127.0.0.1:8000/chatbot", {
         message: userMessage,
+        session_id: sessionId,
       });
 
       setMessages((prev) => [
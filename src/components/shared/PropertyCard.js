@@ -10,6 +10,7 @@ import {
   Heart,
   Star,
 } from "lucide-react";
+import { imageUrl as uploadUrl, imageVariantUrl } from "../../utils/images";
 import "./PropertyCard.css";
 
 const CITY_MAP = {
@@ -36,18 +37,15 @@ const PropertyCard = ({
   const defaultImage =
     "https://images.unsplash.com/photo-1560518883-ce09059eeffa?w=400&h=300&fit=crop";
 
-  // FIXED: Properly construct image URL
-  const getImageUrl = (imgPath) => {
-    if (!imgPath) return defaultImage;
-    // If it's already a full URL, use it
-    if (imgPath.startsWith("http")) return imgPath;
-    // Otherwise, construct the URL from the uploads path
-    return `http://127.0.0.1:8000${imgPath}`;
-  };
-
+  // Cards load the small "card" variant; if it is missing (still being
+  // rendered, or an older upload) fall back to the original, then the default
+  const originalImage =
+    property.images && property.images.length > 0
+      ? uploadUrl(property.images[0]) || defaultImage
+      : defaultImage;
   const imageUrl =
     property.images && property.images.length > 0
-      ? getImageUrl(property.images[0])
+      ? imageVariantUrl(property.images[0], "card") || defaultImage
       : defaultImage;
 
   const handleReviewSubmit = (e) => {
@@ -89,7 +87,9 @@ const PropertyCard = ({
             src={imageUrl}
             alt={property.property_name || "Property"}
             onError={(e) => {
-              e.target.src = defaultImage;
+              const fallback =
+                e.target.src === originalImage ? defaultImage : originalImage;
+              if (e.target.src !== fallback) e.target.src = fallback;
             }}
           />
           {property.property_type && (
@@ -2,6 +2,7 @@
 import React, { useState } from "react";
 import { useNavigate, Link } from "react-router-dom";
 import { getAuthData, clearAuthData } from "../utils/auth";
+import { logout } from "../services/api";
 import {
   Home,
   LogOut,
@@ -55,6 +56,8 @@ const EMICalculator = () => {
   ];
 
   const handleLogout = () => {
+    const { token } = getAuthData();
+    if (token) logout(token).catch(() => {});
     clearAuthData();
     navigate("/login");
   };
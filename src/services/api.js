@@ -25,6 +25,10 @@ api.interceptors.request.use(
 // Auth APIs
 export const register = (userData) => api.post("/api/register", userData);
 export const login = (credentials) => api.post("/api/login", credentials);
+// Revokes the token server-side; pass it explicitly since callers clear
+// localStorage right after
+export const logout = (token) =>
+  api.post("/api/logout", null, { headers: { Authorization: `Bearer ${token}` } });
 
 // Property APIs
 export const getProperties = (filters = {}) => {
@@ -33,6 +37,11 @@ export const getProperties = (filters = {}) => {
   if (filters.bhk) params.append("bhk", filters.bhk);
   if (filters.area_sqft) params.append("area_sqft", filters.area_sqft);
   if (filters.seller_id) params.append("seller_id", filters.seller_id);
+  // Keyset pagination: pass the previous response's X-Next-Cursor header
+  if (filters.cursor) params.append("cursor", filters.cursor);
+  if (filters.limit) params.append("limit", filters.limit);
+  // "card" (or a comma-separated column list) returns a slim projection
+  if (filters.fields) params.append("fields", filters.fields);
 
   return api.get(`/api/properties?${params.toString()}`);
 };
@@ -71,8 +80,8 @@ export const removeFavourite = (propertyId) => {
 };
 
 // Seller Analytics - FIXED: Token passed via header
-export const getSellerAnalytics = () => {
-  return api.get("/api/seller/analytics");
+export const getSellerAnalytics = (params = {}) => {
+  return api.get("/api/seller/analytics", { params });
 };
 
 // Reviews - NEW
@@ -85,8 +94,9 @@ export const getPropertyReviews = (propertyId) => {
 };
 
 // Chat - FIXED: Better error handling
-export const sendChatMessage = (message) => {
-  return api.post("/chatbot", { message }).catch((error) => {
+// Without a sessionId the message is answered statelessly
+export const sendChatMessage = (message, sessionId = null) => {
+  return api.post("/chatbot", { message, session_id: sessionId }).catch((error) => {
     console.error("Chat API failed:", error);
     // Return fallback response
     return { data: { response: getFallbackResponse(message) } };
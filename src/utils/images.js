@@ -0,0 +1,21 @@
+// src/utils/images.js
+
+const API_BASE_URL = "http://127.0.0.1:8000";
+
+// Uploads are stored as /uploads/properties/<aa>/<bb>/<sha256>.<ext>; the
+// backend renders <sha256>_thumb.jpg, _card.jpg and _full.jpg next to them.
+const HASHED_UPLOAD =
+  /^(\/uploads\/properties\/[0-9a-f]{2}\/[0-9a-f]{2}\/[0-9a-f]{64})\.\w+$/;
+
+export const imageUrl = (imgPath) => {
+  if (!imgPath || imgPath.startsWith("http")) return imgPath;
+  return `${API_BASE_URL}${imgPath}`;
+};
+
+// URL of a resized variant ("thumb", "card" or "full"). Older uploads have
+// no variants and keep their original URL.
+export const imageVariantUrl = (imgPath, variant) => {
+  if (!imgPath) return imgPath;
+  const match = imgPath.match(HASHED_UPLOAD);
+  return imageUrl(match ? `${match[1]}_${variant}.jpg` : imgPath);
+};
@@ -18,10 +18,21 @@ warnings.filterwarnings("ignore")
 from xgboost import XGBRegressor
 from lightgbm import LGBMRegressor
 
+from backend.app.columnar import load_frame
+from backend.app.compiled_model import compile_stacking, file_fingerprint
+from backend.app.features import FeatureTransformer
+import clean_dataset
+
 # Fix Unicode encoding for Windows console
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
+# Columns the pipeline reads (lower-cased); the column bundle loads only these
+TRAINING_COLUMNS = [
+    "price_num", "area_num", "price_per_sqft", "bhk", "no_of_bhk", "bath", "locality_name", "city_name",
+    "latitude", "longitude", "is_furnished", "is_rera_registered", "is_apartment", "listing_domain_score",
+]
+
 
 class RealEstatePipeline:
     """ML Pipeline for real estate price prediction using stacking ensemble"""
@@ -38,6 +49,8 @@ class RealEstatePipeline:
         self.y_test = None
         self.scaler = None
         self.features = None
+        self.transformer = None
+        self.X = None
         self.stacking_regressor = None
         
         print(f"✓ Pipeline initialized at: {os.getcwd()}\n")
@@ -49,8 +62,15 @@ class RealEstatePipeline:
             print(f"❌ Error: {cleaned_file} not found")
             sys.exit(1)
         
-        self.df = pd.read_csv(cleaned_file, encoding="latin1")
-        print(f"✓ Loaded dataset: {self.df.shape}")
+        # The column bundle clean_dataset.py writes next to the CSV: typed and
+        # memory-mapped, nothing to parse. Used only while it matches the CSV.
+        bundle = cleaned_file if os.path.isdir(cleaned_file) else clean_dataset.current_bundle(cleaned_file)
+        if bundle:
+            self.df = load_frame(bundle, columns=TRAINING_COLUMNS)
+            print(f"✓ Loaded dataset from {bundle}: {self.df.shape}")
+        else:
+            self.df = pd.read_csv(cleaned_file, encoding="latin1")
+            print(f"✓ Loaded dataset: {self.df.shape}")
         
         # Normalize column names
         self.df.columns = self.df.columns.str.strip().str.lower()
@@ -91,33 +111,11 @@ class RealEstatePipeline:
         if "price_per_sqft" not in self.df.columns:
             self.df["price_per_sqft"] = self.df["price_num"] / self.df["area_num"]
         
-        # Basic derived features
-        self.df["price_per_bhk"] = self.df["price_num"] / self.df["bhk"]
-        self.df["area_per_bhk"] = self.df["area_num"] / self.df["bhk"]
-        
-        # Bath column
+        # Bath column (the transformer falls back to bhk where it is missing)
         if "bath" in self.df.columns:
-            self.df["bath"] = pd.to_numeric(self.df["bath"], errors="coerce").fillna(self.df["bhk"])
-        else:
-            self.df["bath"] = self.df["bhk"]
+            self.df["bath"] = pd.to_numeric(self.df["bath"], errors="coerce")
         
-        self.df["price_per_bath"] = self.df["price_num"] / (self.df["bath"] + 1)
-        
-        # Demand density
-        if "locality_name" in self.df.columns:
-            locality_counts = self.df["locality_name"].value_counts().to_dict()
-            self.df["demand_density"] = self.df["locality_name"].map(locality_counts).fillna(0).astype(int)
-        else:
-            self.df["demand_density"] = 0
-        
-        # Price deviation by locality
-        if "locality_name" in self.df.columns:
-            local_mean = self.df.groupby("locality_name")["price_per_sqft"].transform("mean")
-            self.df["price_dev_locality"] = self.df["price_per_sqft"] - local_mean
-        else:
-            self.df["price_dev_locality"] = 0
-        
-        # Luxury index
+        # Flags as 0/1
         self.df["is_furnished"] = self.df.get("is_furnished", 0).astype(str).str.lower().map(
             {"furnished": 1, "unfurnished": 0, "semi-furnished": 0}
         ).fillna(0).astype(int)
@@ -125,96 +123,26 @@ class RealEstatePipeline:
         self.df["is_apartment"] = self.df.get("is_apartment", 0).fillna(0).astype(int)
         self.df["listing_domain_score"] = self.df.get("listing_domain_score", 0).fillna(0)
         
-        self.df["luxury_index"] = (self.df["bath"] / self.df["bhk"]).fillna(0) + self.df["is_furnished"] + self.df["listing_domain_score"]
-        
-        # Area category
-        self.df["area_cat"] = pd.cut(self.df["area_num"], bins=[0, 1000, 2000, 1e9], labels=["small", "medium", "large"])
+        for col in ["latitude", "longitude"]:
+            if col in self.df.columns:
+                self.df[col] = pd.to_numeric(self.df[col], errors="coerce")
         
-        # Distance from city center
-        self.df["dist_city_center"] = self._compute_distances()
+        # Locality counts and means, top-k vocabularies, city centers: learned
+        # here, saved with the model and applied the same way when serving
+        self.transformer = FeatureTransformer.fit(self.df)
         
         print("✓ Features engineered")
         return self
     
-    def _compute_distances(self):
-        """Compute distance from city centers using haversine formula"""
-        def haversine_km(lat1, lon1, lat2, lon2):
-            R = 6371.0
-            phi1, phi2 = np.radians(lat1), np.radians(lat2)
-            dphi = np.radians(lat2 - lat1)
-            dlambda = np.radians(lon2 - lon1)
-            a = np.sin(dphi / 2.0) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2.0) ** 2
-            return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
-        
-        city_centers = {
-            "bangalore": (12.9716, 77.5946),
-            "mumbai": (19.0760, 72.8777),
-            "delhi": (28.6139, 77.2090),
-            "chennai": (13.0827, 80.2707),
-            "hyderabad": (17.3850, 78.4867),
-            "kolkata": (22.5726, 88.3639),
-            "lucknow": (26.8467, 80.9462)
-        }
-        
-        if "latitude" in self.df.columns and "longitude" in self.df.columns:
-            self.df["latitude"] = pd.to_numeric(self.df["latitude"], errors="coerce")
-            self.df["longitude"] = pd.to_numeric(self.df["longitude"], errors="coerce")
-            
-            def compute_dist(row):
-                city = str(row.get("city_name", "")).lower()
-                lat = row["latitude"]
-                lon = row["longitude"]
-                for k, (clat, clon) in city_centers.items():
-                    if k in city:
-                        return haversine_km(lat, lon, clat, clon)
-                return np.nan
-            
-            distances = self.df.apply(
-                lambda r: compute_dist(r) if pd.notna(r.get("latitude")) and pd.notna(r.get("longitude")) else np.nan,
-                axis=1
-            )
-        else:
-            distances = np.nan
-        
-        return distances.fillna(distances.median() if not pd.Series(distances).isna().all() else 0)
-    
     def prepare_features(self):
         """Prepare feature matrix and encode categorical variables"""
         print("🔧 Preparing features...")
         
-        base_feats = [
-            "area_num", "bhk", "listing_domain_score", "is_furnished", "is_rera_registered", "is_apartment",
-            "price_per_bhk", "area_per_bhk", "price_per_bath", "demand_density", "price_dev_locality",
-            "luxury_index", "dist_city_center"
-        ]
-        base_feats = [c for c in base_feats if c in self.df.columns]
-        
-        # Locality encoding
-        loc_cols = []
-        if "locality_name" in self.df.columns:
-            top_localities = self.df["locality_name"].value_counts().nlargest(20).index
-            self.df["locality_top"] = self.df["locality_name"].where(self.df["locality_name"].isin(top_localities), "other")
-            cat_locality = pd.get_dummies(self.df["locality_top"], prefix="loc", drop_first=True)
-            self.df = pd.concat([self.df, cat_locality], axis=1)
-            loc_cols = cat_locality.columns.tolist()
-            print(f"  ✓ Created {len(loc_cols)} locality features")
-        
-        # Area category dummies
-        area_cat_dummies = pd.get_dummies(self.df["area_cat"], prefix="area_cat", drop_first=True)
-        self.df = pd.concat([self.df, area_cat_dummies], axis=1)
-        
-        # City dummies
-        city_cols = []
-        if "city_name" in self.df.columns:
-            top_cities = self.df["city_name"].value_counts().nlargest(10).index
-            self.df["city_top"] = self.df["city_name"].where(self.df["city_name"].isin(top_cities), "other")
-            city_dummies = pd.get_dummies(self.df["city_top"], prefix="city", drop_first=True)
-            self.df = pd.concat([self.df, city_dummies], axis=1)
-            city_cols = city_dummies.columns.tolist()
-            print(f"  ✓ Created {len(city_cols)} city features")
-        
-        self.features = base_feats + loc_cols + city_cols + area_cat_dummies.columns.tolist()
-        self.features = [c for c in self.features if c in self.df.columns]
+        self.features = self.transformer.features
+        self.X = pd.DataFrame(self.transformer.transform(self.df), columns=self.features, index=self.df.index)
+        
+        print(f"  ✓ Created {len(self.transformer.locality_levels)} locality features")
+        print(f"  ✓ Created {len(self.transformer.city_levels)} city features")
         print(f"✓ Final feature count: {len(self.features)}")
         
         return self
@@ -223,7 +151,7 @@ class RealEstatePipeline:
         """Split data into train/test sets"""
         print(f"📊 Splitting data ({test_size*100}% test)...")
         
-        X = self.df[self.features].fillna(0)
+        X = self.X
         y = self.df["price_num"]
         
         self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
@@ -324,9 +252,17 @@ class RealEstatePipeline:
         joblib.dump(self.stacking_regressor, pipeline_path)
         print(f"✓ Model saved to: {pipeline_path}")
         
+        # Inference-only artifact (flattened trees + Ridge blend) served by the backend
+        compiled_path = os.path.splitext(pipeline_path)[0] + ".npz"
+        compiled = compile_stacking(self.stacking_regressor, self.features)
+        compiled.source = file_fingerprint(pipeline_path)  # the server checks it against the pickle
+        compiled.save(compiled_path)
+        print(f"✓ Compiled inference artifact saved to: {compiled_path}")
+        
         joblib.dump(self.scaler, os.path.join(self.project_root, "backend/models/scaler.pkl"))
         joblib.dump(self.features, os.path.join(self.project_root, "backend/models/features.pkl"))
-        print("✓ Scaler and features saved")
+        self.transformer.save(os.path.join(self.project_root, "backend/models/feature_transformer.json"))
+        print("✓ Scaler, features and feature transformer saved")
         
         return self
     
@@ -360,10 +296,14 @@ class RealEstatePipeline:
 if __name__ == "__main__":
     # Setup paths
     project_root = r"C:\Users\SOUMIK\Downloads\infosys_internship-main\infosys_internship-main"
+    raw_file = os.path.join(project_root, "Makaan_Properties_Buy.csv")
     cleaned_file = os.path.join(project_root, "cleaned_indian_property.csv")
     
     # Initialize and run pipeline
     pipeline = RealEstatePipeline(project_root)
+    if os.path.exists(raw_file):
+        # returns at once when the raw file's hash matches the last clean
+        cleaned_file = clean_dataset.clean(raw_file, cleaned_file, stream=True)
     pipeline.run_full_pipeline(cleaned_file)
     
     print("\n✨ Training complete! Pipeline ready for deployment.")